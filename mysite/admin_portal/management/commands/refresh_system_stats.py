@@ -0,0 +1,37 @@
+# admin_portal/management/commands/refresh_system_stats.py
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_portal.services.system_service import SystemStatsService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Recompute the admin dashboard system statistics rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Seconds between refreshes. 0 refreshes once and exits.',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        while True:
+            started = time.monotonic()
+            result = SystemStatsService.refresh()
+            if result['success']:
+                self.stdout.write(
+                    f"Refreshed {result['count']} system stats in {time.monotonic() - started:.2f}s"
+                )
+            else:
+                self.stdout.write(self.style.ERROR(f"Refresh failed: {result['error']}"))
+
+            if interval <= 0:
+                break
+            time.sleep(max(0, interval - (time.monotonic() - started)))
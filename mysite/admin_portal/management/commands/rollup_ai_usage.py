@@ -0,0 +1,62 @@
+# admin_portal/management/commands/rollup_ai_usage.py
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_portal.services.ai_usage_service import AIUsageAnalyticsService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Fold new AI usage logs into the hourly/daily rollups and optionally purge old raw logs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Seconds between runs. 0 runs once and exits.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=AIUsageAnalyticsService.BATCH_SIZE,
+            help='Source rows aggregated per transaction',
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Delete raw logs older than AI_USAGE_LOG_RETENTION_DAYS after rolling up',
+        )
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=None,
+            help='Override AI_USAGE_LOG_RETENTION_DAYS for this run',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        while True:
+            started = time.monotonic()
+            result = AIUsageAnalyticsService.run_rollup(batch_size=options['batch_size'])
+            if result['success']:
+                self.stdout.write(
+                    f"Rolled up {result['processed']} log(s) up to id {result['watermark']} "
+                    f"in {time.monotonic() - started:.2f}s"
+                )
+            else:
+                self.stdout.write(self.style.ERROR(f"Rollup failed: {result['error']}"))
+
+            if options['purge'] and result['success']:
+                purge = AIUsageAnalyticsService.purge_raw_logs(retention_days=options['retention_days'])
+                if purge['success']:
+                    self.stdout.write(f"Purged {purge['deleted']} raw log(s) older than {purge['cutoff']:%Y-%m-%d}")
+                else:
+                    self.stdout.write(self.style.ERROR(f"Purge failed: {purge['error']}"))
+
+            if interval <= 0:
+                break
+            time.sleep(max(0, interval - (time.monotonic() - started)))
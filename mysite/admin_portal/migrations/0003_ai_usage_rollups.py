@@ -0,0 +1,64 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def rollup_fields():
+    return [
+        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+        ('bucket_start', models.DateTimeField()),
+        ('log_type', models.CharField(max_length=50)),
+        ('count', models.PositiveIntegerField(default=0)),
+        ('error_count', models.PositiveIntegerField(default=0)),
+        ('partial_count', models.PositiveIntegerField(default=0)),
+        ('total_processing_ms', models.BigIntegerField(default=0)),
+        ('max_processing_ms', models.IntegerField(default=0)),
+        ('latency_histogram', models.TextField(default='[]')),
+        ('p50_ms', models.IntegerField(blank=True, null=True)),
+        ('p95_ms', models.IntegerField(blank=True, null=True)),
+        ('p99_ms', models.IntegerField(blank=True, null=True)),
+        ('updated_at', models.DateTimeField(auto_now=True)),
+        ('model_config', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='admin_portal.aimodelconfig')),
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_portal', '0002_systemstat'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aiusagelog',
+            index=models.Index(fields=['created_at'], name='admin_porta_created_5be0f3_idx'),
+        ),
+        migrations.CreateModel(
+            name='AIUsageHourlyRollup',
+            fields=rollup_fields(),
+            options={
+                'ordering': ['bucket_start'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['bucket_start', 'log_type'], name='admin_porta_bucket__4d1e7b_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AIUsageDailyRollup',
+            fields=rollup_fields(),
+            options={
+                'ordering': ['bucket_start'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['bucket_start', 'log_type'], name='admin_porta_bucket__8a93c2_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,3 +1,5 @@
+import json
+
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -25,6 +27,18 @@ class AIModelConfig(models.Model):
     
     def __str__(self):
         return f"{self.name} v{self.version}"
+    
+    def get_configuration(self):
+        """Get configuration data as a dictionary (parsed once per instance)"""
+        cached = self.__dict__.get('_parsed_configuration')
+        if cached is not None and cached[0] == self.configuration_data:
+            return cached[1]
+        try:
+            parsed = json.loads(self.configuration_data)
+        except (TypeError, ValueError):
+            parsed = {}
+        self._parsed_configuration = (self.configuration_data, parsed)
+        return parsed
 
 class AIUsageLog(models.Model):
     """Model to track AI usage and performance"""
@@ -58,5 +72,96 @@ class AIUsageLog(models.Model):
     error_message = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='admin_porta_created_5be0f3_idx'),  # Retention purge
+        ]
+    
     def __str__(self):
         return f"{self.log_type} log for {self.user.username if self.user else 'Unknown user'}"
+
+class SystemStat(models.Model):
+    """
+    Precomputed platform-wide counter for the admin dashboard.
+    
+    Rows are rebuilt by ``refresh_system_stats`` and nudged by signal
+    deltas in between (see admin_portal.services.system_service).
+    """
+    key = models.CharField(max_length=100, unique=True)  # e.g. appointments.status.Scheduled
+    value = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField()  # Last full recomputation
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+class AIUsageRollupBase(models.Model):
+    """
+    Aggregated AIUsageLog rows for one time bucket, log type and model.
+    
+    Latencies are kept as counts per fixed histogram bucket (see
+    admin_portal.services.ai_usage_service.LATENCY_BUCKETS_MS) so rollups
+    can be merged and percentiles estimated without the raw rows.
+    """
+    bucket_start = models.DateTimeField()
+    log_type = models.CharField(max_length=50)
+    model_config = models.ForeignKey(AIModelConfig, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    partial_count = models.PositiveIntegerField(default=0)
+    total_processing_ms = models.BigIntegerField(default=0)
+    max_processing_ms = models.IntegerField(default=0)
+    latency_histogram = models.TextField(default='[]')  # JSON list of counts per latency bucket
+    p50_ms = models.IntegerField(null=True, blank=True)
+    p95_ms = models.IntegerField(null=True, blank=True)
+    p99_ms = models.IntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def error_rate(self):
+        return self.error_count / self.count if self.count else 0.0
+    
+    @property
+    def avg_processing_ms(self):
+        return self.total_processing_ms / self.count if self.count else 0.0
+    
+    def get_latency_histogram(self):
+        """Get latency bucket counts as a list"""
+        try:
+            return json.loads(self.latency_histogram)
+        except (TypeError, ValueError):
+            return []
+    
+    def set_latency_histogram(self, counts):
+        """Set latency bucket counts from a list"""
+        self.latency_histogram = json.dumps(counts)
+
+class AIUsageHourlyRollup(AIUsageRollupBase):
+    """AI usage per hour"""
+    
+    class Meta:
+        ordering = ['bucket_start']
+        indexes = [
+            models.Index(fields=['bucket_start', 'log_type'], name='admin_porta_bucket__4d1e7b_idx'),
+        ]
+
+class AIUsageDailyRollup(AIUsageRollupBase):
+    """AI usage per (local) day"""
+    
+    class Meta:
+        ordering = ['bucket_start']
+        indexes = [
+            models.Index(fields=['bucket_start', 'log_type'], name='admin_porta_bucket__8a93c2_idx'),
+        ]
+
+class RollupWatermark(models.Model):
+    """Highest source row id already folded into a rollup job's tables"""
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
@@ -1 +1,3 @@
 from .ai_config_service import AIConfigurationService
+from .ai_usage_service import AIUsageAnalyticsService
+from .audit_service import AuditLogService
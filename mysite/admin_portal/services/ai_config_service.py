@@ -43,18 +43,6 @@ class AIConfigurationService:
             'last_updated': datetime.now().isoformat()
         }
     
-    @staticmethod
-    def get_ai_server_status():
-        """Get the status of AI servers"""
-        return {
-            'success': True,
-            'status': 'online',
-            'server_ip': '192.168.1.101',
-            'api_version': 'v1.2.3',
-            'active_connections': 17,
-            'response_time': '156ms'
-        }
-    
     @staticmethod
     def restart_ai_server():
         """Restart AI server"""
@@ -0,0 +1,283 @@
+# admin_portal/services/ai_usage_service.py
+import logging
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from admin_portal.models import AIUsageDailyRollup, AIUsageHourlyRollup, AIUsageLog, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (exclusive) of the latency histogram buckets; one extra
+# overflow bucket holds everything slower than the last bound
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000, 15000, 30000, 60000]
+BUCKET_COUNT = len(LATENCY_BUCKETS_MS) + 1
+
+WATERMARK_NAME = 'ai_usage_rollup'
+
+
+def _bucket_filter(index):
+    lower = LATENCY_BUCKETS_MS[index - 1] if index > 0 else None
+    upper = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else None
+    condition = Q()
+    if lower is not None:
+        condition &= Q(processing_time_ms__gte=lower)
+    if upper is not None:
+        condition &= Q(processing_time_ms__lt=upper)
+    return condition
+
+
+def percentile_from_histogram(counts, pct, max_value=None):
+    """
+    Estimate a percentile from histogram bucket counts, interpolating
+    linearly inside the bucket that contains it
+    """
+    total = sum(counts)
+    if not total:
+        return None
+
+    target = pct / 100.0 * total
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if count and cumulative + count >= target:
+            lower = LATENCY_BUCKETS_MS[index - 1] if index > 0 else 0
+            if index >= len(LATENCY_BUCKETS_MS):
+                # Overflow bucket has no upper bound
+                return int(max_value if max_value is not None else lower)
+            upper = LATENCY_BUCKETS_MS[index]
+            estimate = lower + (upper - lower) * (target - cumulative) / count
+            if max_value is not None:
+                estimate = min(estimate, max_value)
+            return int(round(estimate))
+        cumulative += count
+    return int(max_value) if max_value is not None else None
+
+
+def _merge_into(rollup, values):
+    """Fold one aggregate row into a rollup and refresh its percentiles"""
+    histogram = rollup.get_latency_histogram() or [0] * BUCKET_COUNT
+    histogram += [0] * (BUCKET_COUNT - len(histogram))
+    for index in range(BUCKET_COUNT):
+        histogram[index] += values['histogram'][index]
+
+    rollup.count += values['count']
+    rollup.error_count += values['errors']
+    rollup.partial_count += values['partial']
+    rollup.total_processing_ms += values['total_ms']
+    rollup.max_processing_ms = max(rollup.max_processing_ms, values['max_ms'])
+    rollup.set_latency_histogram(histogram)
+    rollup.p50_ms = percentile_from_histogram(histogram, 50, rollup.max_processing_ms)
+    rollup.p95_ms = percentile_from_histogram(histogram, 95, rollup.max_processing_ms)
+    rollup.p99_ms = percentile_from_histogram(histogram, 99, rollup.max_processing_ms)
+
+
+def _local_day_start(value):
+    local_day = timezone.localtime(value).date()
+    return timezone.make_aware(datetime.combine(local_day, time.min))
+
+
+class AIUsageAnalyticsService:
+    """
+    Hourly and daily AIUsageLog rollups.
+
+    ``run_rollup()`` folds only log rows above the stored watermark into
+    the rollup tables, so each run costs proportionally to new rows.
+    ``purge_raw_logs()`` deletes raw rows past the retention window in
+    chunks once they have been rolled up.
+    """
+
+    BATCH_SIZE = 50000  # source rows per aggregation transaction
+    SETTLE_SECONDS = 60  # leave very recent rows for the next run
+
+    @staticmethod
+    def _aggregate(low_id, high_id):
+        """Aggregate source rows in (low_id, high_id] per hour, log type and model"""
+        histogram_annotations = {
+            f'bucket_{index}': Count('id', filter=_bucket_filter(index))
+            for index in range(BUCKET_COUNT)
+        }
+        rows = AIUsageLog.objects.filter(
+            id__gt=low_id, id__lte=high_id
+        ).annotate(
+            hour=TruncHour('created_at', tzinfo=dt_timezone.utc)
+        ).values(
+            'hour', 'log_type', 'model_config_id'
+        ).annotate(
+            count=Count('id'),
+            errors=Count('id', filter=Q(result_status='failure')),
+            partial=Count('id', filter=Q(result_status='partial')),
+            total_ms=Sum('processing_time_ms'),
+            max_ms=Max('processing_time_ms'),
+            **histogram_annotations
+        ).order_by()
+
+        for row in rows:
+            row['histogram'] = [row.pop(f'bucket_{index}') for index in range(BUCKET_COUNT)]
+            row['total_ms'] = row['total_ms'] or 0
+            row['max_ms'] = row['max_ms'] or 0
+            yield row
+
+    @staticmethod
+    def _fold(model, grouped):
+        """Merge {(bucket_start, log_type, model_config_id): [rows]} into a rollup table"""
+        if not grouped:
+            return
+
+        existing = {
+            (rollup.bucket_start, rollup.log_type, rollup.model_config_id): rollup
+            for rollup in model.objects.filter(bucket_start__in={key[0] for key in grouped})
+        }
+
+        to_create, to_update = [], []
+        for key, rows in grouped.items():
+            rollup = existing.get(key)
+            if rollup is None:
+                rollup = model(bucket_start=key[0], log_type=key[1], model_config_id=key[2])
+                to_create.append(rollup)
+            else:
+                to_update.append(rollup)
+            for row in rows:
+                _merge_into(rollup, row)
+
+        updated_at = timezone.now()
+        for rollup in to_update:
+            rollup.updated_at = updated_at
+
+        model.objects.bulk_create(to_create)
+        model.objects.bulk_update(to_update, [
+            'count', 'error_count', 'partial_count', 'total_processing_ms', 'max_processing_ms',
+            'latency_histogram', 'p50_ms', 'p95_ms', 'p99_ms', 'updated_at'
+        ])
+
+    @staticmethod
+    def run_rollup(batch_size=None):
+        """
+        Fold new AIUsageLog rows into the hourly and daily rollups
+        """
+        batch_size = batch_size or AIUsageAnalyticsService.BATCH_SIZE
+        settled_before = timezone.now() - timedelta(seconds=AIUsageAnalyticsService.SETTLE_SECONDS)
+        processed = 0
+
+        try:
+            watermark, _ = RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+            high_id = AIUsageLog.objects.filter(
+                id__gt=watermark.last_id, created_at__lt=settled_before
+            ).aggregate(high=Max('id'))['high']
+
+            while high_id and watermark.last_id < high_id:
+                chunk_end = min(watermark.last_id + batch_size, high_id)
+
+                with transaction.atomic():
+                    watermark = RollupWatermark.objects.select_for_update().get(pk=watermark.pk)
+                    if watermark.last_id >= chunk_end:
+                        # Another runner got here first
+                        continue
+
+                    hourly, daily = {}, {}
+                    for row in AIUsageAnalyticsService._aggregate(watermark.last_id, chunk_end):
+                        hourly.setdefault((row['hour'], row['log_type'], row['model_config_id']), []).append(row)
+                        day = _local_day_start(row['hour'])
+                        daily.setdefault((day, row['log_type'], row['model_config_id']), []).append(row)
+                        processed += row['count']
+
+                    AIUsageAnalyticsService._fold(AIUsageHourlyRollup, hourly)
+                    AIUsageAnalyticsService._fold(AIUsageDailyRollup, daily)
+
+                    watermark.last_id = chunk_end
+                    watermark.save(update_fields=['last_id', 'updated_at'])
+
+            return {
+                'success': True,
+                'processed': processed,
+                'watermark': watermark.last_id
+            }
+        except Exception as e:
+            logger.error(f"Error rolling up AI usage logs: {str(e)}")
+            return {
+                'success': False,
+                'processed': processed,
+                'error': str(e)
+            }
+
+    @staticmethod
+    def purge_raw_logs(retention_days=None, chunk_size=None):
+        """
+        Delete raw AIUsageLog rows older than the retention window in
+        chunks; rows not yet rolled up are always kept
+        """
+        retention_days = retention_days or getattr(settings, 'AI_USAGE_LOG_RETENTION_DAYS', 90)
+        chunk_size = chunk_size or getattr(settings, 'AI_USAGE_PURGE_CHUNK_SIZE', 5000)
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        deleted = 0
+
+        try:
+            watermark = RollupWatermark.objects.filter(name=WATERMARK_NAME).values_list('last_id', flat=True).first() or 0
+            while True:
+                ids = list(AIUsageLog.objects.filter(
+                    created_at__lt=cutoff, id__lte=watermark
+                ).order_by('created_at').values_list('id', flat=True)[:chunk_size])
+                if not ids:
+                    break
+                count, _ = AIUsageLog.objects.filter(id__in=ids).delete()
+                deleted += count
+
+            return {
+                'success': True,
+                'deleted': deleted,
+                'cutoff': cutoff
+            }
+        except Exception as e:
+            logger.error(f"Error purging AI usage logs: {str(e)}")
+            return {
+                'success': False,
+                'deleted': deleted,
+                'error': str(e)
+            }
+
+    @staticmethod
+    def get_chart_data(period='hour', days=2, log_type=None, model_config_id=None):
+        """
+        Get chart series from the rollups, merging log types/models per bucket
+        """
+        model = AIUsageDailyRollup if period == 'day' else AIUsageHourlyRollup
+        since = timezone.now() - timedelta(days=days)
+
+        rollups = model.objects.filter(bucket_start__gte=since)
+        if log_type:
+            rollups = rollups.filter(log_type=log_type)
+        if model_config_id:
+            rollups = rollups.filter(model_config_id=model_config_id)
+
+        buckets = {}
+        for rollup in rollups.order_by('bucket_start'):
+            merged = buckets.setdefault(rollup.bucket_start, {
+                'count': 0, 'errors': 0, 'max_ms': 0, 'histogram': [0] * BUCKET_COUNT
+            })
+            merged['count'] += rollup.count
+            merged['errors'] += rollup.error_count
+            merged['max_ms'] = max(merged['max_ms'], rollup.max_processing_ms)
+            for index, value in enumerate(rollup.get_latency_histogram()[:BUCKET_COUNT]):
+                merged['histogram'][index] += value
+
+        labels, counts, error_rates, p50, p95, p99 = [], [], [], [], [], []
+        for bucket_start, merged in buckets.items():
+            labels.append(timezone.localtime(bucket_start).isoformat())
+            counts.append(merged['count'])
+            error_rates.append(round(merged['errors'] / merged['count'], 4) if merged['count'] else 0)
+            p50.append(percentile_from_histogram(merged['histogram'], 50, merged['max_ms']))
+            p95.append(percentile_from_histogram(merged['histogram'], 95, merged['max_ms']))
+            p99.append(percentile_from_histogram(merged['histogram'], 99, merged['max_ms']))
+
+        return {
+            'period': 'day' if period == 'day' else 'hour',
+            'labels': labels,
+            'count': counts,
+            'error_rate': error_rates,
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'p99_ms': p99,
+        }
@@ -0,0 +1,62 @@
+# admin_portal/services/audit_service.py
+import logging
+
+from common.models import AuditEvent
+from common.utils.keyset import keyset_page
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogService:
+    """Read side of the audit log for the admin portal"""
+
+    PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+
+    @staticmethod
+    def format_event(event):
+        """Format an event in the shape used by the admin log templates"""
+        return {
+            'id': event.id,
+            'timestamp': event.created_at,
+            'user': event.actor_username or 'system',
+            'action': event.action,
+            'entity_type': event.entity_type,
+            'entity_id': event.entity_id,
+            'ip_address': event.ip_address or '',
+            'details': event.details,
+            'success': event.success,
+        }
+
+    @staticmethod
+    def get_logs(action=None, actor_id=None, cursor=None, limit=None):
+        """
+        Get one page of audit events, newest first.
+
+        Filtering and keyset pagination run in the database on the
+        (action, created_at) / (actor, created_at) / (created_at) indexes,
+        so the cost of a page does not grow with the table.
+        """
+        limit = min(limit or AuditLogService.PAGE_SIZE, AuditLogService.MAX_PAGE_SIZE)
+
+        try:
+            queryset = AuditEvent.objects.all()
+            if action:
+                queryset = queryset.filter(action=action.upper())
+            if actor_id:
+                queryset = queryset.filter(actor_id=actor_id)
+
+            events, next_cursor = keyset_page(queryset, cursor=cursor, limit=limit)
+            return {
+                'success': True,
+                'logs': [AuditLogService.format_event(event) for event in events],
+                'next_cursor': next_cursor
+            }
+        except Exception as e:
+            logger.error(f"Error in get_logs: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'logs': [],
+                'next_cursor': None
+            }
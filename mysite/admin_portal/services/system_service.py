@@ -0,0 +1,276 @@
+# admin_portal/services/system_service.py
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Case, Count, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from admin_portal.models import AIUsageLog, SystemStat
+from common.models import Appointment, Message, Prescription
+from common.utils.dates import local_day_bounds, local_range_bounds
+from patient.models import Patient, PrescriptionRequest
+from provider.models import Provider
+
+logger = logging.getLogger(__name__)
+
+PENDING_PRESCRIPTION_STATUSES = ['Pending', 'Refill Requested']
+
+# Counters over a time window, by the window they cover. They are stored
+# under date-stamped keys (see window_key) so a new day, week or month
+# starts from a new row instead of carrying on the last one's count.
+WINDOW_COUNTERS = {
+    'registrations.today': 'today',
+    'registrations.this_week': 'this_week',
+    'registrations.this_month': 'this_month',
+    'appointments.today': 'today',
+    'appointments.this_week': 'this_week',
+    'appointments.this_month': 'this_month',
+    'messages.today': 'today',
+    'prescriptions.completed_today': 'today',
+    'ai_usage.today': 'today',
+    'ai_usage.failures_today': 'today',
+    'ai_usage.avg_processing_ms_today': 'today',
+}
+
+
+def _windows(now=None):
+    """Half-open local [start, end) ranges for today, this week and this month"""
+    today = timezone.localdate(now)
+    week_start = today - timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    return {
+        'today': local_day_bounds(today),
+        'this_week': local_range_bounds(week_start, week_start + timedelta(days=6)),
+        'this_month': local_range_bounds(month_start, next_month - timedelta(days=1)),
+    }
+
+
+def _in_window(value, bounds):
+    return value is not None and bounds[0] <= value < bounds[1]
+
+
+def _stamp(key, bounds):
+    return f'{key}@{timezone.localdate(bounds[0]).isoformat()}'
+
+
+def _is_window_key(key):
+    return '@' in key
+
+
+class SystemStatsService:
+    """
+    Platform-wide statistics for the admin dashboard.
+
+    Counters live in SystemStat rows. ``refresh()`` recomputes them with a
+    handful of aggregate queries (run it from the ``refresh_system_stats``
+    command), signals apply cheap ``apply_deltas()`` updates in between,
+    and ``get_stats()`` reads every counter in a single query.
+
+    Window counters (WINDOW_COUNTERS) are keyed by the date their window
+    starts, e.g. ``appointments.today@2026-10-19``, and created by the
+    first delta of a new window; refresh() drops those of past windows.
+    """
+
+    @staticmethod
+    def window_key(key, now=None):
+        """Key a window counter is stored under for the window containing ``now``"""
+        return _stamp(key, _windows(now)[WINDOW_COUNTERS[key]])
+
+    @staticmethod
+    def compute_stats(now=None):
+        """Recompute every counter from the source tables; returns {key: value}"""
+        windows = _windows(now)
+        today, week, month = windows['today'], windows['this_week'], windows['this_month']
+
+        def in_range(field, bounds):
+            return Q(**{f'{field}__gte': bounds[0], f'{field}__lt': bounds[1]})
+
+        stats = {}
+
+        patients = Patient.objects.aggregate(
+            total=Count('id'),
+            today=Count('id', filter=in_range('created_at', today)),
+            this_week=Count('id', filter=in_range('created_at', week)),
+            this_month=Count('id', filter=in_range('created_at', month)),
+        )
+        stats['patients.total'] = patients.pop('total')
+        stats.update({f'registrations.{name}': value for name, value in patients.items()})
+
+        providers = Provider.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+        )
+        stats.update({f'providers.{name}': value for name, value in providers.items()})
+
+        appointments = Appointment.objects.aggregate(
+            total=Count('id'),
+            today=Count('id', filter=in_range('time', today)),
+            this_week=Count('id', filter=in_range('time', week)),
+            this_month=Count('id', filter=in_range('time', month)),
+        )
+        stats.update({f'appointments.{name}': value for name, value in appointments.items()})
+
+        for status, _ in Appointment.STATUS_CHOICES:
+            stats[f'appointments.status.{status}'] = 0
+        for row in Appointment.objects.values('status').annotate(count=Count('id')).order_by():
+            stats[f"appointments.status.{row['status']}"] = row['count']
+
+        messages = Message.objects.aggregate(
+            total=Count('id'),
+            today=Count('id', filter=in_range('created_at', today)),
+            unread=Count('id', filter=Q(status='unread')),
+        )
+        stats.update({f'messages.{name}': value for name, value in messages.items()})
+
+        prescriptions = Prescription.objects.aggregate(
+            pending=Count('id', filter=Q(status__in=PENDING_PRESCRIPTION_STATUSES)),
+            completed_today=Count('id', filter=Q(status='Completed') & in_range('updated_at', today)),
+        )
+        stats.update({f'prescriptions.{name}': value for name, value in prescriptions.items()})
+
+        stats['prescription_requests.pending'] = PrescriptionRequest.objects.filter(status='pending').count()
+
+        ai_usage = AIUsageLog.objects.aggregate(
+            total=Count('id'),
+            today=Count('id', filter=in_range('created_at', today)),
+            failures_today=Count('id', filter=Q(result_status='failure') & in_range('created_at', today)),
+            avg_processing_ms_today=Avg('processing_time_ms', filter=in_range('created_at', today)),
+        )
+        ai_usage['avg_processing_ms_today'] = int(ai_usage['avg_processing_ms_today'] or 0)
+        stats.update({f'ai_usage.{name}': value for name, value in ai_usage.items()})
+
+        return {
+            _stamp(key, windows[WINDOW_COUNTERS[key]]) if key in WINDOW_COUNTERS else key: value
+            for key, value in stats.items()
+        }
+
+    @staticmethod
+    def refresh(now=None):
+        """Rebuild the rollup rows"""
+        try:
+            stats = SystemStatsService.compute_stats(now)
+            refreshed_at = timezone.now()
+
+            SystemStat.objects.bulk_create(
+                [SystemStat(key=key, value=value, refreshed_at=refreshed_at) for key, value in stats.items()],
+                update_conflicts=True,
+                unique_fields=['key'],
+                update_fields=['value', 'refreshed_at', 'updated_at'],
+            )
+            # Counters of windows that have ended
+            SystemStat.objects.filter(key__contains='@').exclude(key__in=list(stats)).delete()
+            return {
+                'success': True,
+                'count': len(stats),
+                'refreshed_at': refreshed_at
+            }
+        except Exception as e:
+            logger.error(f"Error refreshing system stats: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    @staticmethod
+    def apply_deltas(deltas):
+        """
+        Add {key: amount} to existing counters in a single UPDATE.
+
+        Window counters a new window hasn't created yet start from zero;
+        other keys without a row are ignored, the next refresh creates them.
+        """
+        deltas = {key: amount for key, amount in deltas.items() if amount}
+        if not deltas:
+            return 0
+
+        try:
+            new_windows = [key for key, amount in deltas.items() if _is_window_key(key) and amount > 0]
+            if new_windows:
+                now = timezone.now()
+                SystemStat.objects.bulk_create(
+                    [SystemStat(key=key, value=0, refreshed_at=now) for key in new_windows],
+                    ignore_conflicts=True,
+                )
+            return SystemStat.objects.filter(key__in=deltas.keys()).update(
+                value=F('value') + Case(
+                    *[When(key=key, then=Value(amount)) for key, amount in deltas.items()],
+                    default=Value(0),
+                    output_field=IntegerField()
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error applying system stat deltas: {str(e)}")
+            return 0
+
+    @staticmethod
+    def apply_deltas_on_commit(deltas):
+        """Apply deltas once the surrounding transaction commits"""
+        transaction.on_commit(lambda: SystemStatsService.apply_deltas(deltas))
+
+    @staticmethod
+    def window_deltas(prefix, value, amount=1, now=None):
+        """Deltas for the today/this_week/this_month counters a timestamp falls into"""
+        return {
+            _stamp(f'{prefix}.{name}', bounds): amount
+            for name, bounds in _windows(now).items()
+            if _in_window(value, bounds)
+        }
+
+    @staticmethod
+    def get_stats():
+        """
+        Get dashboard statistics from the rollup rows (one query)
+        """
+        rows = list(SystemStat.objects.values_list('key', 'value', 'refreshed_at'))
+        if all(_is_window_key(key) for key, _, _ in rows):
+            # First use: build the rollups once
+            SystemStatsService.refresh()
+            rows = list(SystemStat.objects.values_list('key', 'value', 'refreshed_at'))
+
+        values = {key: value for key, value, _ in rows}
+        refreshed = [refreshed_at for key, _, refreshed_at in rows if not _is_window_key(key)]
+        windows = _windows()
+
+        def get(key):
+            if key in WINDOW_COUNTERS:
+                key = _stamp(key, windows[WINDOW_COUNTERS[key]])
+            return values.get(key, 0)
+
+        return {
+            'total_patients': get('patients.total'),
+            'total_providers': get('providers.total'),
+            'active_providers': get('providers.active'),
+            'total_appointments': {
+                'today': get('appointments.today'),
+                'this_week': get('appointments.this_week'),
+                'this_month': get('appointments.this_month'),
+                'all_time': get('appointments.total'),
+            },
+            'appointments_by_status': {
+                key.split('.', 2)[2]: value
+                for key, value in values.items() if key.startswith('appointments.status.')
+            },
+            'new_registrations': {
+                'today': get('registrations.today'),
+                'this_week': get('registrations.this_week'),
+                'this_month': get('registrations.this_month'),
+            },
+            'prescription_requests': {
+                'pending': get('prescriptions.pending') + get('prescription_requests.pending'),
+                'completed_today': get('prescriptions.completed_today'),
+            },
+            'messages': {
+                'total': get('messages.total'),
+                'today': get('messages.today'),
+                'unread': get('messages.unread'),
+            },
+            'ai_usage': {
+                'total': get('ai_usage.total'),
+                'today': get('ai_usage.today'),
+                'failures_today': get('ai_usage.failures_today'),
+                'avg_processing_ms_today': get('ai_usage.avg_processing_ms_today'),
+            },
+            'last_refreshed': min(refreshed) if refreshed else None,
+        }
@@ -0,0 +1,131 @@
+# admin_portal/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from admin_portal.models import AIUsageLog
+from admin_portal.services.system_service import PENDING_PRESCRIPTION_STATUSES, SystemStatsService
+from common.models import Appointment, Message, Prescription
+from common.signals import remember_previous_status
+from patient.models import Patient, PrescriptionRequest
+from provider.models import Provider
+
+# Incremental deltas for the dashboard rollups between full refreshes.
+# Time-window counters only move for rows that fall inside the current
+# windows; refresh_system_stats corrects any drift.
+
+pre_save.connect(remember_previous_status, sender=PrescriptionRequest, dispatch_uid='prescription_request_previous_status')
+pre_save.connect(remember_previous_status, sender=Message, dispatch_uid='message_previous_status')
+
+
+def _status_change_deltas(key_for_status, instance, created):
+    """Move one count from the previous status key to the current one"""
+    deltas = {}
+    previous = None if created else getattr(instance, '_previous_status', None)
+    if previous == instance.status:
+        return deltas
+    for status, amount in ((previous, -1), (instance.status, 1)):
+        key = key_for_status(status) if status is not None else None
+        if key:
+            deltas[key] = deltas.get(key, 0) + amount
+    return deltas
+
+
+@receiver(post_save, sender=Patient)
+def patient_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        deltas = {'patients.total': 1}
+        deltas.update(SystemStatsService.window_deltas('registrations', instance.created_at))
+        SystemStatsService.apply_deltas_on_commit(deltas)
+
+
+@receiver(post_delete, sender=Patient)
+def patient_deleted_stats(sender, instance, **kwargs):
+    deltas = {'patients.total': -1}
+    deltas.update(SystemStatsService.window_deltas('registrations', instance.created_at, amount=-1))
+    SystemStatsService.apply_deltas_on_commit(deltas)
+
+
+@receiver(post_save, sender=Provider)
+def provider_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        SystemStatsService.apply_deltas_on_commit({
+            'providers.total': 1,
+            'providers.active': 1 if instance.is_active else 0,
+        })
+
+
+@receiver(post_delete, sender=Provider)
+def provider_deleted_stats(sender, instance, **kwargs):
+    SystemStatsService.apply_deltas_on_commit({
+        'providers.total': -1,
+        'providers.active': -1 if instance.is_active else 0,
+    })
+
+
+@receiver(post_save, sender=Appointment)
+def appointment_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = _status_change_deltas(lambda status: f'appointments.status.{status}', instance, created)
+    if created:
+        deltas['appointments.total'] = 1
+        deltas.update(SystemStatsService.window_deltas('appointments', instance.time))
+    SystemStatsService.apply_deltas_on_commit(deltas)
+
+
+@receiver(post_delete, sender=Appointment)
+def appointment_deleted_stats(sender, instance, **kwargs):
+    deltas = {
+        'appointments.total': -1,
+        f'appointments.status.{instance.status}': -1,
+    }
+    deltas.update(SystemStatsService.window_deltas('appointments', instance.time, amount=-1))
+    SystemStatsService.apply_deltas_on_commit(deltas)
+
+
+@receiver(post_save, sender=Prescription)
+def prescription_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = _status_change_deltas(
+        lambda status: 'prescriptions.pending' if status in PENDING_PRESCRIPTION_STATUSES else None,
+        instance, created
+    )
+    previous = None if created else getattr(instance, '_previous_status', None)
+    if instance.status == 'Completed' and previous != 'Completed':
+        deltas[SystemStatsService.window_key('prescriptions.completed_today')] = 1
+    SystemStatsService.apply_deltas_on_commit(deltas)
+
+
+@receiver(post_save, sender=PrescriptionRequest)
+def prescription_request_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    SystemStatsService.apply_deltas_on_commit(_status_change_deltas(
+        lambda status: 'prescription_requests.pending' if status == 'pending' else None,
+        instance, created
+    ))
+
+
+@receiver(post_save, sender=Message)
+def message_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    # Reading a message moves it out of messages.unread
+    deltas = _status_change_deltas(
+        lambda status: 'messages.unread' if status == 'unread' else None, instance, created
+    )
+    if created:
+        deltas['messages.total'] = 1
+        deltas[SystemStatsService.window_key('messages.today')] = 1
+    SystemStatsService.apply_deltas_on_commit(deltas)
+
+
+@receiver(post_save, sender=AIUsageLog)
+def ai_usage_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        SystemStatsService.apply_deltas_on_commit({
+            'ai_usage.total': 1,
+            SystemStatsService.window_key('ai_usage.today'): 1,
+            SystemStatsService.window_key('ai_usage.failures_today'): 1 if instance.result_status == 'failure' else 0,
+        })
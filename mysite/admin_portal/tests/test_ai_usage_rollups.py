@@ -0,0 +1,97 @@
+# admin_portal/tests/test_ai_usage_rollups.py
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from admin_portal.models import AIUsageDailyRollup, AIUsageHourlyRollup, AIUsageLog, RollupWatermark
+from admin_portal.services.ai_usage_service import (
+    WATERMARK_NAME, AIUsageAnalyticsService, percentile_from_histogram
+)
+
+
+class AIUsageRollupTests(TestCase):
+    def create_logs(self, timings, created_at=None, **kwargs):
+        logs = [AIUsageLog.objects.create(processing_time_ms=ms, **kwargs) for ms in timings]
+        created_at = created_at or timezone.now() - timedelta(hours=1)
+        AIUsageLog.objects.filter(id__in=[log.id for log in logs]).update(created_at=created_at)
+        return logs
+
+    def test_rollup_aggregates_counts_errors_and_percentiles(self):
+        self.create_logs([100] * 90 + [2000] * 10, log_type='transcription')
+        self.create_logs([300], log_type='transcription', result_status='failure')
+
+        result = AIUsageAnalyticsService.run_rollup()
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['processed'], 101)
+        hourly = AIUsageHourlyRollup.objects.get(log_type='transcription')
+        self.assertEqual(hourly.count, 101)
+        self.assertEqual(hourly.error_count, 1)
+        self.assertEqual(hourly.max_processing_ms, 2000)
+        self.assertLess(hourly.p50_ms, 250)
+        self.assertGreaterEqual(hourly.p99_ms, 1500)
+        self.assertEqual(AIUsageDailyRollup.objects.get(log_type='transcription').count, 101)
+
+    def test_rollup_only_processes_rows_after_watermark(self):
+        self.create_logs([100, 200])
+        AIUsageAnalyticsService.run_rollup()
+
+        # Nothing new: the rollup is untouched
+        self.assertEqual(AIUsageAnalyticsService.run_rollup()['processed'], 0)
+        self.create_logs([300])
+        self.assertEqual(AIUsageAnalyticsService.run_rollup()['processed'], 1)
+
+        self.assertEqual(AIUsageHourlyRollup.objects.get().count, 3)
+        watermark = RollupWatermark.objects.get(name=WATERMARK_NAME)
+        self.assertEqual(watermark.last_id, AIUsageLog.objects.latest('id').id)
+
+    def test_rollup_in_small_batches_matches_single_pass(self):
+        self.create_logs([50 * index for index in range(1, 21)])
+
+        AIUsageAnalyticsService.run_rollup(batch_size=3)
+
+        rollup = AIUsageHourlyRollup.objects.get()
+        self.assertEqual(rollup.count, 20)
+        self.assertEqual(sum(rollup.get_latency_histogram()), 20)
+
+    def test_recent_rows_wait_for_next_run(self):
+        log = AIUsageLog.objects.create(processing_time_ms=100)
+
+        self.assertEqual(AIUsageAnalyticsService.run_rollup()['processed'], 0)
+        self.assertTrue(AIUsageLog.objects.filter(id=log.id).exists())
+
+    @override_settings(AI_USAGE_LOG_RETENTION_DAYS=30, AI_USAGE_PURGE_CHUNK_SIZE=2)
+    def test_purge_deletes_old_rolled_up_rows_in_chunks(self):
+        old = timezone.now() - timedelta(days=40)
+        self.create_logs([100] * 5, created_at=old)
+        AIUsageAnalyticsService.run_rollup()
+        self.create_logs([100] * 3, created_at=timezone.now() - timedelta(days=10))
+        # Old but not yet rolled up
+        pending = self.create_logs([100], created_at=old)
+
+        result = AIUsageAnalyticsService.purge_raw_logs()
+
+        self.assertEqual(result['deleted'], 5)
+        self.assertEqual(AIUsageLog.objects.count(), 4)
+        self.assertTrue(AIUsageLog.objects.filter(id=pending[0].id).exists())
+        # Rollups survive the purge
+        self.assertEqual(AIUsageDailyRollup.objects.get().count, 5)
+
+    def test_chart_data_merges_rollups_per_bucket(self):
+        self.create_logs([100, 100], log_type='transcription')
+        self.create_logs([100, 100], log_type='clinical_notes', result_status='failure')
+        AIUsageAnalyticsService.run_rollup()
+
+        data = AIUsageAnalyticsService.get_chart_data(period='hour', days=1)
+
+        self.assertEqual(data['count'], [4])
+        self.assertEqual(data['error_rate'], [0.5])
+
+    def test_percentile_from_histogram(self):
+        self.assertIsNone(percentile_from_histogram([0, 0, 0], 50))
+        # All samples in the [0, 50) bucket
+        self.assertLessEqual(percentile_from_histogram([10, 0, 0], 99), 50)
+        # Overflow bucket falls back to the observed maximum
+        counts = [0] * 15 + [1]
+        self.assertEqual(percentile_from_histogram(counts, 50, max_value=90000), 90000)
@@ -0,0 +1,117 @@
+# admin_portal/tests/test_system_stats.py
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.template.loader import render_to_string
+from django.test import override_settings
+from django.urls import include, path
+from django.utils import timezone
+
+from admin_portal.models import SystemStat
+from admin_portal.services.system_service import SystemStatsService
+from common.models import Appointment, Message
+from provider.tests.base import ProviderTestCase
+
+# The admin portal templates reverse its namespaced URLs
+urlpatterns = [path('admin-portal/', include('admin_portal.urls'))]
+
+
+class SystemStatsServiceTests(ProviderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.patient = User.objects.create_user(username='patient')
+
+    def create_appointment(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Appointment.objects.create(
+                patient=self.patient, doctor=self.provider, time=timezone.now(), **kwargs
+            )
+
+    def test_dashboard_reads_rollups_in_one_query(self):
+        self.create_appointment()
+        SystemStatsService.refresh()
+
+        with self.assertNumQueries(1):
+            stats = SystemStatsService.get_stats()
+
+        self.assertEqual(stats['total_providers'], 1)
+        self.assertEqual(stats['total_appointments']['all_time'], 1)
+        self.assertEqual(stats['total_appointments']['today'], 1)
+        self.assertEqual(stats['appointments_by_status']['Scheduled'], 1)
+
+    def test_deltas_track_changes_between_refreshes(self):
+        SystemStatsService.refresh()
+
+        appointment = self.create_appointment()
+        appointment.status = 'Completed'
+        with self.captureOnCommitCallbacks(execute=True):
+            appointment.save()
+
+        stats = SystemStatsService.get_stats()
+        self.assertEqual(stats['total_appointments']['all_time'], 1)
+        self.assertEqual(stats['appointments_by_status']['Scheduled'], 0)
+        self.assertEqual(stats['appointments_by_status']['Completed'], 1)
+
+        # A full refresh agrees with the incremental counters
+        incremental = dict(SystemStat.objects.values_list('key', 'value'))
+        SystemStatsService.refresh()
+        self.assertEqual(dict(SystemStat.objects.values_list('key', 'value')), incremental)
+
+    def test_window_counters_roll_over_at_midnight(self):
+        self.create_appointment()
+        SystemStatsService.refresh()
+        self.assertEqual(SystemStatsService.get_stats()['total_appointments']['today'], 1)
+
+        tomorrow = timezone.now() + timedelta(days=1)
+        with mock.patch('django.utils.timezone.now', return_value=tomorrow):
+            stats = SystemStatsService.get_stats()
+            self.assertEqual(stats['total_appointments']['today'], 0)
+            self.assertEqual(stats['total_appointments']['all_time'], 1)
+
+            # The first delta of the new day starts its counter
+            self.create_appointment()
+            self.assertEqual(SystemStatsService.get_stats()['total_appointments']['today'], 1)
+
+            # Refresh agrees and drops the previous day's counter
+            SystemStatsService.refresh()
+            self.assertEqual(SystemStatsService.get_stats()['total_appointments']['today'], 1)
+            self.assertFalse(SystemStat.objects.filter(
+                key=SystemStatsService.window_key('appointments.today', timezone.now() - timedelta(days=1))
+            ).exists())
+
+    def test_reading_a_message_decrements_unread(self):
+        SystemStatsService.refresh()
+        with self.captureOnCommitCallbacks(execute=True):
+            message = Message.objects.create(
+                sender=self.patient, recipient=self.provider.user, subject='Question', content='Hello'
+            )
+        stats = SystemStatsService.get_stats()['messages']
+        self.assertEqual((stats['total'], stats['today'], stats['unread']), (1, 1, 1))
+
+        message.status = 'read'
+        with self.captureOnCommitCallbacks(execute=True):
+            message.save()
+        self.assertEqual(SystemStatsService.get_stats()['messages']['unread'], 0)
+
+        incremental = dict(SystemStat.objects.values_list('key', 'value'))
+        SystemStatsService.refresh()
+        self.assertEqual(dict(SystemStat.objects.values_list('key', 'value')), incremental)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_dashboard_renders_real_counts(self):
+        self.create_appointment(status='Completed')
+        SystemStatsService.refresh()
+
+        html = render_to_string('custom_admin/dashboard.html', {'stats': SystemStatsService.get_stats(), 'logs': []})
+
+        # Zero counts are shown as zero, not replaced by placeholder numbers
+        self.assertInHTML('<p class="text-2xl font-semibold text-gray-800">0</p>', html, count=2)
+        self.assertNotIn('99.9%', html)
+        self.assertInHTML(
+            '<li class="flex justify-between text-sm"><span class="text-gray-600">Completed</span>'
+            '<span class="font-medium">1</span></li>', html
+        )
+        self.assertIn('Unread Messages', html)
+        self.assertIn('Failures today', html)
+        self.assertNotIn('Last refreshed: never', html)
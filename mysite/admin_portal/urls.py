@@ -7,8 +7,10 @@ app_name = 'admin_portal'
 urlpatterns = [
     path('', views.admin_dashboard, name='admin_dashboard'),
     path('patients/', views.admin_patients, name='admin_patients'),
+    path('patients/<int:patient_id>/export/', views.export_patient_data, name='export_patient_data'),
     path('providers/', views.admin_providers, name='admin_providers'),
     path('logs/', views.admin_logs, name='admin_logs'),
+    path('logs/ai-usage/', views.ai_usage_logs, name='ai_usage_logs'),
     
     # AI Config
     path('ai-config/', views.ai_config_dashboard, name='ai_config_dashboard'),
@@ -1,7 +1,7 @@
 # admin_portal/views/__init__.py
 from .dashboard import admin_dashboard
 from .logs import logs_dashboard, ai_usage_logs, user_activity_logs
-from .patients import patients_list, patient_detail
+from .patients import patients_list, patient_detail, export_patient_data
 from .providers import providers_list, provider_detail, add_provider
 
 # Add aliases for the URL patterns
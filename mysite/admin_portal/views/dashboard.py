@@ -1,10 +1,12 @@
 from django.shortcuts import render
 from admin_portal.services import AIConfigurationService
-from theme_name.data_access import get_current_admin, get_system_stats, get_admin_logs
+from admin_portal.services.system_service import SystemStatsService
+from theme_name.data_access import get_current_admin, get_admin_logs
 
 def admin_dashboard(request):
     admin = get_current_admin(request)
-    stats = get_system_stats()
+    # Precomputed rollups (see refresh_system_stats); a single query
+    stats = SystemStatsService.get_stats()
     logs = get_admin_logs(limit=10)
     return render(request, "custom_admin/dashboard.html", {
         'admin': admin,
@@ -1,31 +1,25 @@
 from django.shortcuts import render
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from theme_name.data_access import get_admin_logs
+from admin_portal.models import AIModelConfig, AIUsageLog
+from admin_portal.services.ai_usage_service import AIUsageAnalyticsService
+from admin_portal.services.audit_service import AuditLogService
 
 def admin_logs(request):
     """Admin logs view"""
-    # Get system logs
-    logs = get_admin_logs()
-    
-    # Filter logs if needed
     log_type = request.GET.get('type', 'all')
-    if log_type != 'all':
-        logs = [log for log in logs if log.get('action', '') == log_type.upper()]
-    
-    # Pagination
-    page_number = request.GET.get('page', 1)
-    paginator = Paginator(logs, 20)
+    actor_id = request.GET.get('user')
+    cursor = request.GET.get('cursor')
     
-    try:
-        page_obj = paginator.page(page_number)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    # Filter and paginate in the database; pages are addressed by cursor
+    result = AuditLogService.get_logs(
+        action=None if log_type == 'all' else log_type,
+        actor_id=actor_id if actor_id and actor_id.isdigit() else None,
+        cursor=cursor
+    )
     
     context = {
-        'logs': page_obj,
-        'page_obj': page_obj,
+        'logs': result['logs'],
+        'next_cursor': result['next_cursor'],
+        'cursor': cursor,
         'log_type': log_type,
         'active_section': 'logs',
         'admin_name': 'Admin'
@@ -38,8 +32,34 @@ def logs_dashboard(request):
     return render(request, 'custom_admin/logs_dashboard.html')
 
 def ai_usage_logs(request):
-    """View for AI usage logs"""
-    return render(request, 'custom_admin/ai_usage_logs.html')
+    """View for AI usage logs, charted from the hourly/daily rollups"""
+    period = 'day' if request.GET.get('period') == 'day' else 'hour'
+    days = request.GET.get('days', '')
+    days = min(int(days), 365) if days.isdigit() and int(days) > 0 else (30 if period == 'day' else 2)
+    log_type = request.GET.get('log_type') or None
+    model_config_id = request.GET.get('model')
+    model_config_id = int(model_config_id) if model_config_id and model_config_id.isdigit() else None
+
+    chart_data = AIUsageAnalyticsService.get_chart_data(
+        period=period,
+        days=days,
+        log_type=log_type,
+        model_config_id=model_config_id
+    )
+
+    context = {
+        'chart_data': chart_data,
+        'period': period,
+        'days': days,
+        'log_type': log_type or '',
+        'model_config_id': model_config_id,
+        'log_types': AIUsageLog.LOG_TYPE_CHOICES,
+        'model_configs': AIModelConfig.objects.only('id', 'name', 'version').order_by('name'),
+        'active_section': 'logs',
+        'admin_name': 'Admin'
+    }
+
+    return render(request, 'custom_admin/ai_usage_logs.html', context)
 
 def user_activity_logs(request):
     """View for user activity logs"""
@@ -1,9 +1,13 @@
-from django.shortcuts import render
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from theme_name.data_access import get_all_patients
 # admin_portal/views/patients.py
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.models import User
+from django.core.paginator import EmptyPage, PageNotAnInteger
+
+from common.utils.pagination import ApproximateCountPaginator
+from patient.models import Patient
+from patient.services.export_service import PatientExportService
 
 def patients_list(request):
     """View for listing patients in admin portal"""
@@ -17,23 +21,20 @@ def patient_detail(request, patient_id):
 
 def admin_patients(request):
     """Admin patients management view"""
-    # Get all patients
-    patients = get_all_patients()
-    
-    # Search and filtering logic
-    search_query = request.GET.get('search', '')
-    if search_query:
-        patients = [
-            p for p in patients 
-            if search_query.lower() in p.get('first_name', '').lower() or 
-               search_query.lower() in p.get('last_name', '').lower() or
-               search_query.lower() in p.get('email', '').lower() or
-               search_query.lower() in p.get('ohip_number', '').lower()
-        ]
-    
-    # Pagination
+    search_query = request.GET.get('search', '').strip()
+    
+    # Indexed prefix search on the normalized name/email/OHIP columns;
+    # ordering and pagination run in the database
+    patients = Patient.objects.select_related('user', 'primary_provider__user').search(
+        search_query
+    ).in_name_order()
+    
+    # Unfiltered listings of very large tables can use the row estimate
+    # instead of COUNT(*)
+    approximate = not search_query and request.GET.get('exact_count') != '1'
+    
     page_number = request.GET.get('page', 1)
-    paginator = Paginator(patients, 10)
+    paginator = ApproximateCountPaginator(patients, 10, approximate=approximate)
     
     try:
         page_obj = paginator.page(page_number)
@@ -45,9 +46,31 @@ def admin_patients(request):
     context = {
         'patients': page_obj,
         'page_obj': page_obj,
+        'total_is_approximate': paginator.is_approximate,
         'search_query': search_query,
         'active_section': 'patients',
         'admin_name': 'Admin'
     }
     
     return render(request, "custom_admin/patients.html", context)
+
+@staff_member_required
+def export_patient_data(request, patient_id):
+    """Full record export for a patient access request"""
+    patient = get_object_or_404(Patient.objects.select_related('user'), id=patient_id)
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        export_format = 'ndjson'
+    
+    # Large records are built by process_data_exports rather than holding
+    # the request open
+    if request.GET.get('background') == '1' or PatientExportService.should_run_in_background(patient):
+        export = PatientExportService.request_export(patient, requested_by=request.user, export_format=export_format)
+        messages.success(
+            request,
+            f"Export #{export.id} for {patient.user.get_full_name()} has been queued. "
+            "It will be available in Django admin under Patient data exports."
+        )
+        return redirect('admin_portal:admin_patients')
+    
+    return PatientExportService.streaming_response(patient, export_format, requested_by=request.user)
@@ -0,0 +1,148 @@
+# api/authentication.py
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from api.utils import is_process_local_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'api-token'
+
+
+def get_cache_timeout():
+    return getattr(settings, 'API_TOKEN_CACHE_TIMEOUT', 300)
+
+
+def get_token_cache():
+    """
+    The cache token lookups are kept in, or None when API_TOKEN_CACHE_ALIAS
+    is process-local: a rotation or deactivation handled by one worker
+    could not evict the entry held by another, which would keep
+    accepting the old key until it expired
+    """
+    cache = caches[getattr(settings, 'API_TOKEN_CACHE_ALIAS', 'default')]
+    return None if is_process_local_cache(cache) else cache
+
+
+def _token_cache_key(key):
+    # Hashed so raw tokens never appear in the cache backend
+    return f'{KEY_PREFIX}:key:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _user_cache_key(user_id):
+    return f'{KEY_PREFIX}:user:{user_id}'
+
+
+def forget_token(key):
+    cache = get_token_cache()
+    if cache is not None:
+        cache.delete(_token_cache_key(key))
+
+
+def forget_user(user_id):
+    """Drop the cached lookup of a user's token, if any"""
+    cache = get_token_cache()
+    if cache is None:
+        return
+    cache_key = cache.get(_user_cache_key(user_id))
+    if cache_key:
+        cache.delete_many([cache_key, _user_cache_key(user_id)])
+
+
+def token_expires_at(created):
+    """When a token created at ``created`` expires, or None if tokens don't expire"""
+    ttl = getattr(settings, 'API_TOKEN_TTL', None)
+    if not ttl:
+        return None
+    return created + timedelta(seconds=ttl)
+
+
+def is_token_expired(created):
+    expires_at = token_expires_at(created)
+    return expires_at is not None and expires_at <= timezone.now()
+
+
+def rotate_token(user):
+    """Replace a user's token with a new one; the old key stops working at once"""
+    with transaction.atomic():
+        Token.objects.filter(user=user).delete()
+        token = Token.objects.create(user=user)
+    logger.info(f"Rotated API token for user {user.pk}")
+    return token
+
+
+class LazyUser(SimpleLazyObject):
+    """
+    The authenticated user, loaded on first use.
+
+    pk, id and the authentication flags are answered from the token
+    lookup, so requests that only check them never query the user row.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id):
+        self.__dict__['_user_id'] = user_id
+        super().__init__(lambda: User.objects.get(pk=user_id))
+
+    @property
+    def pk(self):
+        return self.__dict__['_user_id']
+
+    id = pk
+
+    def __bool__(self):
+        return True
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that keeps token -> user lookups in the cache.
+
+    Entries live for API_TOKEN_CACHE_TIMEOUT seconds in the shared
+    API_TOKEN_CACHE_ALIAS cache and are dropped by signals when the token
+    is deleted or rotated and when its user is saved or deleted (see
+    api.signals), so a steady stream of requests authenticates without
+    queries. With a process-local cache nothing is cached (api.W001).
+    Tokens older than API_TOKEN_TTL seconds are rejected; clients get a
+    new one from token-auth/ or token-auth/rotate/.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cache_key = _token_cache_key(key)
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is None:
+            cached = self.load_token(key)
+            if cache is not None:
+                cache.set(cache_key, cached, get_cache_timeout())
+                cache.set(_user_cache_key(cached['user_id']), cache_key, get_cache_timeout())
+
+        if not cached['is_active']:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        if is_token_expired(cached['created']):
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+
+        token = Token(key=key, user_id=cached['user_id'], created=cached['created'])
+        return LazyUser(cached['user_id']), token
+
+    def load_token(self, key):
+        try:
+            user_id, created, is_active = Token.objects.filter(key=key).values_list(
+                'user_id', 'created', 'user__is_active'
+            ).get()
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        return {'user_id': user_id, 'created': created, 'is_active': is_active}
@@ -0,0 +1,28 @@
+# api/checks.py
+from django.conf import settings
+from django.core.cache import caches
+from django.core.checks import Tags, Warning, register
+
+from api.utils import is_process_local_cache
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """Token lookups and rate limits need a cache every worker shares"""
+    warnings = []
+    token_alias = getattr(settings, 'API_TOKEN_CACHE_ALIAS', 'default')
+    if is_process_local_cache(caches[token_alias]):
+        warnings.append(Warning(
+            f"The '{token_alias}' cache (API_TOKEN_CACHE_ALIAS) is process-local, so API token "
+            f"lookups are not cached and every request queries the database.",
+            hint="Configure a shared cache backend such as Redis (REDIS_URL).",
+            id='api.W001',
+        ))
+    if getattr(settings, 'API_RATE_LIMIT_ENABLED', True) and is_process_local_cache(caches['default']):
+        warnings.append(Warning(
+            "The 'default' cache is process-local, so API rate limits are enforced per worker "
+            "and a client can make capacity requests to each worker.",
+            hint="Configure a shared cache backend such as Redis (REDIS_URL).",
+            id='api.W002',
+        ))
+    return warnings
@@ -1,10 +1,9 @@
 # mysite/api/documentation.py
 import inspect
 from rest_framework.serializers import ModelSerializer
-from rest_framework.viewsets import ViewSet
+from rest_framework.viewsets import ViewSetMixin
 from rest_framework.decorators import action
 from django.urls import resolve, get_resolver
-import markdown
 
 class APIDocumentationGenerator:
     """
@@ -45,7 +44,7 @@ class APIDocumentationGenerator:
         
         # Extract permissions
         permission_classes = getattr(viewset_class, 'permission_classes', [])
-        permissions = [p.__name__ for p in permission_classes]
+        permissions = [self._permission_name(p) for p in permission_classes]
         
         # Compile the documentation
         viewset_docs = {
@@ -60,6 +59,16 @@ class APIDocumentationGenerator:
         self.docs[viewset_name] = viewset_docs
         return viewset_docs
     
+    def _permission_name(self, permission):
+        """Name of a permission class, or of a composition such as (A | B)"""
+        if hasattr(permission, 'op2_class'):
+            operator = '|' if permission.operator_class.__name__ == 'OR' else '&'
+            return (f"({self._permission_name(permission.op1_class)} {operator} "
+                    f"{self._permission_name(permission.op2_class)})")
+        if hasattr(permission, 'op1_class'):
+            return f"~{self._permission_name(permission.op1_class)}"
+        return permission.__name__
+    
     def _extract_serializer_info(self, serializer_class):
         """Extract information from a serializer class"""
         if not serializer_class or not issubclass(serializer_class, ModelSerializer):
@@ -223,7 +232,8 @@ class APIDocumentationGenerator:
             # Find all viewsets in the views module
             if hasattr(app_module, 'views'):
                 for name, cls in inspect.getmembers(app_module.views):
-                    if inspect.isclass(cls) and issubclass(cls, ViewSet) and cls != ViewSet:
+                    # ViewSetMixin also covers the generic and model viewsets
+                    if inspect.isclass(cls) and issubclass(cls, ViewSetMixin) and cls.__module__ == app_module.views.__name__:
                         self.generate_docs_for_viewset(cls)
         except ImportError:
             return f"Could not import app: {self.app_name}"
@@ -246,7 +256,7 @@ def generate_api_docs(viewset_or_app):
     if isinstance(viewset_or_app, str):
         generator.app_name = viewset_or_app
         return generator.generate_docs_for_app()
-    elif inspect.isclass(viewset_or_app) and issubclass(viewset_or_app, ViewSet):
+    elif inspect.isclass(viewset_or_app) and issubclass(viewset_or_app, ViewSetMixin):
         generator.generate_docs_for_viewset(viewset_or_app)
         return generator.generate_markdown_docs()
     else:
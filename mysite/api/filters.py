@@ -52,18 +52,24 @@ class BaseMessageFilter(django_filters.FilterSet):
 class BasePatientFilter(django_filters.FilterSet):
     """Base filter for patients"""
     name = django_filters.CharFilter(method='filter_name')
-    ohip_number = django_filters.CharFilter(lookup_expr='iexact')
+    ohip_number = django_filters.CharFilter(method='filter_ohip_number')
+    phone = django_filters.CharFilter(method='filter_phone')
     
     class Meta:
         model = Patient
-        fields = ['name', 'ohip_number', 'primary_provider']
+        fields = ['name', 'ohip_number', 'phone', 'primary_provider']
     
     def filter_name(self, queryset, name, value):
-        """Filter by patient name (first or last name)"""
-        return queryset.filter(
-            models.Q(user__first_name__icontains=value) | 
-            models.Q(user__last_name__icontains=value)
-        )
+        """Filter by patient name (prefix of first or last name)"""
+        return queryset.search(value)
+    
+    def filter_ohip_number(self, queryset, name, value):
+        """Exact OHIP match in any format ('1234-567-890-ab')"""
+        return queryset.by_ohip(value)
+    
+    def filter_phone(self, queryset, name, value):
+        """Exact match on primary or alternate phone in any format"""
+        return queryset.by_phone(value)
 
 class BaseProviderFilter(django_filters.FilterSet):
     """Base filter for providers"""
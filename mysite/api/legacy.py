@@ -0,0 +1,76 @@
+# api/legacy.py
+"""
+Aliases from the unversioned legacy API paths to v1.
+
+Legacy requests used to be answered with a redirect, costing clients a
+second round trip and dropping the body of redirected POSTs. They are
+now rewritten to their v1 path before URL resolution (see
+api.middleware.LegacyApiAliasMiddleware), with a hit counter per alias
+so unused ones can be retired.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Alias name -> (legacy path prefix, v1 path prefix). A prefix matches
+# itself, with or without its trailing slash, and any path below it.
+ALIASES = {
+    'provider': ('/api/provider', '/api/v1/provider'),
+    'patient': ('/api/patient', '/api/v1/patient'),
+    'users': ('/api/users', '/api/v1/users'),
+    'groups': ('/api/groups', '/api/v1/groups'),
+}
+
+# Exact legacy paths
+EXACT_ALIASES = {
+    'root': ('/api/', '/api/v1/'),
+}
+
+STATS_KEY_PREFIX = 'legacy-api'
+
+
+def resolve_alias(path):
+    """(alias name, v1 path) for a legacy API path, or None"""
+    for name, (legacy, target) in EXACT_ALIASES.items():
+        if path == legacy:
+            return name, target
+    for name, (legacy, target) in ALIASES.items():
+        if path == legacy or path.startswith(legacy + '/'):
+            return name, target + path[len(legacy):]
+    return None
+
+
+def record(name):
+    """Count a request served through an alias"""
+    if not getattr(settings, 'LEGACY_API_STATS_ENABLED', True):
+        return
+    key = f'{STATS_KEY_PREFIX}:hits:{name}'
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+    cache.set(f'{STATS_KEY_PREFIX}:last-seen:{name}', int(time.time()), None)
+
+
+def get_stats():
+    """Requests served and time of the last one, per alias"""
+    names = list(EXACT_ALIASES) + list(ALIASES)
+    values = cache.get_many(
+        [f'{STATS_KEY_PREFIX}:hits:{name}' for name in names]
+        + [f'{STATS_KEY_PREFIX}:last-seen:{name}' for name in names]
+    )
+    stats = {}
+    for name in names:
+        legacy, target = EXACT_ALIASES.get(name) or ALIASES[name]
+        stats[name] = {
+            'legacy_path': legacy,
+            'v1_path': target,
+            'requests': values.get(f'{STATS_KEY_PREFIX}:hits:{name}', 0),
+            'last_seen': values.get(f'{STATS_KEY_PREFIX}:last-seen:{name}'),
+        }
+    return stats
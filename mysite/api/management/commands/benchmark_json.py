@@ -0,0 +1,83 @@
+# api/management/commands/benchmark_json.py
+import statistics
+import time
+from datetime import timedelta
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.v1.provider.serializers import AppointmentSerializer, MessageSerializer
+from common.models import Appointment, Message
+from provider.models import Provider
+
+class Command(BaseCommand):
+    help = 'Compare stdlib and orjson render/parse times for appointment and message list payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Objects per payload')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement')
+
+    def build_payloads(self, rows):
+        """Serialize unsaved objects, so the benchmark never touches the database"""
+        now = timezone.now()
+        doctor = Provider(id=1, user=User(id=1, first_name='Test', last_name='Doctor'))
+        patients = [User(id=i + 2, first_name='Pat', last_name=f'Ient {i}') for i in range(50)]
+
+        appointments = [
+            Appointment(
+                id=i + 1, patient=patients[i % len(patients)], doctor=doctor,
+                time=now + timedelta(minutes=15 * i), type='Virtual' if i % 3 else 'In-Person',
+                status='Scheduled', reason=f'Follow-up visit {i}', notes='Bring medication list – café',
+            )
+            for i in range(rows)
+        ]
+        messages = [
+            Message(
+                id=i + 1, sender=patients[i % len(patients)], recipient=doctor.user,
+                subject=f'Question about prescription {i}', content='Hello doctor, ' * 20,
+                status='unread', created_at=now - timedelta(minutes=i),
+            )
+            for i in range(rows)
+        ]
+        return {
+            'appointments': AppointmentSerializer(appointments, many=True).data,
+            'messages': MessageSerializer(messages, many=True).data,
+        }
+
+    def time_runs(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; the fast classes use the stdlib'))
+
+        stdlib_renderer, fast_renderer = JSONRenderer(), renderers.FastJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), parsers.FastJSONParser()
+
+        self.stdout.write(f"{'payload':<14}{'bytes':>10}{'render std':>12}{'render fast':>13}"
+                          f"{'parse std':>11}{'parse fast':>12}{'speedup':>9}")
+        for name, data in self.build_payloads(rows).items():
+            expected = stdlib_renderer.render(data)
+            if fast_renderer.render(data) != expected:
+                self.stdout.write(self.style.ERROR(f"{name}: fast renderer output differs from JSONRenderer"))
+
+            render_std = self.time_runs(lambda: stdlib_renderer.render(data), repeat)
+            render_fast = self.time_runs(lambda: fast_renderer.render(data), repeat)
+            parse_std = self.time_runs(lambda: stdlib_parser.parse(BytesIO(expected)), repeat)
+            parse_fast = self.time_runs(lambda: fast_parser.parse(BytesIO(expected)), repeat)
+
+            self.stdout.write(
+                f"{name:<14}{len(expected):>10}{render_std:>10.2f}ms{render_fast:>11.2f}ms"
+                f"{parse_std:>9.2f}ms{parse_fast:>10.2f}ms{render_std / max(render_fast, 1e-6):>8.1f}x"
+            )
@@ -0,0 +1,11 @@
+# api/management/commands/compact_sync_log.py
+from django.core.management.base import BaseCommand
+
+from api import sync
+
+class Command(BaseCommand):
+    help = 'Remove delta-sync change log rows superseded by a later change to the same object'
+
+    def handle(self, *args, **options):
+        deleted = sync.compact()
+        self.stdout.write(f"Removed {deleted} superseded sync change(s)")
@@ -0,0 +1,52 @@
+# Creating a management command for documentation
+# mysite/api/management/commands/generate_api_docs.py
+from django.core.management.base import BaseCommand
+from api import schema
+from api.documentation import generate_api_docs
+import os
+
+class Command(BaseCommand):
+    help = 'Generate API documentation'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--app', type=str, help='App name to document')
+        parser.add_argument('--output', type=str, help='Output file path')
+        parser.add_argument('--artifacts', action='store_true',
+                            help='Build the OpenAPI JSON/YAML and HTML reference served by the API docs views '
+                                 '(run once per deploy)')
+        parser.add_argument('--output-dir', type=str, help='Artifacts directory (default: API_DOCS_ROOT)')
+        parser.add_argument('--if-stale', action='store_true',
+                            help='With --artifacts, only build when the code changed since the last build')
+    
+    def handle(self, *args, **options):
+        if options['artifacts']:
+            return self.build_artifacts(options)
+        
+        app_name = options.get('app')
+        output_file = options.get('output')
+        
+        if not app_name:
+            self.stdout.write(self.style.ERROR('Please provide an app name.'))
+            return
+        
+        docs = generate_api_docs(app_name)
+        
+        if output_file:
+            with open(output_file, 'w') as f:
+                f.write(docs)
+            self.stdout.write(self.style.SUCCESS(f'Documentation written to {output_file}'))
+        else:
+            self.stdout.write(docs)
+    
+    def build_artifacts(self, options):
+        root = options.get('output_dir') or schema.get_artifact_root()
+        fingerprint = schema.source_fingerprint()
+        if options['if_stale'] and schema.built_fingerprint(root) == fingerprint:
+            self.stdout.write(f'API docs artifacts in {root} are up to date ({fingerprint})')
+            return
+        
+        schema.build(root)
+        for file_name, _ in schema.ARTIFACTS.values():
+            path = os.path.join(root, file_name)
+            self.stdout.write(f'  {path} ({os.path.getsize(path)} bytes)')
+        self.stdout.write(self.style.SUCCESS(f'API docs artifacts {fingerprint} written to {root}'))
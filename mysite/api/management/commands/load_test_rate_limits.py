@@ -0,0 +1,72 @@
+# api/management/commands/load_test_rate_limits.py
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from api import throttling
+
+class Command(BaseCommand):
+    help = ('Hammer the rate limiter from concurrent clients against the configured cache: '
+            'reports per-request overhead and shows a noisy client cannot starve a quiet one')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--noisy-clients', type=int, default=8, help='Threads sharing one flooding client')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per noisy thread')
+        parser.add_argument('--scope', default='search', help='API_RATE_LIMITS scope to exercise')
+
+    def handle(self, *args, **options):
+        limit = throttling.get_limits()[options['scope']]
+        prefix = f"{throttling.KEY_PREFIX}:loadtest:{time.time_ns()}"
+        noisy_key, quiet_key = f'{prefix}:noisy', f'{prefix}:quiet'
+        results = {'noisy_allowed': 0, 'noisy_denied': 0, 'quiet_allowed': 0, 'quiet_denied': 0}
+        timings = []
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def noisy():
+            allowed = denied = 0
+            local_timings = []
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                ok, _ = throttling.take(noisy_key, limit['capacity'], limit['rate'])
+                local_timings.append((time.perf_counter() - started) * 1000)
+                allowed, denied = allowed + ok, denied + (not ok)
+            with lock:
+                results['noisy_allowed'] += allowed
+                results['noisy_denied'] += denied
+                timings.extend(local_timings)
+
+        def quiet():
+            # A well-behaved client, well under its rate
+            while not done.is_set():
+                ok, _ = throttling.take(quiet_key, limit['capacity'], limit['rate'])
+                results['quiet_allowed' if ok else 'quiet_denied'] += 1
+                time.sleep(1 / limit['rate'] * 2)
+
+        threads = [threading.Thread(target=noisy) for _ in range(options['noisy_clients'])]
+        quiet_thread = threading.Thread(target=quiet)
+        started = time.monotonic()
+        quiet_thread.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        quiet_thread.join()
+        elapsed = time.monotonic() - started
+
+        timings.sort()
+        expected = limit['capacity'] + limit['rate'] * elapsed
+        self.stdout.write(f"Scope '{options['scope']}': capacity {limit['capacity']}, {limit['rate']}/s, "
+                          f"{elapsed:.2f}s elapsed")
+        self.stdout.write(f"Noisy client: {results['noisy_allowed']} allowed (bucket allows ~{expected:.0f}), "
+                          f"{results['noisy_denied']} denied")
+        self.stdout.write(f"Quiet client: {results['quiet_allowed']} allowed, {results['quiet_denied']} denied")
+        self.stdout.write(
+            f"Limiter overhead: p50 {statistics.median(timings):.3f}ms, "
+            f"p99 {timings[int(len(timings) * 0.99) - 1]:.3f}ms"
+        )
+        if results['quiet_denied']:
+            self.stdout.write(self.style.ERROR('Quiet client was throttled: buckets are not isolated'))
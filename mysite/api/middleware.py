@@ -0,0 +1,31 @@
+# api/middleware.py
+import logging
+
+from api import legacy
+
+logger = logging.getLogger(__name__)
+
+
+class LegacyApiAliasMiddleware:
+    """
+    Serve legacy API paths (/api/provider/..., /api/patient/...,
+    /api/users/, /api/groups/, /api/) by rewriting them to their v1 path
+    before URL resolution, instead of redirecting.
+
+    Must come before CommonMiddleware so slash handling sees the v1
+    path. The original path is kept on request.legacy_api_path.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        alias = legacy.resolve_alias(request.path_info)
+        if alias is not None:
+            name, path_info = alias
+            request.legacy_api_path = request.path
+            request.path = request.path[:len(request.path) - len(request.path_info)] + path_info
+            request.path_info = path_info
+            legacy.record(name)
+            logger.debug(f"Legacy API path {request.legacy_api_path} served as {request.path}")
+        return self.get_response(request)
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-19 12:11
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_sync_changes(apps, schema_editor):
+    """Log every existing synced object so a first sync returns it"""
+    SyncChange = apps.get_model('api', 'SyncChange')
+    sources = [
+        ('appointment', apps.get_model('common', 'Appointment').objects.values_list('id', 'patient_id', 'doctor__user_id')),
+        ('prescription', apps.get_model('common', 'Prescription').objects.values_list('id', 'patient_id', 'doctor__user_id')),
+        ('prescription_request', apps.get_model('patient', 'PrescriptionRequest').objects.values_list('id', 'patient__user_id')),
+        ('message', apps.get_model('common', 'Message').objects.values_list('id', 'sender_id', 'recipient_id')),
+        ('document', apps.get_model('provider', 'GeneratedDocument').objects.values_list('id', 'patient_id', 'provider__user_id')),
+    ]
+
+    batch = []
+
+    def flush():
+        SyncChange.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        batch.clear()
+
+    for entity, rows in sources:
+        for object_id, *user_ids in rows.order_by('id').iterator(chunk_size=BATCH_SIZE):
+            for user_id in {user_id for user_id in user_ids if user_id}:
+                batch.append(SyncChange(user_id=user_id, entity=entity, object_id=object_id, action='upsert'))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+
+    flush()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+        ('common', '0012_appointment_message_updated_at'),
+        ('patient', '0007_patientdataexport'),
+        ('provider', '0008_provider_recordingsession_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sync_changes, migrations.RunPython.noop),
+    ]
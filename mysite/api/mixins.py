@@ -1,7 +1,429 @@
 # mysite/api/mixins.py
+import hashlib
+from functools import partial
+
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.db.models import Q
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import PrimaryKeyRelatedField
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from api import response_cache
+from api.serializers import PrefetchedPrimaryKeyRelatedField
+
+# Queryset plans are derived once per serializer class and field selection;
+# selections come from query params, so the memo is capped
+_queryset_plans = {}
+MAX_QUERYSET_PLANS = 1024
+
+def get_queryset_plan(serializer_class, selected_fields=None):
+    """
+    Build the queryset plan declared by a serializer.
+    
+    Serializers declare, on their Meta, the relations their fields read:
+        select_related   - forward relation paths (e.g. 'doctor__user')
+        prefetch_related - reverse / many-to-many paths
+        related_only     - columns to load on select_related models
+                           (e.g. 'patient__first_name'); optional
+        source_fields    - model columns read by method fields, by field
+                           name (e.g. {'html_content': ['rendered_content']})
+    
+    The model's own columns for .only() are taken from the serializer's
+    concrete model fields, limited to ``selected_fields`` when the request
+    asked for a sparse fieldset (see api.serializers.SparseFieldsMixin).
+    """
+    cache_key = (serializer_class, selected_fields)
+    if cache_key in _queryset_plans:
+        return _queryset_plans[cache_key]
+    
+    meta = getattr(serializer_class, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    select_related = list(getattr(meta, 'select_related', []))
+    prefetch_related = list(getattr(meta, 'prefetch_related', []))
+    source_fields = getattr(meta, 'source_fields', {})
+    only = []
+    
+    if model is not None:
+        only.append(model._meta.pk.name)
+        for name, field in serializer_class().fields.items():
+            if selected_fields is not None and name not in selected_fields:
+                continue
+            only.extend(source_fields.get(name, []))
+            source = field.source
+            if not source or source == '*' or '.' in source:
+                continue
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete and not model_field.many_to_many:
+                only.append(source)
+        
+        # Relations being joined must not be deferred
+        only.extend(path.split('__')[0] for path in select_related)
+        only.extend(getattr(meta, 'related_only', []))
+    
+    plan = {
+        'select_related': select_related,
+        'prefetch_related': prefetch_related,
+        'only': list(dict.fromkeys(only)),
+    }
+    if len(_queryset_plans) < MAX_QUERYSET_PLANS:
+        _queryset_plans[cache_key] = plan
+    return plan
+
+class QuerysetPlanningMixin:
+    """
+    Mixin that applies the serializer's declared relation needs to every
+    queryset the viewset serves, so list pages run a fixed number of queries.
+    
+    Implementing classes define get_base_queryset() instead of
+    get_queryset(). Column restriction via .only() is applied to read
+    requests only.
+    """
+    
+    def get_base_queryset(self):
+        return super().get_queryset()
+    
+    def get_queryset(self):
+        return self.plan_queryset(self.get_base_queryset())
+    
+    def plan_queryset(self, queryset):
+        """Apply select_related/prefetch_related/only for the current serializer"""
+        serializer_class = self.get_serializer_class()
+        selected_fields = None
+        if hasattr(serializer_class, 'get_selected_fields'):
+            # Collections unless the action works on a single object
+            selected_fields = serializer_class.get_selected_fields(
+                self.request, collection=not getattr(self, 'detail', False)
+            )
+        plan = get_queryset_plan(serializer_class, selected_fields)
+        
+        if plan['select_related']:
+            queryset = queryset.select_related(*plan['select_related'])
+        if plan['prefetch_related']:
+            queryset = queryset.prefetch_related(*plan['prefetch_related'])
+        if plan['only'] and self.request.method in SAFE_METHODS:
+            only = plan['only']
+            # Conditional GETs read the row timestamp; keep it loaded
+            last_modified_field = getattr(self, 'last_modified_field', None)
+            if last_modified_field and last_modified_field not in only:
+                only = only + [last_modified_field]
+            queryset = queryset.only(*only)
+        
+        return queryset
+
+class ConditionalGetMixin:
+    """
+    Mixin answering conditional GETs with 304 Not Modified before anything
+    is serialized.
+    
+    list() derives its validator from a single aggregate over the filtered
+    queryset, Max(last_modified_field) + Count(pk): creates and updates
+    move the max, deletes move the count. retrieve() uses the object's own
+    timestamp. The ETag also covers the user, the full request path (so
+    filters, ordering and page number) and the negotiated media type.
+    
+    Lists are validated by If-None-Match only, since a delete can leave
+    the newest timestamp unchanged; detail views also honour
+    If-Modified-Since. Related rows the serializer reads (e.g. a doctor's
+    name) are not part of the validator.
+    """
+    last_modified_field = 'updated_at'
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        state = queryset.order_by().aggregate(
+            count=Count('pk'), last_modified=Max(self.last_modified_field)
+        )
+        last_modified = state['last_modified']
+        etag = self.make_etag(
+            'list', state['count'], last_modified.isoformat() if last_modified else ''
+        )
+        
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self.set_validators(not_modified, etag, last_modified)
+        
+        response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+    
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field)
+        etag = self.make_etag('detail', instance.pk, last_modified.isoformat())
+        
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp())
+        )
+        if not_modified is not None:
+            return self.set_validators(not_modified, etag, last_modified)
+        
+        serializer = self.get_serializer(instance)
+        return self.set_validators(Response(serializer.data), etag, last_modified)
+    
+    def make_etag(self, *parts):
+        """Weak ETag over the current user and request plus the given state"""
+        identity = [
+            self.request.user.pk,
+            self.request.get_full_path(),
+            getattr(self.request, 'accepted_media_type', ''),
+            getattr(self, 'version', ''),
+        ]
+        digest = hashlib.sha1(
+            '|'.join(str(part) for part in identity + list(parts)).encode('utf-8')
+        ).hexdigest()
+        return f'W/"{digest}"'
+    
+    def set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # Per-user PHI: browsers may keep it but must revalidate, proxies may not
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+class ResponseCacheMixin:
+    """
+    Mixin caching read responses per user in the Django cache.
+    
+    Entries are keyed by user, endpoint, normalized query params, API
+    version and the user's data version for a scope; api/signals.py bumps
+    that version when Appointment, Message or Patient rows the user can
+    see change, so nothing is deleted on write and stale entries simply
+    age out. Recomputation is single-flight (see
+    api.response_cache.get_or_compute).
+    
+    Set ``response_cache_scope`` to cache list(); actions call
+    ``cached_response(scope, build)`` directly.
+    """
+    response_cache_scope = None
+    
+    def list(self, request, *args, **kwargs):
+        if self.response_cache_scope is None:
+            return super().list(request, *args, **kwargs)
+        build = partial(super().list, request, *args, **kwargs)
+        return self.cached_response(self.response_cache_scope, build)
+    
+    def cached_response(self, scope, build):
+        """Serve ``build()``'s response from the cache for the current user"""
+        if not self.request.user.is_authenticated or not getattr(settings, 'API_RESPONSE_CACHE_ENABLED', True):
+            return build()
+        
+        built = []
+        
+        def compute():
+            response = build()
+            built.append(response)
+            return response.data, response.status_code == 200
+        
+        data = response_cache.get_or_compute(scope, response_cache.make_key(scope, self.request), compute)
+        response = built[0] if built else Response(data)
+        response['X-Cache'] = 'MISS' if built else 'HIT'
+        return response
+
+class BulkWriteMixin:
+    """
+    Mixin adding batch writes to a ModelViewSet:
+    
+        POST  bulk/         create a list of objects
+        PATCH bulk/         partially update a list of objects, each with its 'id'
+        POST  bulk-status/  {"ids": [...], "status": "..."}
+    
+    Items are validated one by one by the many=True serializer's child,
+    with the related ids of the whole batch resolved by one in_bulk()
+    query per relation field. Valid items are written together with
+    bulk_create()/bulk_update() in one transaction; invalid items are
+    reported without blocking the rest.
+    
+    Bulk writes skip Model.save() and its signals, so
+    prepare_bulk_instance() applies save-time defaults and post_save is
+    sent for every written row, keeping the activity feed, dashboard
+    stats and response cache in step. pre_save is not sent; the stored
+    status is set on ``_previous_status`` the way
+    common.signals.remember_previous_status would.
+    
+    Responses list one result per item in request order, e.g.
+    {"index": 0, "status": "created", "id": 12}, and return 200/201 when
+    every item succeeded, 207 when some did and 400 when none did.
+    """
+    bulk_select_related = []
+    
+    FAILED_RESULTS = ('invalid', 'not_found', 'forbidden')
+    
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request):
+        """Create (POST) or partially update (PATCH) a list of objects"""
+        self.check_bulk_payload(request.data)
+        if request.method == 'POST':
+            return self.bulk_create(request.data)
+        return self.bulk_update(request.data)
+    
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Set the same status on a list of objects"""
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or 'status' not in request.data:
+            raise ValidationError({'detail': 'Expected {"ids": [...], "status": "..."}.'})
+        items = [{'id': pk, 'status': request.data['status']} for pk in ids]
+        self.check_bulk_payload(items)
+        return self.bulk_update(items)
+    
+    def check_bulk_payload(self, items):
+        max_items = getattr(settings, 'API_BULK_MAX_ITEMS', 500)
+        if not isinstance(items, list) or not items:
+            raise ValidationError({'detail': 'Expected a non-empty list of objects.'})
+        if len(items) > max_items:
+            raise ValidationError({'detail': f'At most {max_items} objects can be written per request.'})
+    
+    def get_bulk_save_kwargs(self):
+        """Attributes set on every created object, like perform_create()'s save() kwargs"""
+        return {}
+    
+    def prepare_bulk_instance(self, instance, created):
+        """Hook for logic Model.save() would have run"""
+    
+    def prefetch_related_fields(self, serializer, items):
+        """Swap writable pk relation fields for ones backed by one in_bulk() per field"""
+        for name, field in list(serializer.fields.items()):
+            if not isinstance(field, PrimaryKeyRelatedField) or field.read_only:
+                continue
+            model = field.get_queryset().model
+            pks = set()
+            for item in items:
+                value = item.get(name) if isinstance(item, dict) else None
+                if value is None or isinstance(value, bool):
+                    continue
+                try:
+                    pks.add(model._meta.pk.to_python(value))
+                except (TypeError, ValueError, DjangoValidationError):
+                    continue
+            objects = field.get_queryset().in_bulk(pks) if pks else {}
+            serializer.fields[name] = PrefetchedPrimaryKeyRelatedField(objects, **field._kwargs)
+    
+    def bulk_create(self, items):
+        serializer = self.get_serializer(data=items, many=True)
+        self.prefetch_related_fields(serializer.child, items)
+        model = serializer.child.Meta.model
+        save_kwargs = self.get_bulk_save_kwargs()
+        
+        results = [None] * len(items)
+        pending = []
+        for index, item in enumerate(items):
+            try:
+                attrs = serializer.child.run_validation(item)
+            except ValidationError as exc:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': exc.detail}
+                continue
+            instance = model(**{**attrs, **save_kwargs})
+            self.prepare_bulk_instance(instance, created=True)
+            pending.append((index, instance))
+        
+        if pending:
+            with transaction.atomic():
+                model.objects.bulk_create([instance for _, instance in pending])
+                for index, instance in pending:
+                    post_save.send(sender=model, instance=instance, created=True, update_fields=None,
+                                   raw=False, using=instance._state.db)
+                    results[index] = {'index': index, 'status': 'created', 'id': instance.pk}
+        
+        return self.bulk_response(results, status.HTTP_201_CREATED)
+    
+    def bulk_update(self, items):
+        serializer = self.get_serializer(data=items, many=True, partial=True)
+        self.prefetch_related_fields(serializer.child, items)
+        model = serializer.child.Meta.model
+        concrete_fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        
+        pks = {}
+        for index, item in enumerate(items):
+            try:
+                pks[index] = model._meta.pk.to_python(item.get('id') if isinstance(item, dict) else None)
+            except (TypeError, ValueError, DjangoValidationError):
+                pks[index] = None
+        instances = self.get_queryset().select_related(*self.bulk_select_related).in_bulk(
+            {pk for pk in pks.values() if pk is not None}
+        )
+        
+        results = [None] * len(items)
+        changed = {}
+        for index, item in enumerate(items):
+            pk = pks[index]
+            if pk is None:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': {'id': ['A valid id is required.']}}
+                continue
+            instance = instances.get(pk)
+            if instance is None:
+                results[index] = {'index': index, 'id': item['id'], 'status': 'not_found'}
+                continue
+            try:
+                self.check_object_permissions(self.request, instance)
+            except APIException:
+                results[index] = {'index': index, 'id': pk, 'status': 'forbidden'}
+                continue
+            try:
+                attrs = serializer.child.run_validation(item)
+            except ValidationError as exc:
+                results[index] = {'index': index, 'id': pk, 'status': 'invalid', 'errors': exc.detail}
+                continue
+            
+            before = {field.attname: getattr(instance, field.attname) for field in concrete_fields}
+            if hasattr(instance, 'status') and not hasattr(instance, '_previous_status'):
+                instance._previous_status = instance.status
+            for name, value in attrs.items():
+                setattr(instance, name, value)
+            self.prepare_bulk_instance(instance, created=False)
+            
+            fields = changed.setdefault(pk, set())
+            fields.update(
+                field.name for field in concrete_fields if getattr(instance, field.attname) != before[field.attname]
+            )
+            results[index] = {'index': index, 'id': pk, 'status': 'updated'}
+        
+        for index, result in enumerate(results):
+            if result['status'] == 'updated' and not changed.get(result['id']):
+                result['status'] = 'unchanged'
+        
+        to_write = [instances[pk] for pk, fields in changed.items() if fields]
+        if to_write:
+            update_fields = set().union(*changed.values())
+            auto_now = [field for field in concrete_fields if getattr(field, 'auto_now', False)]
+            now = timezone.now()
+            for instance in to_write:
+                for field in auto_now:
+                    setattr(instance, field.attname, now)
+            update_fields.update(field.name for field in auto_now)
+            
+            with transaction.atomic():
+                model.objects.bulk_update(to_write, sorted(update_fields))
+                for instance in to_write:
+                    post_save.send(sender=model, instance=instance, created=False,
+                                   update_fields=frozenset(changed[instance.pk]), raw=False,
+                                   using=instance._state.db)
+        
+        return self.bulk_response(results, status.HTTP_200_OK)
+    
+    def bulk_response(self, results, success_status):
+        failed = sum(1 for result in results if result['status'] in self.FAILED_RESULTS)
+        if not failed:
+            response_status = success_status
+        elif failed == len(results):
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response(
+            {'results': results, 'succeeded': len(results) - failed, 'failed': failed},
+            status=response_status
+        )
 
 class PaginationMixin:
     """Mixin providing standardized pagination functionality for viewsets"""
@@ -27,7 +449,7 @@ class MessageActionsMixin:
             status='deleted'
         ).order_by('-created_at')
         
-        return self.paginate_queryset_with_context(queryset)
+        return self.message_list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def sent(self, request):
@@ -36,7 +458,15 @@ class MessageActionsMixin:
             sender=request.user
         ).order_by('-created_at')
         
-        return self.paginate_queryset_with_context(queryset)
+        return self.message_list_response(queryset)
+    
+    def message_list_response(self, queryset):
+        if hasattr(self, 'plan_queryset'):
+            queryset = self.plan_queryset(queryset)
+        build = partial(self.paginate_queryset_with_context, queryset)
+        if hasattr(self, 'cached_response'):
+            return self.cached_response('messages', build)
+        return build()
     
     def get_message_model(self):
         """Override this method in the implementing viewset to return the Message model"""
@@ -1,3 +1,35 @@
+from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class SyncChange(models.Model):
+    """
+    Per-user change log behind the delta-sync endpoint.
+
+    Written by signals (see api.sync and api.signals): one row per user who
+    can see a changed object. The auto-increment id is the sync sequence
+    that client cursors point into.
+    """
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTION_CHOICES = [
+        (UPSERT, 'Created or updated'),
+        (DELETE, 'Deleted or no longer visible'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sync_changes')
+    entity = models.CharField(max_length=30)  # key of api.sync.ENTITIES
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['user', 'id'], name='api_syncch_user_id_6e1b3a_idx'),      # For sync pages
+            models.Index(fields=['entity', 'object_id'], name='api_syncch_entity_9c4d2f_idx'),  # For signals
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.entity} {self.object_id} for user {self.user_id}"
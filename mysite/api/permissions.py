@@ -109,6 +109,16 @@ class IsMessageParticipant(permissions.BasePermission):
         
         return False
 
+class IsMessageRecipient(permissions.BasePermission):
+    """
+    Object-level permission to only allow the recipient of a message to act on it.
+    
+    Used for recipient-side status changes (read, unread, archived); it
+    grants no access to a message's content.
+    """
+    def has_object_permission(self, request, view, obj):
+        return getattr(obj, 'recipient_id', None) == request.user.pk
+
 class IsPatientOrProvider(permissions.BasePermission):
     """
     Permission to allow either patients or providers to access a view.
@@ -0,0 +1,41 @@
+# api/renderers.py
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+    
+    Output matches DRF's compact JSON: UTC datetimes end in 'Z', UUIDs
+    are strings, and anything orjson doesn't handle natively (Decimal,
+    lazy translation strings, timedeltas, querysets) goes through DRF's
+    JSONEncoder.default. Pretty-printed requests (indent=, the browsable
+    API), ensure_ascii output and values orjson rejects, such as integers
+    wider than 64 bits, fall back to the stdlib renderer. Unlike it, NaN
+    and Infinity render as null rather than raising.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Escape U+2028/U+2029 like JSONRenderer so the output stays a
+        # strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,153 @@
+# api/response_cache.py
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'api-response'
+
+# Scopes cached per user, and the rows whose signals invalidate them
+# (see api/signals.py)
+SCOPES = ['appointments', 'messages', 'patients']
+
+STAT_EVENTS = ['hit', 'miss', 'coalesced']
+
+LOCK_TIMEOUT = 30  # seconds a recomputation may hold the single-flight lock
+WAIT_INTERVAL = 0.05  # seconds between polls while another request recomputes
+
+
+def get_timeout():
+    return getattr(settings, 'API_RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _version_key(scope, user_id):
+    return f'{KEY_PREFIX}:version:{scope}:{user_id}'
+
+
+def get_version(scope, user_id):
+    """
+    Current data version of a user's scope.
+
+    A missing counter starts from the clock rather than 1, so entries
+    written under an evicted counter are never served again.
+    """
+    key = _version_key(scope, user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(scope, user_id):
+    """Invalidate every cached response in a user's scope"""
+    key = _version_key(scope, user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_versions_on_commit(scope, user_ids):
+    """
+    Bump after the writing transaction commits, so a request racing the
+    write cannot cache pre-commit rows under the new version
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+
+    def bump():
+        for user_id in user_ids:
+            bump_version(scope, user_id)
+
+    transaction.on_commit(bump)
+
+
+def make_key(scope, request):
+    """Cache key for (user, endpoint, normalized query params, API and data version)"""
+    user_id = request.user.pk
+    params = sorted(
+        (name, sorted(values)) for name, values in request.query_params.lists()
+    )
+    identity = '|'.join([
+        request.get_host(),
+        request.path,
+        repr(params),
+        getattr(request, 'accepted_media_type', ''),
+        str(getattr(request, 'version', '')),
+    ])
+    digest = hashlib.sha1(identity.encode('utf-8')).hexdigest()
+    return f'{KEY_PREFIX}:{scope}:{user_id}:{get_version(scope, user_id)}:{digest}'
+
+
+def record(scope, event):
+    key = f'{KEY_PREFIX}:stats:{scope}:{event}'
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_stats():
+    """Hit/miss counters per scope, with the hit ratio"""
+    keys = {
+        f'{KEY_PREFIX}:stats:{scope}:{event}': (scope, event)
+        for scope in SCOPES for event in STAT_EVENTS
+    }
+    values = cache.get_many(list(keys))
+    stats = {scope: {event: 0 for event in STAT_EVENTS} for scope in SCOPES}
+    for key, (scope, event) in keys.items():
+        stats[scope][event] = values.get(key, 0)
+    for counters in stats.values():
+        served = counters['hit'] + counters['coalesced'] + counters['miss']
+        counters['hit_ratio'] = round((counters['hit'] + counters['coalesced']) / served, 4) if served else None
+    return stats
+
+
+def get_or_compute(scope, key, compute):
+    """
+    Return the cached value for ``key``, computing it on a miss.
+
+    Only one request per key recomputes at a time (single flight): it
+    takes a short-lived lock with cache.add(), and concurrent requests
+    for the same key wait for its result instead of all querying the
+    database. If the result doesn't appear within the lock timeout the
+    waiter computes it itself. ``compute`` returns (value, cacheable).
+    """
+    value = cache.get(key)
+    if value is not None:
+        record(scope, 'hit')
+        return value
+
+    lock_key = f'{key}:lock'
+    wait = getattr(settings, 'API_RESPONSE_CACHE_WAIT', 5)
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                record(scope, 'coalesced')
+                return value
+            if cache.get(lock_key) is None:
+                # The other request failed or finished without caching
+                break
+        logger.warning(f"Response cache {key} still missing after waiting; computing it here")
+        lock_key = None
+
+    try:
+        record(scope, 'miss')
+        value, cacheable = compute()
+        if cacheable:
+            cache.set(key, value, get_timeout())
+        return value
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
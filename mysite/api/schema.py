@@ -0,0 +1,220 @@
+# api/schema.py
+"""
+Precomputed OpenAPI schema and API reference.
+
+Introspecting every viewset and serializer takes seconds, so the
+OpenAPI JSON/YAML and the rendered API reference are generated once per
+deploy (``manage.py generate_api_docs --artifacts``) into API_DOCS_ROOT,
+under STATIC_ROOT by default. The schema views serve those files. A
+fingerprint of the API source code is stored with them, and they are
+regenerated on first use when the code no longer matches.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+import drf_yasg
+import rest_framework
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.views import get_schema_view as yasg_get_schema_view
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+logger = logging.getLogger(__name__)
+
+API_INFO = openapi.Info(
+    title="Healthcare Portal API",
+    default_version='v1',
+    description="API documentation for the Healthcare Portal",
+    terms_of_service="https://www.example.com/terms/",
+    contact=openapi.Contact(email="contact@example.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+# Artifact kind -> (file name, content type)
+ARTIFACTS = {
+    'json': ('openapi.json', 'application/json'),
+    'yaml': ('openapi.yaml', 'application/yaml'),
+    'html': ('index.html', 'text/html'),
+}
+MANIFEST = 'manifest.json'
+
+# Apps whose viewsets make up the API reference
+REFERENCE_APPS = ['api.v1.core', 'api.v1.patient', 'api.v1.provider']
+
+# Directories (relative to BASE_DIR) whose code the schema is built from
+DEFAULT_SOURCE_DIRS = ['api', 'common', 'patient', 'provider']
+
+REFERENCE_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 60rem; margin: 2rem auto; padding: 0 1rem; }}
+table {{ border-collapse: collapse; margin-bottom: 1rem; }}
+th, td {{ border: 1px solid #ccc; padding: .25rem .5rem; text-align: left; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+_fingerprint = None
+_verified = {}
+_lock = threading.Lock()
+
+
+def get_artifact_root():
+    return Path(getattr(settings, 'API_DOCS_ROOT', Path(settings.STATIC_ROOT) / 'api-docs'))
+
+
+def source_fingerprint():
+    """
+    Hash of the code the artifacts are generated from: Python sources under
+    API_DOCS_SOURCE_DIRS (migrations and tests excluded) and the DRF and
+    drf_yasg versions. Computed once per process, as code only changes
+    with a restart.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        base_dir = Path(settings.BASE_DIR)
+        digest = hashlib.sha256(f'{rest_framework.VERSION}:{drf_yasg.__version__}'.encode())
+        for directory in getattr(settings, 'API_DOCS_SOURCE_DIRS', DEFAULT_SOURCE_DIRS):
+            for path in sorted((base_dir / directory).rglob('*.py')):
+                relative = path.relative_to(base_dir)
+                if 'migrations' in relative.parts or any(part.startswith('test') for part in relative.parts):
+                    continue
+                digest.update(str(relative).encode())
+                digest.update(path.read_bytes())
+        _fingerprint = digest.hexdigest()[:16]
+    return _fingerprint
+
+
+def render_reference():
+    """The API reference generated from the viewsets' docstrings and serializers, as HTML"""
+    from markdown_it import MarkdownIt
+
+    from api.documentation import generate_api_docs
+
+    markdown = '\n'.join(generate_api_docs(app) for app in REFERENCE_APPS)
+    body = MarkdownIt('commonmark').enable('table').render(markdown)
+    return REFERENCE_PAGE.format(title=f'{API_INFO.title} reference', body=body)
+
+
+def _write(path, content):
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+def generate_schema():
+    """
+    The public OpenAPI schema, generated as for an anonymous request (the
+    viewsets' querysets need a user) and without a host, so clients
+    resolve paths against the server they fetched it from
+    """
+    request = Request(APIRequestFactory().get('/api/docs.json'))
+    request.user = AnonymousUser()
+    # A placeholder url keeps the generator from deriving one from the
+    # request's host; the host is dropped below anyway
+    schema = OpenAPISchemaGenerator(API_INFO, url='http://localhost').get_schema(request=request, public=True)
+    for key in ('host', 'schemes'):
+        schema.pop(key, None)
+    return schema
+
+
+def build(root=None):
+    """Generate every artifact into ``root`` (default API_DOCS_ROOT); returns the fingerprint"""
+    root = Path(root) if root else get_artifact_root()
+    fingerprint = source_fingerprint()
+    schema = generate_schema()
+    contents = {
+        'json': OpenAPICodecJson(validators=[]).encode(schema),
+        'yaml': OpenAPICodecYaml(validators=[]).encode(schema),
+        'html': render_reference().encode('utf-8'),
+    }
+
+    root.mkdir(parents=True, exist_ok=True)
+    for kind, content in contents.items():
+        _write(root / ARTIFACTS[kind][0], content)
+    # Written last, so an interrupted build is never taken as up to date
+    manifest = {'fingerprint': fingerprint, 'generated_at': timezone.now().isoformat()}
+    _write(root / MANIFEST, json.dumps(manifest).encode())
+    _verified[root] = fingerprint
+    logger.info(f"Generated API docs artifacts {fingerprint} in {root}")
+    return fingerprint
+
+
+def built_fingerprint(root=None):
+    """Fingerprint of the artifacts in ``root``, or None when there are none"""
+    root = Path(root) if root else get_artifact_root()
+    try:
+        with open(root / MANIFEST) as f:
+            return json.load(f)['fingerprint']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def ensure_built():
+    """Rebuild the artifacts if they are missing or the code changed; returns the fingerprint"""
+    root = get_artifact_root()
+    fingerprint = source_fingerprint()
+    if _verified.get(root) == fingerprint:
+        return fingerprint
+    with _lock:
+        if built_fingerprint(root) != fingerprint:
+            logger.warning(f"API docs artifacts in {root} are missing or stale, regenerating")
+            build(root)
+        _verified[root] = fingerprint
+    return fingerprint
+
+
+def artifact_response(request, kind, content_type=None):
+    """
+    Serve a precomputed artifact, with the fingerprint as ETag so clients
+    revalidate instead of downloading it again
+    """
+    fingerprint = ensure_built()
+    etag = f'"{fingerprint}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        file_name, default_type = ARTIFACTS[kind]
+        response = HttpResponse(
+            (get_artifact_root() / file_name).read_bytes(),
+            content_type=f'{content_type or default_type}; charset=utf-8'
+        )
+    response.headers['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def get_schema_view(**kwargs):
+    """
+    drf_yasg's schema view for API_INFO, with the JSON/YAML renderings
+    served from the precomputed artifacts. The UI pages don't introspect
+    the API and are rendered as usual.
+    """
+    base_view = yasg_get_schema_view(API_INFO, **kwargs)
+
+    class PrecomputedSchemaView(base_view):
+        def get(self, request, version='', format=None):
+            codec_class = getattr(request.accepted_renderer, 'codec_class', None)
+            if codec_class is None:
+                return super().get(request, version, format)
+            kind = 'yaml' if issubclass(codec_class, OpenAPICodecYaml) else 'json'
+            return artifact_response(request, kind, request.accepted_renderer.media_type)
+
+    return PrecomputedSchemaView
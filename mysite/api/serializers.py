@@ -1,25 +1,105 @@
 # api/serializers.py
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth.models import User, Group
+from django.core.exceptions import ValidationError as DjangoValidationError
 from patient.models import Patient, PrescriptionRequest
 from provider.models import Provider
 from common.models import Appointment, Prescription, Message
 
-class UserSerializer(serializers.ModelSerializer):
+def _split_param(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for ``?fields=`` and ``?expand=`` on read requests.
+    
+    ``fields=a,b`` limits each object to the named top-level fields ('id'
+    is always kept; unknown names are ignored). Fields in
+    ``Meta.expandable_fields`` are heavy and left out of collections
+    (list and list-style actions) unless named in ``expand=`` or
+    ``fields=``; single objects always include them.
+    
+    QuerysetPlanningMixin reads the same selection through
+    ``get_selected_fields()`` and defers unselected columns with
+    ``.only()``. Method fields that read other columns declare them in
+    ``Meta.source_fields`` so those stay loaded.
+    """
+    
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs['context'] = dict(kwargs.get('context', {}), is_collection=True)
+        return super().many_init(*args, **kwargs)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+        selected = self.get_selected_fields(request, self.context.get('is_collection', False))
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+    
+    @classmethod
+    def get_selected_fields(cls, request, collection):
+        """Field names to serialize for this request, or None for all of them"""
+        if request.method not in SAFE_METHODS:
+            return None
+        
+        all_fields = list(cls.Meta.fields)
+        expandable = set(getattr(cls.Meta, 'expandable_fields', []))
+        params = getattr(request, 'query_params', request.GET)
+        requested = _split_param(params.get('fields'))
+        expanded = _split_param(params.get('expand'))
+        
+        selected = all_fields
+        if requested:
+            selected = [name for name in selected if name in requested or name == 'id']
+        if collection:
+            selected = [
+                name for name in selected
+                if name not in expandable or name in expanded or name in requested
+            ]
+        return tuple(selected) if len(selected) < len(all_fields) else None
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField resolving ids from a preloaded {pk: object} map,
+    so validating a batch doesn't run one query per item (see
+    api.mixins.BulkWriteMixin)
+    """
+    
+    def __init__(self, objects, **kwargs):
+        self.objects = objects
+        super().__init__(**kwargs)
+    
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.queryset.model._meta.pk.to_python(data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in self.objects:
+            self.fail('does_not_exist', pk_value=data)
+        return self.objects[pk]
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Base User serializer for both patients and providers"""
     class Meta:
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email', 'is_active']
         read_only_fields = ['id', 'username', 'is_active']
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for user groups"""
     class Meta:
         model = Group
         fields = ['id', 'name']
         read_only_fields = ['id', 'name']
 
-class BasePatientSerializer(serializers.ModelSerializer):
+class BasePatientSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Base serializer for patient data"""
     user = UserSerializer(read_only=True)
     full_name = serializers.SerializerMethodField()
@@ -32,11 +112,13 @@ class BasePatientSerializer(serializers.ModelSerializer):
             'emergency_contact_phone', 'primary_provider', 'full_name'
         ]
         read_only_fields = ['id']
+        # Relations read by nested/method fields (see api.mixins.get_queryset_plan)
+        select_related = ['user']
     
     def get_full_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}" if obj.user else ""
 
-class BaseProviderSerializer(serializers.ModelSerializer):
+class BaseProviderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Base serializer for provider data"""
     user = UserSerializer(read_only=True)
     full_name = serializers.SerializerMethodField()
@@ -48,11 +130,12 @@ class BaseProviderSerializer(serializers.ModelSerializer):
             'phone', 'is_active', 'full_name'
         ]
         read_only_fields = ['id', 'is_active']
+        select_related = ['user']
     
     def get_full_name(self, obj):
         return f"Dr. {obj.user.first_name} {obj.user.last_name}" if obj.user else ""
 
-class BaseAppointmentSerializer(serializers.ModelSerializer):
+class BaseAppointmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Base serializer for appointment data"""
     patient_name = serializers.SerializerMethodField()
     doctor_name = serializers.SerializerMethodField()
@@ -64,6 +147,8 @@ class BaseAppointmentSerializer(serializers.ModelSerializer):
             'reason', 'notes', 'patient_name', 'doctor_name'
         ]
         read_only_fields = ['id']
+        select_related = ['patient', 'doctor__user']
+        related_only = ['patient__first_name', 'patient__last_name', 'doctor__user__last_name']
     
     def get_patient_name(self, obj):
         if obj.patient:
@@ -75,7 +160,7 @@ class BaseAppointmentSerializer(serializers.ModelSerializer):
             return f"Dr. {obj.doctor.user.last_name}"
         return ""
 
-class BasePrescriptionSerializer(serializers.ModelSerializer):
+class BasePrescriptionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Base serializer for prescription data"""
     patient_name = serializers.SerializerMethodField()
     doctor_name = serializers.SerializerMethodField()
@@ -88,6 +173,8 @@ class BasePrescriptionSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'patient_name', 'doctor_name'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        select_related = ['patient', 'doctor__user']
+        related_only = ['patient__first_name', 'patient__last_name', 'doctor__user__last_name']
     
     def get_patient_name(self, obj):
         if obj.patient:
@@ -99,7 +186,7 @@ class BasePrescriptionSerializer(serializers.ModelSerializer):
             return f"Dr. {obj.doctor.user.last_name}"
         return ""
 
-class BasePrescriptionRequestSerializer(serializers.ModelSerializer):
+class BasePrescriptionRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Base serializer for prescription request data"""
     patient_name = serializers.SerializerMethodField()
     
@@ -113,13 +200,15 @@ class BasePrescriptionRequestSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'patient_name'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        select_related = ['patient__user']
+        related_only = ['patient__user__first_name', 'patient__user__last_name']
     
     def get_patient_name(self, obj):
         if obj.patient and hasattr(obj.patient, 'full_name'):
             return obj.patient.full_name
         return ""
 
-class BaseMessageSerializer(serializers.ModelSerializer):
+class BaseMessageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Base serializer for message data"""
     sender_name = serializers.SerializerMethodField()
     recipient_name = serializers.SerializerMethodField()
@@ -131,6 +220,9 @@ class BaseMessageSerializer(serializers.ModelSerializer):
             'status', 'created_at', 'sender_name', 'recipient_name'
         ]
         read_only_fields = ['id', 'created_at']
+        select_related = ['sender', 'recipient']
+        related_only = ['sender__first_name', 'sender__last_name',
+                        'recipient__first_name', 'recipient__last_name']
     
     def get_sender_name(self, obj):
         if obj.sender:
@@ -0,0 +1,95 @@
+# api/signals.py
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from api import sync
+from api.authentication import forget_token, forget_user
+from api.response_cache import bump_versions_on_commit
+from common.models import Appointment, Message
+from patient.models import Patient
+from provider.models import Provider
+
+# Cached API responses (api.response_cache) are invalidated by bumping the
+# data version of every user who can see the changed row
+
+
+def _provider_user_ids(*provider_ids):
+    provider_ids = [provider_id for provider_id in provider_ids if provider_id]
+    if not provider_ids:
+        return []
+    return list(Provider.objects.filter(id__in=provider_ids).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+def invalidate_appointment_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_versions_on_commit(
+        'appointments', [instance.patient_id] + _provider_user_ids(instance.doctor_id)
+    )
+
+
+@receiver(post_save, sender=Message)
+@receiver(post_delete, sender=Message)
+def invalidate_message_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_versions_on_commit('messages', [instance.sender_id, instance.recipient_id])
+
+
+@receiver(pre_save, sender=Patient)
+def remember_previous_provider(sender, instance, raw=False, **kwargs):
+    """Keep the stored primary provider so a reassignment invalidates both lists"""
+    if raw:
+        return
+    instance._previous_primary_provider_id = None
+    if instance.pk is not None:
+        instance._previous_primary_provider_id = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('primary_provider_id', flat=True).first()
+
+
+@receiver(post_save, sender=Patient)
+@receiver(post_delete, sender=Patient)
+def invalidate_patient_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_versions_on_commit('patients', _provider_user_ids(
+        instance.primary_provider_id, getattr(instance, '_previous_primary_provider_id', None)
+    ))
+
+
+# Delta-sync change log (api.sync): every save or delete of a synced model
+# is logged for the users who can see the object
+
+def log_sync_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync.record_change(sync.ENTITY_BY_MODEL[sender], instance)
+
+
+def log_sync_delete(sender, instance, **kwargs):
+    sync.record_delete(sync.ENTITY_BY_MODEL[sender], instance)
+
+
+for model, entity in sync.ENTITY_BY_MODEL.items():
+    post_save.connect(log_sync_change, sender=model, dispatch_uid=f'sync_change_{entity}')
+    post_delete.connect(log_sync_delete, sender=model, dispatch_uid=f'sync_delete_{entity}')
+
+
+# Cached token lookups (api.authentication.CachedTokenAuthentication)
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def forget_cached_token(sender, instance, **kwargs):
+    forget_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user_token(sender, instance, **kwargs):
+    # Deactivation must reach token-authenticated requests immediately
+    forget_user(instance.pk)
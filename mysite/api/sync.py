@@ -0,0 +1,183 @@
+# api/sync.py
+import base64
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from api.models import SyncChange
+from common.models import Appointment, Message, Prescription
+from patient.models import Patient, PrescriptionRequest
+from provider.models import GeneratedDocument, Provider
+
+logger = logging.getLogger(__name__)
+
+
+def _provider_user_ids(provider_id):
+    if not provider_id:
+        return []
+    return list(Provider.objects.filter(id=provider_id).values_list('user_id', flat=True))
+
+
+def _patient_user_ids(patient_id):
+    if not patient_id:
+        return []
+    return list(Patient.objects.filter(id=patient_id).values_list('user_id', flat=True))
+
+
+# Synced object types: the users who can see an object, and the matching
+# queryset filter used when the changed objects are loaded for a user
+ENTITIES = {
+    'appointment': {
+        'model': Appointment,
+        'users': lambda obj: [obj.patient_id] + _provider_user_ids(obj.doctor_id),
+        'visible_to': lambda user: Q(patient=user) | Q(doctor__user=user),
+    },
+    'prescription': {
+        'model': Prescription,
+        'users': lambda obj: [obj.patient_id] + _provider_user_ids(obj.doctor_id),
+        'visible_to': lambda user: Q(patient=user) | Q(doctor__user=user),
+    },
+    'prescription_request': {
+        'model': PrescriptionRequest,
+        'users': lambda obj: _patient_user_ids(obj.patient_id),
+        'visible_to': lambda user: Q(patient__user=user),
+    },
+    'message': {
+        'model': Message,
+        'users': lambda obj: [obj.sender_id, obj.recipient_id],
+        'visible_to': lambda user: Q(sender=user) | Q(recipient=user),
+    },
+    'document': {
+        'model': GeneratedDocument,
+        'users': lambda obj: [obj.patient_id] + _provider_user_ids(obj.provider_id),
+        'visible_to': lambda user: Q(patient=user) | Q(provider__user=user),
+    },
+}
+
+ENTITY_BY_MODEL = {config['model']: entity for entity, config in ENTITIES.items()}
+
+
+def _latest_actions(entity, object_id):
+    """Last logged action per user for an object"""
+    latest = {}
+    changes = SyncChange.objects.filter(entity=entity, object_id=object_id).order_by('id')
+    for user_id, action in changes.values_list('user_id', 'action'):
+        latest[user_id] = action
+    return latest
+
+
+def record_change(entity, instance):
+    """
+    Log a saved object for every user who can now see it, and a tombstone
+    for users who could see it before but no longer can
+    """
+    users = {user_id for user_id in ENTITIES[entity]['users'](instance) if user_id}
+    revoked = [
+        user_id for user_id, action in _latest_actions(entity, instance.pk).items()
+        if action == SyncChange.UPSERT and user_id not in users
+    ]
+    changes = [
+        SyncChange(user_id=user_id, entity=entity, object_id=instance.pk, action=SyncChange.UPSERT)
+        for user_id in users
+    ] + [
+        SyncChange(user_id=user_id, entity=entity, object_id=instance.pk, action=SyncChange.DELETE)
+        for user_id in revoked
+    ]
+    SyncChange.objects.bulk_create(changes)
+
+
+def record_delete(entity, instance):
+    """
+    Log a tombstone for every user who has seen a deleted object.
+
+    Written after commit: the delete may be cascading from one of those
+    users, whose log rows are removed with them.
+    """
+    object_id = instance.pk
+    user_ids = [
+        user_id for user_id, action in _latest_actions(entity, object_id).items()
+        if action == SyncChange.UPSERT
+    ]
+    if not user_ids:
+        return
+
+    def write():
+        SyncChange.objects.bulk_create([
+            SyncChange(user_id=user_id, entity=entity, object_id=object_id, action=SyncChange.DELETE)
+            for user_id in User.objects.filter(id__in=user_ids).values_list('id', flat=True)
+        ])
+
+    transaction.on_commit(write)
+
+
+def encode_cursor(sequence):
+    return base64.urlsafe_b64encode(f'seq:{sequence}'.encode('ascii')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Sequence a client cursor points at; raises ValueError for a malformed cursor"""
+    if not cursor:
+        return 0
+    try:
+        prefix, _, sequence = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('ascii').partition(':')
+    except (UnicodeError, ValueError) as e:
+        raise ValueError(f"Malformed cursor: {str(e)}")
+    if prefix != 'seq' or not sequence.isdigit():
+        raise ValueError("Malformed cursor")
+    return int(sequence)
+
+
+def get_changes(user, after=0, limit=None):
+    """
+    A user's changes logged after sequence ``after``.
+
+    Returns (changes, last_sequence, has_more). Each object appears once,
+    with its latest action in the page, as (entity, object_id, action,
+    sequence). Changes younger than SYNC_SETTLE_SECONDS are held back: a
+    sequence is allocated before its transaction commits, so a newer row
+    could otherwise be synced ahead of an older one still in flight, and
+    the client's cursor would skip it.
+    """
+    limit = limit or getattr(settings, 'SYNC_PAGE_SIZE', 200)
+    queryset = SyncChange.objects.filter(user=user, id__gt=after)
+    settle = getattr(settings, 'SYNC_SETTLE_SECONDS', 2)
+    if settle:
+        queryset = queryset.filter(created_at__lte=timezone.now() - timedelta(seconds=settle))
+    rows = list(queryset.order_by('id').values_list('id', 'entity', 'object_id', 'action')[:limit + 1])
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    latest = {}
+    for sequence, entity, object_id, action in rows:
+        latest.pop((entity, object_id), None)
+        latest[(entity, object_id)] = (entity, object_id, action, sequence)
+    last_sequence = rows[-1][0] if rows else after
+    return list(latest.values()), last_sequence, has_more
+
+
+def load_objects(user, entity, object_ids, select_related=()):
+    """Current state of changed objects the user can still see, by id"""
+    config = ENTITIES[entity]
+    queryset = config['model'].objects.filter(config['visible_to'](user), pk__in=object_ids)
+    return queryset.select_related(*select_related).in_bulk()
+
+
+def compact():
+    """
+    Delete log rows superseded by a later row for the same user and object.
+
+    Clients only act on an object's latest change, so any cursor stays
+    valid. Returns the number of rows removed.
+    """
+    superseded = SyncChange.objects.filter(
+        user=OuterRef('user'), entity=OuterRef('entity'),
+        object_id=OuterRef('object_id'), id__gt=OuterRef('id')
+    )
+    deleted, _ = SyncChange.objects.filter(Exists(superseded)).delete()
+    logger.info(f"Compacted sync log: {deleted} superseded changes removed")
+    return deleted
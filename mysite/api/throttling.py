@@ -0,0 +1,116 @@
+# api/throttling.py
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+KEY_PREFIX = 'api-ratelimit'
+
+DEFAULT_LIMITS = {
+    'read': {'capacity': 300, 'rate': 10},
+    'search': {'capacity': 30, 'rate': 1},
+    'write': {'capacity': 60, 'rate': 2},
+}
+
+
+def get_limits():
+    return getattr(settings, 'API_RATE_LIMITS', DEFAULT_LIMITS)
+
+
+def take(key, capacity, rate, now_us=None):
+    """
+    Take one request from a token bucket holding ``capacity`` requests and
+    refilling at ``rate`` per second. Returns (allowed, seconds to wait).
+
+    The bucket is stored as its theoretical arrival time (GCRA): the
+    moment it would be full again, in microseconds. Each request adds
+    one interval with an atomic cache.incr(); a request is allowed while
+    that time is at most ``capacity`` intervals ahead of now, and a
+    denied request gives its interval back. The only non-atomic step is
+    restarting an idle bucket from now, which can at worst let a request
+    racing it through early.
+
+    incr() keeps the key's expiry, so the key must be kept alive for as
+    long as the theoretical arrival time is ahead: an expired key would
+    refill the bucket early. The timeout is refreshed each time that time
+    passes a multiple of the burst; as it is never more than a burst
+    ahead of now, the key outlives it.
+    """
+    now = now_us if now_us is not None else time.time_ns() // 1000
+    interval = int(1_000_000 / rate)
+    burst = capacity * interval
+    timeout = math.ceil((2 * burst + interval) / 1_000_000) + 1
+
+    try:
+        tat = cache.incr(key, interval)
+    except ValueError:
+        if cache.add(key, now + interval, timeout):
+            return True, 0.0
+        tat = cache.incr(key, interval)
+
+    if tat - interval < now:
+        cache.set(key, now + interval, timeout)
+        return True, 0.0
+    if tat // burst != (tat - interval) // burst:
+        cache.touch(key, timeout)
+    if tat - now <= burst:
+        return True, 0.0
+
+    try:
+        cache.decr(key, interval)
+    except ValueError:
+        pass
+    return False, (tat - burst - now) / 1_000_000
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket rate limiting per API client and scope.
+
+    Clients are told apart by API token, else by user, else by IP
+    address. Each view action falls into a scope of API_RATE_LIMITS:
+    ``rate_limit_scopes`` on the view maps action names to scopes,
+    ``rate_limit_scope`` sets one for the whole view, and otherwise
+    writes are 'write', reads with ?search= are 'search' and other reads
+    are 'read'. Denied requests get a 429 with Retry-After.
+    """
+
+    def get_scope(self, request, view):
+        scopes = getattr(view, 'rate_limit_scopes', {})
+        action = getattr(view, 'action', None)
+        if action in scopes:
+            return scopes[action]
+        if getattr(view, 'rate_limit_scope', None):
+            return view.rate_limit_scope
+        if request.method not in SAFE_METHODS:
+            return 'write'
+        if request.query_params.get('search'):
+            return 'search'
+        return 'read'
+
+    def get_client(self, request):
+        token_key = getattr(request.auth, 'key', None)
+        if token_key:
+            return f'token:{hashlib.sha256(token_key.encode()).hexdigest()[:32]}'
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        if not getattr(settings, 'API_RATE_LIMIT_ENABLED', True):
+            return True
+        scope = self.get_scope(request, view)
+        limit = get_limits().get(scope)
+        if not limit:
+            return True
+
+        key = f'{KEY_PREFIX}:{scope}:{self.get_client(request)}'
+        allowed, self.wait_seconds = take(key, limit['capacity'], limit['rate'])
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
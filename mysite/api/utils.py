@@ -20,3 +20,13 @@ def create_filter_queryset(base_queryset, request, field_mappings):
             queryset = queryset.filter(**filter_kwargs)
             
     return queryset
+
+
+def is_process_local_cache(cache):
+    """
+    Whether a cache backend keeps its data inside the worker process, so
+    other workers never see its writes or deletions
+    """
+    from django.core.cache.backends.dummy import DummyCache
+    from django.core.cache.backends.locmem import LocMemCache
+    return isinstance(cache, (LocMemCache, DummyCache))
@@ -1,7 +1,7 @@
 # api/v1/core/urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from api.v1.core.views import UserViewSet, GroupViewSet
+from api.v1.core.views import UserViewSet, GroupViewSet, ResponseCacheStatsView, CompressionStatsView, LegacyApiStatsView, SyncView
 
 # Create a router for core v1 endpoints
 router = DefaultRouter()
@@ -10,4 +10,8 @@ router.register(r'groups', GroupViewSet, basename='group')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('cache-stats/', ResponseCacheStatsView.as_view(), name='response-cache-stats'),
+    path('compression-stats/', CompressionStatsView.as_view(), name='compression-stats'),
+    path('legacy-api-stats/', LegacyApiStatsView.as_view(), name='legacy-api-stats'),
+    path('sync/', SyncView.as_view(), name='sync'),
 ]
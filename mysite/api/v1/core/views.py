@@ -1,7 +1,25 @@
 # Update mysite/api/v1/core/views.py
 from api.views import BaseUserViewSet as OriginalUserViewSet
 from api.views import BaseGroupViewSet as OriginalGroupViewSet
+from rest_framework import permissions
+from rest_framework.authtoken.models import Token
+from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
+
+from api import legacy, response_cache, sync
+from api.authentication import is_token_expired, rotate_token, token_expires_at
+from api.models import SyncChange
+from api.permissions import IsAdminUser
+from api.serializers import (
+    BaseAppointmentSerializer, BasePrescriptionSerializer,
+    BasePrescriptionRequestSerializer, BaseMessageSerializer
+)
+from api.v1.provider.serializers import GeneratedDocumentSerializer
 from api.versioning import VersionedViewMixin
+from common.utils import compression
 
 class UserViewSet(VersionedViewMixin, OriginalUserViewSet):
     """
@@ -16,3 +34,129 @@ class GroupViewSet(VersionedViewMixin, OriginalGroupViewSet):
     Extends the original GroupViewSet for proper versioning.
     """
     version = 'v1'
+
+class ObtainExpiringAuthToken(ObtainAuthToken):
+    """
+    API v1 endpoint exchanging a username and password for a token.
+    An expired token is replaced rather than handed back.
+    """
+    
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data['user']
+        token, created = Token.objects.get_or_create(user=user)
+        if not created and is_token_expired(token.created):
+            token = rotate_token(user)
+        return Response({'token': token.key, 'expires_at': token_expires_at(token.created)})
+
+class RotateAuthTokenView(APIView):
+    """
+    API v1 endpoint replacing the caller's token with a new one.
+    The old token stops working immediately.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request, *args, **kwargs):
+        token = rotate_token(request.user)
+        return Response({'token': token.key, 'expires_at': token_expires_at(token.created)})
+
+class ResponseCacheStatsView(APIView):
+    """
+    API v1 endpoint reporting per-user response cache hits and misses.
+    Only accessible by admin users.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request, *args, **kwargs):
+        return Response(response_cache.get_stats())
+
+class CompressionStatsView(APIView):
+    """
+    API v1 endpoint reporting response compression bytes saved and CPU
+    cost per response class. Only accessible by admin users.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request, *args, **kwargs):
+        return Response(compression.get_stats())
+
+class LegacyApiStatsView(APIView):
+    """
+    API v1 endpoint reporting how many requests still arrive on each
+    legacy unversioned API path. Only accessible by admin users.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    
+    def get(self, request, *args, **kwargs):
+        return Response(legacy.get_stats())
+
+class SyncView(APIView):
+    """
+    API v1 delta sync for offline-capable clients.
+    
+    GET ?cursor=<opaque>&limit=<n> returns the appointments, prescriptions,
+    prescription requests, messages and documents the user can see that
+    changed since the cursor (everything when it is omitted):
+    
+        {"changes": [{"type": "appointment", "id": 4, "op": "upsert", "data": {...}},
+                     {"type": "message", "id": 9, "op": "delete"}],
+         "cursor": "<opaque>", "has_more": false}
+    
+    Pass the returned cursor on the next request; repeat while has_more.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    serializers = {
+        'appointment': BaseAppointmentSerializer,
+        'prescription': BasePrescriptionSerializer,
+        'prescription_request': BasePrescriptionRequestSerializer,
+        'message': BaseMessageSerializer,
+        'document': GeneratedDocumentSerializer,
+    }
+    
+    def get_limit(self, request):
+        default = getattr(settings, 'SYNC_PAGE_SIZE', 200)
+        maximum = getattr(settings, 'SYNC_MAX_PAGE_SIZE', 1000)
+        try:
+            limit = int(request.query_params.get('limit', default))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        return max(1, min(limit, maximum))
+    
+    def get(self, request, *args, **kwargs):
+        try:
+            after = sync.decode_cursor(request.query_params.get('cursor'))
+        except ValueError:
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        
+        changes, last_sequence, has_more = sync.get_changes(request.user, after, self.get_limit(request))
+        
+        # Load the current state of upserted objects, one query per type
+        upserts = {}
+        for entity, object_id, action, _ in changes:
+            if action == SyncChange.UPSERT:
+                upserts.setdefault(entity, []).append(object_id)
+        objects = {
+            entity: sync.load_objects(
+                request.user, entity, object_ids,
+                getattr(self.serializers[entity].Meta, 'select_related', [])
+            )
+            for entity, object_ids in upserts.items()
+        }
+        
+        results = []
+        for entity, object_id, action, _ in changes:
+            instance = objects.get(entity, {}).get(object_id)
+            if action == SyncChange.UPSERT and instance is not None:
+                data = self.serializers[entity](instance).data
+                results.append({'type': entity, 'id': object_id, 'op': 'upsert', 'data': data})
+            else:
+                # Deleted, or no longer visible; a later change may follow
+                results.append({'type': entity, 'id': object_id, 'op': 'delete'})
+        
+        return Response({
+            'changes': results,
+            'cursor': sync.encode_cursor(last_sequence),
+            'has_more': has_more,
+        })
@@ -16,6 +16,7 @@ from api.serializers import (
 class UserSerializer(BaseUserSerializer):
     """V1 User serializer extending the base user serializer"""
     class Meta(BaseUserSerializer.Meta):
+        ref_name = 'PatientUser'  # distinct schema name from the other v1 user serializer
         # We can keep the same fields or customize if needed
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email']
@@ -58,6 +59,7 @@ class AppointmentSerializer(BaseAppointmentSerializer):
     """V1 Appointment serializer extending the base appointment serializer"""
     
     class Meta(BaseAppointmentSerializer.Meta):
+        ref_name = 'PatientAppointment'  # distinct schema name from the other v1 appointment serializer
         model = Appointment
         fields = BaseAppointmentSerializer.Meta.fields
         read_only_fields = ['id']
@@ -73,6 +75,7 @@ class PrescriptionSerializer(BasePrescriptionSerializer):
     """V1 Prescription serializer extending the base prescription serializer"""
     
     class Meta(BasePrescriptionSerializer.Meta):
+        ref_name = 'PatientPrescription'  # distinct schema name from the other v1 prescription serializer
         model = Prescription
         # Just slightly different field list from base
         fields = ['id', 'medication_name', 'dosage', 'instructions', 'patient', 'doctor',
@@ -90,6 +93,7 @@ class MessageSerializer(BaseMessageSerializer):
     """V1 Message serializer extending the base message serializer"""
     
     class Meta(BaseMessageSerializer.Meta):
+        ref_name = 'PatientMessage'  # distinct schema name from the other v1 message serializer
         model = Message
         fields = BaseMessageSerializer.Meta.fields
         read_only_fields = ['id', 'created_at']
@@ -17,10 +17,12 @@ from .filters import (
     MessageFilter, PrescriptionRequestFilter
 )
 from api.versioning import VersionedViewMixin
-from api.mixins import PaginationMixin, MessageActionsMixin
+from api.mixins import (
+    ConditionalGetMixin, PaginationMixin, MessageActionsMixin, QuerysetPlanningMixin, ResponseCacheMixin
+)
 from django.db.models import Q 
 
-class PatientViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
+class PatientViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows patients to view their own profile.
     Patients can only see their own profile.
@@ -29,7 +31,7 @@ class PatientViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsPatientOwner]
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         if hasattr(self.request.user, 'patient_profile'):
             return Patient.objects.filter(id=self.request.user.patient_profile.id)
         return Patient.objects.none()
@@ -42,7 +44,7 @@ class PatientViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
             return Response(serializer.data)
         return Response({"detail": "Patient profile not found."}, status=404)
 
-class AppointmentViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
+class AppointmentViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for patient appointments.
     Patients can only see their own appointments.
@@ -56,7 +58,7 @@ class AppointmentViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
     ordering = ['time']
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         if hasattr(self.request.user, 'patient_profile'):
             return Appointment.objects.filter(patient=self.request.user)
         return Appointment.objects.none()
@@ -85,7 +87,7 @@ class AppointmentViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
-class PrescriptionViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
+class PrescriptionViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for patient prescriptions.
     Patients can only see their own prescriptions.
@@ -99,7 +101,7 @@ class PrescriptionViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
     ordering = ['-created_at']
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         if hasattr(self.request.user, 'patient_profile'):
             return Prescription.objects.filter(patient=self.request.user)
         return Prescription.objects.none()
@@ -111,7 +113,7 @@ class PrescriptionViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
-class PrescriptionRequestViewSet(VersionedViewMixin, viewsets.ModelViewSet):
+class PrescriptionRequestViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for prescription requests.
     Patients can only see, create and modify their own prescription requests.
@@ -125,7 +127,7 @@ class PrescriptionRequestViewSet(VersionedViewMixin, viewsets.ModelViewSet):
     ordering = ['-created_at']
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         if hasattr(self.request.user, 'patient_profile'):
             return PrescriptionRequest.objects.filter(patient=self.request.user.patient_profile)
         return PrescriptionRequest.objects.none()
@@ -195,13 +197,14 @@ class PrescriptionRequestViewSet(VersionedViewMixin, viewsets.ModelViewSet):
 #    def perform_create(self, serializer):
 #        serializer.save(sender=self.request.user, sender_type='patient')
 
-class MessageViewSet(VersionedViewMixin, PaginationMixin, MessageActionsMixin, viewsets.ModelViewSet):
+class MessageViewSet(ConditionalGetMixin, ResponseCacheMixin, QuerysetPlanningMixin, VersionedViewMixin, PaginationMixin,
+                     MessageActionsMixin, viewsets.ModelViewSet):
     """API v1 endpoint for patient messages"""
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated, IsPatientOrReadOnly]
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         # Base queryset logic specific to this viewset
         if not self.request.user.is_authenticated:
             return Message.objects.none()
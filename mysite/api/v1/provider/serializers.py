@@ -4,6 +4,7 @@ from provider.models import Provider, RecordingSession, ClinicalNote, DocumentTe
 from common.models import Appointment, Prescription, Message
 from django.contrib.auth.models import User, Group
 from api.serializers import (
+    SparseFieldsMixin,
     UserSerializer as BaseUserSerializer,
     BaseProviderSerializer, 
     BaseAppointmentSerializer, 
@@ -14,6 +15,7 @@ from api.serializers import (
 # Extend the base UserSerializer if needed, otherwise use it directly
 class UserSerializer(BaseUserSerializer):
     class Meta(BaseUserSerializer.Meta):
+        ref_name = 'ProviderUser'  # distinct schema name from the other v1 user serializer
         # We can customize if needed
         pass
 
@@ -35,6 +37,7 @@ class AppointmentSerializer(BaseAppointmentSerializer):
     """V1 Appointment serializer extending the base appointment serializer"""
     
     class Meta(BaseAppointmentSerializer.Meta):
+        ref_name = 'ProviderAppointment'  # distinct schema name from the other v1 appointment serializer
         model = Appointment
         fields = BaseAppointmentSerializer.Meta.fields
         read_only_fields = ['id']
@@ -47,11 +50,15 @@ class PrescriptionSerializer(BasePrescriptionSerializer):
     """V1 Prescription serializer extending the base prescription serializer"""
     
     class Meta(BasePrescriptionSerializer.Meta):
+        ref_name = 'ProviderPrescription'  # distinct schema name from the other v1 prescription serializer
         model = Prescription
         # Customize fields if needed - here we're removing doctor_name which was in the base
         fields = ['id', 'medication_name', 'dosage', 'patient', 'doctor', 'status', 'refills', 
                  'refills_remaining', 'created_at', 'updated_at', 'patient_name']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        # doctor_name is not exposed, so only the patient is joined
+        select_related = ['patient']
+        related_only = ['patient__first_name', 'patient__last_name']
     
     # Keep original implementation if it differs from base
     def get_patient_name(self, obj):
@@ -62,6 +69,7 @@ class MessageSerializer(BaseMessageSerializer):
     """V1 Message serializer extending the base message serializer"""
     
     class Meta(BaseMessageSerializer.Meta):
+        ref_name = 'ProviderMessage'  # distinct schema name from the other v1 message serializer
         model = Message
         fields = BaseMessageSerializer.Meta.fields
         # Customize read_only_fields to include sender
@@ -70,7 +78,7 @@ class MessageSerializer(BaseMessageSerializer):
     # Keep the same implementations for the get methods unless they differ from base
 
 # The following serializers don't have base classes, so they remain unchanged
-class RecordingSessionSerializer(serializers.ModelSerializer):
+class RecordingSessionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
     duration = serializers.SerializerMethodField()
     
@@ -79,6 +87,10 @@ class RecordingSessionSerializer(serializers.ModelSerializer):
         fields = ['id', 'appointment', 'provider', 'jitsi_recording_id', 'start_time', 
                  'end_time', 'storage_path', 'transcription_status', 'transcription_text',
                  'patient_name', 'duration']
+        expandable_fields = ['transcription_text']
+        source_fields = {'duration': ['start_time', 'end_time']}
+        select_related = ['appointment__patient']
+        related_only = ['appointment__patient__first_name', 'appointment__patient__last_name']
     
     def get_patient_name(self, obj):
         if obj.appointment and obj.appointment.patient:
@@ -90,7 +102,34 @@ class RecordingSessionSerializer(serializers.ModelSerializer):
             return (obj.end_time - obj.start_time).total_seconds() // 60
         return None
 
-class ClinicalNoteSerializer(serializers.ModelSerializer):
+class RecordingSessionListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    List projection of RecordingSession without the transcript.
+    Expects AIScribeService.get_recording_list_queryset() annotations.
+    """
+    patient_name = serializers.SerializerMethodField()
+    duration = serializers.SerializerMethodField()
+    transcript_length = serializers.IntegerField(read_only=True, default=0)
+    
+    class Meta:
+        model = RecordingSession
+        fields = ['id', 'appointment', 'provider', 'jitsi_recording_id', 'start_time',
+                 'end_time', 'storage_path', 'transcription_status',
+                 'patient_name', 'duration', 'transcript_length']
+        source_fields = {'duration': ['start_time', 'end_time']}
+    
+    def get_patient_name(self, obj):
+        if obj.appointment and obj.appointment.patient:
+            return f"{obj.appointment.patient.first_name} {obj.appointment.patient.last_name}"
+        return "Unknown"
+    
+    def get_duration(self, obj):
+        duration = getattr(obj, 'duration_value', None)
+        if duration is not None:
+            return duration.total_seconds() // 60
+        return None
+
+class ClinicalNoteSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
     
     class Meta:
@@ -98,20 +137,38 @@ class ClinicalNoteSerializer(serializers.ModelSerializer):
         fields = ['id', 'appointment', 'provider', 'transcription', 'ai_generated_text',
                  'provider_edited_text', 'status', 'created_at', 'updated_at',
                  'created_by', 'last_edited_by', 'patient_name']
+        expandable_fields = ['ai_generated_text', 'provider_edited_text']
+        select_related = ['appointment__patient']
+        related_only = ['appointment__patient__first_name', 'appointment__patient__last_name']
+    
+    def get_patient_name(self, obj):
+        if obj.appointment and obj.appointment.patient:
+            return f"{obj.appointment.patient.first_name} {obj.appointment.patient.last_name}"
+        return "Unknown"
+
+class ClinicalNoteListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """List projection of ClinicalNote without the note bodies"""
+    patient_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ClinicalNote
+        fields = ['id', 'appointment', 'provider', 'transcription', 'status',
+                 'created_at', 'updated_at', 'created_by', 'last_edited_by',
+                 'patient_name']
     
     def get_patient_name(self, obj):
         if obj.appointment and obj.appointment.patient:
             return f"{obj.appointment.patient.first_name} {obj.appointment.patient.last_name}"
         return "Unknown"
 
-class DocumentTemplateSerializer(serializers.ModelSerializer):
+class DocumentTemplateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DocumentTemplate
         fields = ['id', 'name', 'description', 'template_type', 'template_content',
                  'requires_patient_data', 'requires_provider_data', 'created_at',
                  'updated_at', 'created_by', 'is_active']
 
-class GeneratedDocumentSerializer(serializers.ModelSerializer):
+class GeneratedDocumentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     template_name = serializers.SerializerMethodField()
     patient_name = serializers.SerializerMethodField()
     html_content = serializers.SerializerMethodField()
@@ -122,6 +179,10 @@ class GeneratedDocumentSerializer(serializers.ModelSerializer):
                  'rendered_content', 'pdf_storage_path', 'status', 'created_at',
                  'updated_at', 'created_by', 'approved_by', 'template_name',
                  'patient_name', 'html_content']
+        expandable_fields = ['document_data', 'rendered_content', 'html_content']
+        source_fields = {'html_content': ['rendered_content']}
+        select_related = ['template', 'patient']
+        related_only = ['template__name', 'patient__first_name', 'patient__last_name']
     
     def get_template_name(self, obj):
         return obj.template.name if obj.template else "Unknown"
@@ -136,7 +197,7 @@ class GeneratedDocumentSerializer(serializers.ModelSerializer):
         # For now, just return a placeholder
         return obj.rendered_content or "<p>Preview not available</p>"
 
-class AIModelConfigSerializer(serializers.ModelSerializer):
+class AIModelConfigSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for AI model configuration"""
     model_type_display = serializers.SerializerMethodField()
     
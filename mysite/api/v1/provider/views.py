@@ -1,6 +1,7 @@
 # mysite/api/v1/provider/views.py
 from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
@@ -16,12 +17,15 @@ from .serializers import (
 #from patient.api.serializers import PatientSerializer
 from api.v1.patient.serializers import PatientSerializer
 from .permissions import IsProviderOrReadOnly
-from api.permissions import IsProvider, IsProviderOwner
+from api.permissions import IsProvider, IsProviderOwner, IsMessageRecipient
 from api.versioning import VersionedViewMixin
-from api.mixins import PaginationMixin, MessageActionsMixin, FilterMixin, SearchMixin
+from api.mixins import (
+    ConditionalGetMixin, PaginationMixin, MessageActionsMixin, FilterMixin, SearchMixin,
+    QuerysetPlanningMixin, ResponseCacheMixin, BulkWriteMixin
+)
 from django.db.models import Q
 
-class ProviderViewSet(VersionedViewMixin, viewsets.ModelViewSet):
+class ProviderViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ModelViewSet):
     """
     API v1 endpoint for provider profiles
     """
@@ -29,27 +33,30 @@ class ProviderViewSet(VersionedViewMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsProviderOrReadOnly]
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         # A provider can only see their own profile
         if hasattr(self.request.user, 'provider_profile'):
             return Provider.objects.filter(id=self.request.user.provider_profile.id)
         return Provider.objects.none()
 
-class ProviderPatientsViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
+class ProviderPatientsViewSet(ConditionalGetMixin, ResponseCacheMixin, QuerysetPlanningMixin, VersionedViewMixin,
+                              viewsets.ReadOnlyModelViewSet):
     """
     API v1 endpoint that allows providers to view patients assigned to them.
     """
     serializer_class = PatientSerializer
     permission_classes = [permissions.IsAuthenticated, IsProvider]
+    response_cache_scope = 'patients'
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         if hasattr(self.request.user, 'provider_profile'):
             # Return patients where this provider is the primary provider
             return Patient.objects.filter(primary_provider=self.request.user.provider_profile)
         return Patient.objects.none()
 
-class AppointmentViewSet(VersionedViewMixin, viewsets.ModelViewSet):
+class AppointmentViewSet(ConditionalGetMixin, ResponseCacheMixin, BulkWriteMixin, QuerysetPlanningMixin,
+                         VersionedViewMixin, viewsets.ModelViewSet):
     """
     API v1 endpoint for provider appointments
     """
@@ -60,8 +67,10 @@ class AppointmentViewSet(VersionedViewMixin, viewsets.ModelViewSet):
     ordering_fields = ['time', 'status']
     ordering = ['time']
     version = 'v1'
+    # Joined for the per-object permission checks of bulk updates
+    bulk_select_related = ['doctor']
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         # A provider can only see their own appointments
         if hasattr(self.request.user, 'provider_profile'):
             queryset = Appointment.objects.filter(doctor=self.request.user.provider_profile)
@@ -86,24 +95,28 @@ class AppointmentViewSet(VersionedViewMixin, viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def today(self, request):
         """Get today's appointments"""
-        today = timezone.now().date()
-        queryset = self.get_queryset().filter(
-            time__date=today
-        ).order_by('time')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        def build():
+            queryset = self.get_queryset().on_local_day(
+                timezone.localdate()
+            ).order_by('time')
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+        return self.cached_response('appointments', build)
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get upcoming appointments"""
-        now = timezone.now()
-        queryset = self.get_queryset().filter(
-            time__gt=now
-        ).order_by('time')[:10]  # Limit to 10
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        def build():
+            now = timezone.now()
+            queryset = self.get_queryset().filter(
+                time__gt=now
+            ).order_by('time')[:10]  # Limit to 10
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+        return self.cached_response('appointments', build)
 
-class PrescriptionViewSet(VersionedViewMixin, viewsets.ModelViewSet):
+class PrescriptionViewSet(ConditionalGetMixin, BulkWriteMixin, QuerysetPlanningMixin, VersionedViewMixin,
+                          viewsets.ModelViewSet):
     """
     API v1 endpoint for provider prescriptions
     """
@@ -114,8 +127,9 @@ class PrescriptionViewSet(VersionedViewMixin, viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'status']
     ordering = ['-created_at']
     version = 'v1'
+    bulk_select_related = ['doctor']
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         # A provider can only see prescriptions they've written
         if hasattr(self.request.user, 'provider_profile'):
             queryset = Prescription.objects.filter(doctor=self.request.user.provider_profile)
@@ -128,6 +142,9 @@ class PrescriptionViewSet(VersionedViewMixin, viewsets.ModelViewSet):
             return queryset
         return Prescription.objects.none()
     
+    def prepare_bulk_instance(self, instance, created):
+        instance.set_refill_defaults()
+    
     @action(detail=False, methods=['get'])
     def pending(self, request):
         """Get pending prescriptions"""
@@ -199,11 +216,14 @@ class PrescriptionViewSet(VersionedViewMixin, viewsets.ModelViewSet):
 #    def perform_create(self, serializer):
 #        serializer.save(sender=self.request.user, sender_type='provider')
 
-class MessageViewSet(VersionedViewMixin, PaginationMixin, MessageActionsMixin, 
-                     FilterMixin, SearchMixin, viewsets.ModelViewSet):
+class MessageViewSet(ConditionalGetMixin, ResponseCacheMixin, BulkWriteMixin, VersionedViewMixin, PaginationMixin,
+                     MessageActionsMixin, FilterMixin, SearchMixin, QuerysetPlanningMixin, viewsets.ModelViewSet):
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated, IsProviderOwner]
     version = 'v1'
+    bulk_select_related = ['sender', 'recipient']
+    # Statuses a recipient may set through bulk-status/
+    recipient_statuses = ('read', 'unread', 'archived')
     
     # Define filter fields for FilterMixin
     filter_fields = {
@@ -215,20 +235,44 @@ class MessageViewSet(VersionedViewMixin, PaginationMixin, MessageActionsMixin,
     # Define search fields for SearchMixin
     search_fields = ['subject', 'content']
     
-    def get_queryset(self):
-        # Call super() to apply filters and search from mixins
-        queryset = Message.objects.filter(
+    def get_base_queryset(self):
+        # FilterMixin and SearchMixin apply their filters on top of this
+        # through get_queryset()
+        if not self.request.user.is_authenticated:
+            # Only reached by schema generation; the permissions turn anonymous requests away
+            return Message.objects.none()
+        return Message.objects.filter(
             Q(sender=self.request.user) | Q(recipient=self.request.user)
         ).order_by('-created_at')
-        
-        # Apply filters and search from mixins
-        queryset = super().get_queryset(queryset)
-        return queryset
     
     def perform_create(self, serializer):
         serializer.save(sender=self.request.user, sender_type='provider')
+    
+    def get_permissions(self):
+        # Messages can't be edited or deleted; the only change allowed is a
+        # recipient updating the status of messages they received
+        if self.action == 'bulk_status':
+            return [permissions.IsAuthenticated(), IsProvider(), IsMessageRecipient()]
+        return super().get_permissions()
+    
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Set the status of received messages (read, unread or archived)"""
+        if isinstance(request.data, dict) and request.data.get('status') not in self.recipient_statuses:
+            raise ValidationError({'status': [f"Must be one of: {', '.join(self.recipient_statuses)}."]})
+        return super().bulk_status(request)
+    
+    def get_bulk_save_kwargs(self):
+        return {'sender': self.request.user, 'sender_type': 'provider'}
+    
+    def prepare_bulk_instance(self, instance, created):
+        # Keep read_at in step with status, as mark_as_read/mark_as_unread do
+        if instance.status == 'read' and instance.read_at is None:
+            instance.read_at = timezone.now()
+        elif instance.status == 'unread':
+            instance.read_at = None
 
-class ClinicalNoteViewSet(VersionedViewMixin, viewsets.ModelViewSet):
+class ClinicalNoteViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ModelViewSet):
     """
     API v1 endpoint for clinical notes
     """
@@ -240,13 +284,13 @@ class ClinicalNoteViewSet(VersionedViewMixin, viewsets.ModelViewSet):
     ordering = ['-created_at']
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         # A provider can only see their own clinical notes
         if hasattr(self.request.user, 'provider_profile'):
             return ClinicalNote.objects.filter(provider=self.request.user.provider_profile)
         return ClinicalNote.objects.none()
 
-class DocumentTemplateViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
+class DocumentTemplateViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     API v1 endpoint for document templates (read-only for providers)
     """
@@ -258,11 +302,11 @@ class DocumentTemplateViewSet(VersionedViewMixin, viewsets.ReadOnlyModelViewSet)
     ordering = ['name']
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         # Providers can see all active templates
         return DocumentTemplate.objects.filter(is_active=True)
 
-class GeneratedDocumentViewSet(VersionedViewMixin, viewsets.ModelViewSet):
+class GeneratedDocumentViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ModelViewSet):
     """
     API v1 endpoint for generated documents
     """
@@ -274,13 +318,13 @@ class GeneratedDocumentViewSet(VersionedViewMixin, viewsets.ModelViewSet):
     ordering = ['-created_at']
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         # A provider can only see documents they've generated
         if hasattr(self.request.user, 'provider_profile'):
             return GeneratedDocument.objects.filter(provider=self.request.user.provider_profile)
         return GeneratedDocument.objects.none()
 
-class RecordingSessionViewSet(VersionedViewMixin, viewsets.ModelViewSet):
+class RecordingSessionViewSet(ConditionalGetMixin, QuerysetPlanningMixin, VersionedViewMixin, viewsets.ModelViewSet):
     """
     API v1 endpoint for recording sessions
     """
@@ -292,7 +336,7 @@ class RecordingSessionViewSet(VersionedViewMixin, viewsets.ModelViewSet):
     ordering = ['-start_time']
     version = 'v1'
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         # A provider can only see their own recording sessions
         if hasattr(self.request.user, 'provider_profile'):
             return RecordingSession.objects.filter(provider=self.request.user.provider_profile)
@@ -1,6 +1,7 @@
 # mysite/api/v1/urls.py
 from django.urls import include, path
-from rest_framework.authtoken import views as token_views
+
+from api.v1.core.views import ObtainExpiringAuthToken, RotateAuthTokenView
 
 urlpatterns = [
     # Include all v1 endpoints
@@ -8,5 +9,6 @@ urlpatterns = [
     path('patient/', include('api.v1.patient.urls')),  # Patient API
     path('provider/', include('api.v1.provider.urls')),  # Provider API
     path('auth/', include('rest_framework.urls')),
-    path('token-auth/', token_views.obtain_auth_token, name='api-token-auth'),
+    path('token-auth/', ObtainExpiringAuthToken.as_view(), name='api-token-auth'),
+    path('token-auth/rotate/', RotateAuthTokenView.as_view(), name='api-token-rotate'),
 ]
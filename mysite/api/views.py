@@ -1,7 +1,9 @@
 # api/views.py
 from rest_framework import viewsets, mixins, permissions, status
 from rest_framework.decorators import action
+from rest_framework.renderers import StaticHTMLRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.contrib.auth.models import User, Group
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
@@ -15,6 +17,7 @@ from .permissions import (
     IsPatient, IsProvider, IsPatientOwner, IsProviderOwner,
     IsMessageParticipant, IsAdminUser
 )
+from .schema import artifact_response
 
 class BaseUserViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -93,3 +96,15 @@ class BaseViewSet(viewsets.ModelViewSet):
                 {'detail': f"{error_message}: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+class ApiReferenceView(APIView):
+    """
+    API reference generated from the viewsets and serializers, served from
+    the precomputed artifact (see api.schema)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [StaticHTMLRenderer]
+    schema = None  # exclude from schema
+    
+    def get(self, request, *args, **kwargs):
+        return artifact_response(request, 'html')
@@ -1,6 +1,6 @@
 # In common/admin.py
 from django.contrib import admin
-from .models import Prescription, Appointment, Message
+from .models import Prescription, Appointment, Message, AuditEvent
 
 @admin.register(Prescription)
 class PrescriptionAdmin(admin.ModelAdmin):
@@ -22,3 +22,12 @@ class MessageAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     search_fields = ('subject', 'content', 'sender__first_name', 'sender__last_name', 'recipient__first_name', 'recipient__last_name')
     date_hierarchy = 'created_at'
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    # Kept to indexed reads: no full COUNT(*), no DISTINCT-based list filters
+    list_display = ('created_at', 'actor_username', 'action', 'entity_type', 'entity_id', 'ip_address', 'success')
+    show_full_result_count = False
+    raw_id_fields = ('actor',)
+    readonly_fields = ('actor', 'actor_username', 'action', 'entity_type', 'entity_id',
+                       'ip_address', 'details', 'success', 'created_at')
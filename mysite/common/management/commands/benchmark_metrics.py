@@ -0,0 +1,75 @@
+# common/management/commands/benchmark_metrics.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from common.middleware import RequestMetricsMiddleware
+from common.utils import metrics
+
+class Command(BaseCommand):
+    help = 'Measure the per-request, per-query and per-external-call overhead of the request metrics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help='Requests (or queries/calls) per timed run')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per measurement')
+
+    def time_runs(self, func, count, repeat):
+        """Median microseconds per call over ``repeat`` runs of ``count`` calls"""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(count):
+                func()
+            timings.append((time.perf_counter() - started) * 1_000_000 / count)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        count, repeat = options['requests'], options['repeat']
+        request = RequestFactory().get('/metrics')
+        match = resolve('/metrics')
+
+        def view(request):
+            request.resolver_match = match
+            return HttpResponse('ok')
+
+        middleware = RequestMetricsMiddleware(view)
+        bare = self.time_runs(lambda: view(request), count, repeat)
+        wrapped = self.time_runs(lambda: middleware(request), count, repeat)
+
+        def query():
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+        plain_query = self.time_runs(query, count, repeat)
+
+        def timed_query():
+            token = metrics.current_timings.set(metrics.RequestTimings())
+            try:
+                with connection.execute_wrapper(metrics.time_query):
+                    query()
+            finally:
+                metrics.current_timings.reset(token)
+
+        wrapped_query = self.time_runs(timed_query, count, repeat)
+
+        def external():
+            with metrics.external_call('benchmark'):
+                pass
+
+        external_us = self.time_runs(external, count, repeat)
+
+        self.stdout.write(f"{'Measurement':<28}{'us/op':>10}")
+        self.stdout.write(f"{'request (no middleware)':<28}{bare:>10.2f}")
+        self.stdout.write(f"{'request (metrics)':<28}{wrapped:>10.2f}")
+        self.stdout.write(f"{'query (plain)':<28}{plain_query:>10.2f}")
+        self.stdout.write(f"{'query (timed)':<28}{wrapped_query:>10.2f}")
+        self.stdout.write(f"{'external_call':<28}{external_us:>10.2f}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Middleware overhead: {wrapped - bare:.2f}us per request; "
+            f"query wrapper (incl. per-request setup): {wrapped_query - plain_query:.2f}us per query"
+        ))
@@ -0,0 +1,148 @@
+# common/middleware.py
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from common.utils import compression, metrics
+from common.utils.audit import current_request, audit_log
+
+
+class AuditLogMiddleware:
+    """
+    Make the request available to audit_log and flush queued audit events
+    once the response is ready
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
+            audit_log.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compress text-like responses with Brotli or gzip, as negotiated from
+    Accept-Encoding.
+    
+    Bodies under COMPRESSION_MIN_SIZE, or that don't shrink, are sent as
+    is. Streaming responses are compressed chunk by chunk. Responses
+    that are already encoded (e.g. precompressed static files), partial
+    content and ``Cache-Control: no-transform`` are left alone. Bytes
+    saved and CPU time are counted per response class (see
+    common.utils.compression.get_stats).
+
+    HTML is only compressed when COMPRESSION_HTML is on, and then as gzip
+    with a randomly padded header (BREACH mitigation, as in Django's
+    GZipMiddleware); Brotli has no equivalent padding so isn't offered.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not getattr(settings, 'COMPRESSION_ENABLED', True):
+            return response
+        return self.compress_response(request, response)
+
+    def compress_response(self, request, response):
+        content_type = response.get('Content-Type', '')
+        if (
+            response.has_header('Content-Encoding')
+            or response.status_code == 206
+            or not compression.is_compressible(content_type)
+            or 'no-transform' in response.get('Cache-Control', '')
+        ):
+            return response
+
+        available, max_random_bytes = None, None
+        if compression.is_html(content_type):
+            if not getattr(settings, 'COMPRESSION_HTML', False):
+                return response
+            available = ['gzip']
+            max_random_bytes = getattr(settings, 'COMPRESSION_HTML_MAX_RANDOM_BYTES', 100)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), available)
+        if encoding is None:
+            return response
+        stats_class = compression.response_class(content_type)
+
+        if response.streaming:
+            if response.is_async:
+                return response
+            response.streaming_content = compression.compress_stream(
+                response.streaming_content, encoding, stats_class, max_random_bytes
+            )
+            if response.has_header('Content-Length'):
+                del response.headers['Content-Length']
+        else:
+            content = response.content
+            if len(content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 512):
+                return response
+            started = time.thread_time_ns()
+            compressed = compression.compress(content, encoding, max_random_bytes)
+            cpu_ns = time.thread_time_ns() - started
+            if len(compressed) >= len(content):
+                return response
+            compression.record(stats_class, len(content), len(compressed), cpu_ns)
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # The encoded body differs byte for byte, so a strong validator
+        # no longer applies
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = f'W/{etag}'
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, database queries and time, and time spent in external
+    services per resolved view name (see common.utils.metrics, served at
+    /metrics).
+    
+    Goes first so latency covers the other middleware; streamed bodies
+    are timed up to the response headers. Unresolved paths are grouped
+    under one view name, and unknown methods under 'OTHER', to keep label
+    cardinality bounded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return self.get_response(request)
+
+        timings = metrics.RequestTimings()
+        token = metrics.current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.time_query))
+                response = self.get_response(request)
+        finally:
+            metrics.current_timings.reset(token)
+
+        match = request.resolver_match
+        metrics.registry.observe_request(
+            match.view_name if match else 'unresolved',
+            request.method if request.method in metrics.HTTP_METHODS else 'OTHER',
+            str(response.status_code),
+            time.perf_counter() - started,
+            timings,
+        )
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0010_appointment_common_appo_patient_560f61_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('actor_username', models.CharField(blank=True, max_length=150)),
+                ('action', models.CharField(max_length=50)),
+                ('entity_type', models.CharField(blank=True, max_length=100)),
+                ('entity_id', models.CharField(blank=True, max_length=64)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('details', models.TextField(blank=True)),
+                ('success', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [
+                    models.Index(fields=['action', 'created_at'], name='common_audi_action_3f9a2e_idx'),
+                    models.Index(fields=['actor', 'created_at'], name='common_audi_actor_i_8c1d47_idx'),
+                    models.Index(fields=['created_at'], name='common_audi_created_b52e90_idx'),
+                ],
+            },
+        ),
+    ]
@@ -2,6 +2,35 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from common.utils.dates import local_day_bounds, local_range_bounds
+
+
+class AppointmentQuerySet(models.QuerySet):
+    """Index-friendly date filters for appointments"""
+    
+    def in_local_range(self, start_date, end_date=None, tz=None):
+        """Appointments on local days start_date..end_date (inclusive)"""
+        start, end = local_range_bounds(start_date, end_date or start_date, tz)
+        return self.filter(time__gte=start, time__lt=end)
+    
+    def on_local_day(self, day, tz=None):
+        """Appointments on a single local calendar day"""
+        start, end = local_day_bounds(day, tz)
+        return self.filter(time__gte=start, time__lt=end)
+    
+    def for_provider_day(self, provider, day, tz=None):
+        """A provider's appointments on a local day; served by the (doctor, time) index"""
+        return self.filter(doctor=provider).on_local_day(day, tz)
+    
+    def for_provider_range(self, provider, start_date, end_date, tz=None):
+        """A provider's appointments over local days start_date..end_date (inclusive)"""
+        return self.filter(doctor=provider).in_local_range(start_date, end_date, tz)
+    
+    def for_patient_day(self, patient, day, tz=None):
+        """A patient's appointments on a local day; served by the (patient, time) index"""
+        return self.filter(patient=patient).on_local_day(day, tz)
+
+
 class Appointment(models.Model):
     """Model for appointments between patients and providers"""
     STATUS_CHOICES = [
@@ -28,6 +57,9 @@ class Appointment(models.Model):
     notes = models.TextField(blank=True)  # Add this field
     # Add status field
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Scheduled')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = AppointmentQuerySet.as_manager()
     
     def __str__(self):
         return f"Appointment {self.id}: {self.patient} with {self.doctor} at {self.time}"
@@ -74,10 +106,13 @@ class Prescription(models.Model):
     def __str__(self):
         return f"{self.medication_name} - {self.dosage} for {self.patient.get_full_name()}"
     
-    def save(self, *args, **kwargs):
-        # Set refills_remaining equal to refills on creation
+    def set_refill_defaults(self):
+        """Set refills_remaining equal to refills on creation"""
         if not self.id and self.refills_remaining == 0:
             self.refills_remaining = self.refills
+
+    def save(self, *args, **kwargs):
+        self.set_refill_defaults()
         super().save(*args, **kwargs)
 
 
@@ -114,6 +149,7 @@ class Message(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='unread')
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='normal')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     read_at = models.DateTimeField(null=True, blank=True)
     thread_id = models.CharField(max_length=50, null=True, blank=True)
     added_to_record = models.BooleanField(default=False)
@@ -178,3 +214,32 @@ class MessageAttachment(models.Model):
             if size < 1024 or unit == 'GB':
                 return f"{size:.1f} {unit}"
             size /= 1024
+
+
+class AuditEvent(models.Model):
+    """
+    Append-only audit trail.
+    
+    Written in batches by common.utils.audit.audit_log; the actor's
+    username is copied so entries stay readable after the user is removed.
+    """
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='audit_events')
+    actor_username = models.CharField(max_length=150, blank=True)
+    action = models.CharField(max_length=50)  # e.g. LOGIN, CREATE_USER
+    entity_type = models.CharField(max_length=100, blank=True)
+    entity_id = models.CharField(max_length=64, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    details = models.TextField(blank=True)
+    success = models.BooleanField(default=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['action', 'created_at'], name='common_audi_action_3f9a2e_idx'),
+            models.Index(fields=['actor', 'created_at'], name='common_audi_actor_i_8c1d47_idx'),
+            models.Index(fields=['created_at'], name='common_audi_created_b52e90_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.action} by {self.actor_username or 'system'} at {self.created_at}"
@@ -7,6 +7,8 @@ import caldav
 from icalendar import Calendar, Event, vText, vCalAddress
 from django.conf import settings
 
+from common.utils.metrics import external_call
+
 logger = logging.getLogger(__name__)
 
 class CalendarService:
@@ -21,6 +23,7 @@ class CalendarService:
         self.calendars = []
         self.ready = self._connect()
         
+    @external_call('caldav')
     def _connect(self):
         """Connect to the CalDAV server and get available calendars."""
         try:
@@ -64,6 +67,7 @@ class CalendarService:
         # For simplicity, we'll use the first calendar as the default
         return self.calendars[0]
         
+    @external_call('caldav')
     def list_upcoming_events(self, days=7):
         """List events in the next `days` days."""
         try:
@@ -137,6 +141,7 @@ class CalendarService:
             logger.error(f"Error listing events: {e}")
             return []
 
+    @external_call('caldav')
     def create_event(self, summary, start_time, end_time, description=None, uid=None, attendees=None, location=None):
         """Create a new calendar event."""
         try:
@@ -201,6 +206,7 @@ class CalendarService:
             logger.error(f"Error creating event: {e}")
             return False
 
+    @external_call('caldav')
     def delete_event(self, uid):
         """Delete an event by UID."""
         try:
@@ -233,6 +239,7 @@ class CalendarService:
             logger.error(f"Error deleting event: {e}")
             return False
     
+    @external_call('caldav')
     def update_event(self, uid, summary=None, start_time=None, end_time=None, description=None, location=None):
         """Update an existing event."""
         try:
@@ -291,6 +298,7 @@ class CalendarService:
             logger.error(f"Error updating event: {e}")
             return False
     
+    @external_call('caldav')
     def get_free_busy(self, start_date, end_date):
         """Get free/busy information for the calendar."""
         try:
@@ -321,6 +329,7 @@ class CalendarService:
             logger.error(f"Error getting free/busy: {e}")
             return []
     
+    @external_call('caldav')
     def get_available_slots(self, date, duration=30, start_hour=9, end_hour=17):
         """Get available time slots for a specific date."""
         try:
@@ -10,6 +10,8 @@ from django.core.mail import send_mail, EmailMessage, EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
+from common.utils.metrics import external_call
+
 logger = logging.getLogger(__name__)
 
 class EmailService:
@@ -57,6 +59,7 @@ class EmailService:
             return False
     
     @staticmethod
+    @external_call('smtp')
     def _send_via_iredmail(sender, recipient, subject, body, priority='normal', attachments=None):
         """
         Send email using direct SMTP connection to IredMail server
@@ -133,6 +136,7 @@ class EmailService:
             )
     
     @staticmethod
+    @external_call('smtp')
     def _send_via_django(sender, recipient, subject, body, priority='normal', attachments=None):
         """
         Send email using Django's email backend
@@ -227,6 +231,7 @@ class EmailService:
             return False
 
     @staticmethod
+    @external_call('smtp')
     def test_connection():
         """
         Test email connection to verify configuration
@@ -0,0 +1,44 @@
+# common/signals.py
+from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from common.models import Appointment, Prescription
+from common.utils.audit import audit_log
+
+
+def remember_previous_status(sender, instance, raw=False, **kwargs):
+    """
+    Keep the stored status on ``instance._previous_status`` so post_save
+    receivers (activity feed, dashboard counters) can detect status changes
+    """
+    if raw:
+        return
+    instance._previous_status = None
+    if instance.pk is not None:
+        instance._previous_status = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('status', flat=True).first()
+
+
+pre_save.connect(remember_previous_status, sender=Appointment, dispatch_uid='appointment_previous_status')
+pre_save.connect(remember_previous_status, sender=Prescription, dispatch_uid='prescription_previous_status')
+
+
+@receiver(user_logged_in)
+def audit_login(sender, request, user, **kwargs):
+    audit_log.log('LOGIN', actor=user, request=request, details='Successful login')
+
+
+@receiver(user_logged_out)
+def audit_logout(sender, request, user, **kwargs):
+    audit_log.log('LOGOUT', actor=user, request=request)
+
+
+@receiver(user_login_failed)
+def audit_login_failed(sender, credentials, request=None, **kwargs):
+    username = credentials.get('username', '')
+    audit_log.log(
+        'LOGIN_FAILED', request=request, success=False,
+        details=f"Failed login for {username}" if username else 'Failed login'
+    )
@@ -0,0 +1,139 @@
+# common/staticfiles.py
+import logging
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import StaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotAllowed, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from common.utils import compression
+
+logger = logging.getLogger(__name__)
+
+
+def _is_fresh(variant_path, source_mtime):
+    return os.path.isfile(variant_path) and os.path.getmtime(variant_path) >= source_mtime
+
+
+class PrecompressedStaticFilesStorage(StaticFilesStorage):
+    """
+    Static files storage that writes .br and .gz variants of every
+    compressible collected file during collectstatic's post-processing.
+
+    Brotli runs at quality 11 and gzip through zopfli, since each file is
+    compressed once and served many times. Variants newer than their
+    source are kept, so reruns only compress what changed; variants that
+    wouldn't be smaller are not written.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        parent = getattr(super(), 'post_process', None)
+        if parent is not None:
+            yield from parent(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        original_total = compressed_total = 0
+        for name in sorted(paths):
+            try:
+                sizes = self.write_variants(name)
+            except OSError as e:
+                yield name, None, e
+                continue
+            if sizes:
+                original_total += sizes[0]
+                compressed_total += sizes[1]
+                yield name, name, True
+
+        if original_total:
+            logger.info(
+                f"Precompressed static files: {original_total} bytes -> {compressed_total} bytes "
+                f"(best variant per file)"
+            )
+
+    def write_variants(self, name):
+        """
+        Write missing or stale variants of one file.
+        Returns (original size, smallest variant size) when any was written.
+        """
+        content_type, content_encoding = mimetypes.guess_type(name)
+        if content_encoding or not compression.is_compressible(content_type):
+            return None
+        path = self.path(name)
+        source_mtime = os.path.getmtime(path)
+        size = os.path.getsize(path)
+        if size < getattr(settings, 'STATIC_PRECOMPRESS_MIN_SIZE', 256):
+            return None
+
+        stale = [
+            encoding for encoding in compression.supported_encodings()
+            if not _is_fresh(path + compression.VARIANT_SUFFIXES[encoding], source_mtime)
+        ]
+        if not stale:
+            return None
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        smallest = size
+        for encoding in stale:
+            variant_path = path + compression.VARIANT_SUFFIXES[encoding]
+            compressed = compression.compress_static(data, encoding)
+            if len(compressed) >= size:
+                if os.path.exists(variant_path):
+                    os.remove(variant_path)
+                continue
+            tmp_path = f'{variant_path}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, variant_path)
+            smallest = min(smallest, len(compressed))
+        return (size, smallest) if smallest < size else None
+
+
+def serve_precompressed(request, path):
+    """
+    Serve a collected static file from STATIC_ROOT, picking the .br or .gz
+    variant written by PrecompressedStaticFilesStorage when the client
+    accepts it and it is up to date
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Static file not found")
+    if not os.path.isfile(fullpath):
+        raise Http404("Static file not found")
+
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, content_encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+    available = [
+        encoding for encoding in compression.ENCODINGS
+        if _is_fresh(fullpath + compression.VARIANT_SUFFIXES[encoding], stat.st_mtime)
+    ]
+    encoding = compression.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), available)
+
+    serve_path = fullpath + compression.VARIANT_SUFFIXES[encoding] if encoding else fullpath
+    response = FileResponse(
+        open(serve_path, 'rb'), content_type=content_type, filename=os.path.basename(fullpath)
+    )
+    response.headers['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+        compression.record('static', stat.st_size, os.path.getsize(serve_path))
+    elif content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    if compression.is_compressible(content_type):
+        patch_vary_headers(response, ('Accept-Encoding',))
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'STATIC_MAX_AGE', 3600))
+    return response
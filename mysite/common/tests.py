@@ -1,3 +1,354 @@
-from django.test import TestCase
+# common/tests.py
+import gzip
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, time, timezone as dt_timezone
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import brotli
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+from django.utils import timezone
+
+from admin_portal.services.audit_service import AuditLogService
+from common.middleware import CompressionMiddleware, RequestMetricsMiddleware
+from common.models import Appointment, AuditEvent
+from common.staticfiles import PrecompressedStaticFilesStorage, serve_precompressed
+from common.utils import compression, metrics
+from common.utils.audit import AuditLogWriter, get_client_ip
+from common.utils.config_registry import ai_model_configs
+from common.utils.dates import local_day_bounds, local_range_bounds
+from provider.models import AIModelConfig
+
+
+class LocalDateBoundsTests(TestCase):
+    @override_settings(TIME_ZONE='America/Toronto')
+    def test_local_day_is_half_open_utc_range(self):
+        start, end = local_day_bounds(date(2026, 1, 15))
+
+        self.assertEqual(start, timezone.make_aware(datetime(2026, 1, 15, 0, 0)))
+        self.assertEqual(end, timezone.make_aware(datetime(2026, 1, 16, 0, 0)))
+        self.assertEqual(start.astimezone(dt_timezone.utc).hour, 5)
+
+    def test_range_includes_end_date(self):
+        start, end = local_range_bounds(date(2026, 1, 1), date(2026, 1, 7))
+
+        self.assertEqual(start, timezone.make_aware(datetime.combine(date(2026, 1, 1), time.min)))
+        self.assertEqual(end, timezone.make_aware(datetime.combine(date(2026, 1, 8), time.min)))
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN output checked against SQLite query plans')
+class AppointmentDayQueryPlanTests(TestCase):
+    """Day lookups must stay sargable so the (doctor, time) and (patient, time) indexes are used"""
+
+    def test_provider_day_uses_doctor_time_index(self):
+        plan = Appointment.objects.for_provider_day(1, date(2026, 1, 15)).explain()
+        self.assertIn('common_appo_doctor__f5af4e_idx', plan)
+
+    def test_patient_day_uses_patient_time_index(self):
+        plan = Appointment.objects.for_patient_day(1, date(2026, 1, 15)).explain()
+        self.assertIn('common_appo_patient_560f61_idx', plan)
+
+    def test_provider_range_uses_doctor_time_index(self):
+        plan = Appointment.objects.for_provider_range(1, date(2026, 1, 1), date(2026, 1, 7)).explain()
+        self.assertIn('common_appo_doctor__f5af4e_idx', plan)
+
+
+@override_settings(AUDIT_LOG_BUFFER_SIZE=3, AUDIT_LOG_FLUSH_INTERVAL=0)
+class AuditLogWriterTests(TestCase):
+    def setUp(self):
+        self.writer = AuditLogWriter()
+
+    def test_events_are_buffered_until_flush(self):
+        self.writer.log('login', details='first')
+        self.writer.log('logout')
+
+        self.assertEqual(AuditEvent.objects.count(), 0)
+        self.assertEqual(self.writer.flush(), 2)
+        self.assertEqual(
+            sorted(AuditEvent.objects.values_list('action', flat=True)), ['LOGIN', 'LOGOUT']
+        )
+
+    def test_full_buffer_is_written_in_one_batch(self):
+        # One insert, in a savepoint
+        with self.assertNumQueries(3):
+            for i in range(3):
+                self.writer.log('UPDATE', entity_type='Patient', entity_id=i)
+        self.assertEqual(self.writer.pending(), 0)
+        self.assertEqual(AuditEvent.objects.filter(action='UPDATE').count(), 3)
+
+    def test_deleted_actor_does_not_lose_events(self):
+        user = User.objects.create_user(username='gone')
+        self.writer.log('LOGIN', actor=user)
+        self.writer.log('LOGOUT')
+        user.delete()
+
+        with transaction.atomic():
+            self.assertEqual(self.writer.flush(), 2)
+        event = AuditEvent.objects.get(action='LOGIN')
+        self.assertIsNone(event.actor_id)
+        self.assertEqual(event.actor_username, 'gone')
+
+    def test_failed_batch_is_retried_row_by_row(self):
+        for i in range(2):
+            self.writer.log('UPDATE', entity_type='Patient', entity_id=i)
+
+        with mock.patch.object(AuditEvent.objects, 'bulk_create', side_effect=DatabaseError('batch failed')), \
+                self.assertLogs('common.utils.audit', 'WARNING'):
+            self.assertEqual(self.writer.flush(), 2)
+        self.assertEqual(AuditEvent.objects.filter(action='UPDATE').count(), 2)
+
+
+class ClientIpTests(SimpleTestCase):
+    def request(self, forwarded):
+        return RequestFactory().get('/', HTTP_X_FORWARDED_FOR=forwarded, REMOTE_ADDR='10.0.0.2')
+
+    @override_settings(TRUSTED_PROXY_COUNT=0)
+    def test_forwarded_header_is_ignored_without_trusted_proxies(self):
+        self.assertEqual(get_client_ip(self.request('203.0.113.9')), '10.0.0.2')
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_spoofed_hops_are_skipped(self):
+        # The client sent "1.2.3.4"; the proxy appended the address it saw
+        self.assertEqual(get_client_ip(self.request('1.2.3.4, 203.0.113.9')), '203.0.113.9')
+
+    @override_settings(TRUSTED_PROXY_COUNT=2)
+    def test_short_header_falls_back_to_remote_addr(self):
+        self.assertEqual(get_client_ip(self.request('203.0.113.9')), '10.0.0.2')
+
+
+class AuditLogServiceTests(TestCase):
+    def test_keyset_pages_cover_filtered_log(self):
+        created_at = timezone.now()
+        AuditEvent.objects.bulk_create(
+            AuditEvent(action='LOGIN' if i % 2 else 'UPDATE', created_at=created_at)
+            for i in range(9)
+        )
+
+        seen = []
+        cursor = None
+        while True:
+            result = AuditLogService.get_logs(action='login', cursor=cursor, limit=2)
+            seen.extend(log['id'] for log in result['logs'])
+            cursor = result['next_cursor']
+            if not cursor:
+                break
+
+        expected = list(AuditEvent.objects.filter(action='LOGIN')
+                        .order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+
+class ModelConfigRegistryTests(TestCase):
+    def setUp(self):
+        ai_model_configs.invalidate()
+        self.addCleanup(ai_model_configs.invalidate)
+        self.notes = AIModelConfig.objects.create(
+            name='Notes', model_type='clinical_note', api_endpoint='https://notes.example.com/v1',
+            configuration_data='{"model_name": "notes-v2"}'
+        )
+        AIModelConfig.objects.create(
+            name='Retired', model_type='clinical_note', api_endpoint='https://old.example.com/v1', is_active=False
+        )
+
+    def test_load_parses_active_configs_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(ai_model_configs.get_active('clinical_note')['id'], self.notes.id)
+            self.assertEqual(ai_model_configs.get_configuration(self.notes.id), {'model_name': 'notes-v2'})
+            self.assertEqual(len(ai_model_configs.get_active_configs('clinical_note')), 1)
+            self.assertFalse(ai_model_configs.has_active('transcription'))
+
+    def test_save_invalidates(self):
+        ai_model_configs.get_active('clinical_note')
+        self.notes.configuration_data = '{"model_name": "notes-v3"}'
+        self.notes.save()
+        self.assertEqual(ai_model_configs.get_configuration(self.notes.id), {'model_name': 'notes-v3'})
+
+        self.notes.delete()
+        self.assertIsNone(ai_model_configs.get_active('clinical_note'))
+
+    def test_load_overlapping_invalidation_is_not_kept(self):
+        load = ai_model_configs._load
+
+        def load_then_save():
+            snapshot = load()
+            # A save lands after the rows were read
+            AIModelConfig.objects.filter(pk=self.notes.pk).update(configuration_data='{"model_name": "notes-v3"}')
+            ai_model_configs.invalidate()
+            return snapshot
+
+        with mock.patch.object(ai_model_configs, '_load', side_effect=load_then_save):
+            self.assertEqual(ai_model_configs.get_configuration(self.notes.id), {'model_name': 'notes-v2'})
+        # The stale snapshot was discarded rather than cached
+        self.assertEqual(ai_model_configs.get_configuration(self.notes.id), {'model_name': 'notes-v3'})
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = b'{"appointments": [' + b'{"status": "Scheduled", "type": "Virtual"},' * 100 + b'{}]}'
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def get(self, response, accept_encoding):
+        request = self.factory.get('/api/v1/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiates_encoding(self):
+        self.assertEqual(compression.choose_encoding('gzip, deflate, br'), 'br')
+        self.assertEqual(compression.choose_encoding('br;q=0.5, gzip'), 'gzip')
+        self.assertEqual(compression.choose_encoding('br;q=0, *'), 'gzip')
+        self.assertIsNone(compression.choose_encoding('identity'))
+
+    def test_compresses_json_with_brotli(self):
+        response = self.get(HttpResponse(self.body, content_type='application/json'), 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertGreater(compression.get_stats()['json']['bytes_saved'], 0)
+
+    def test_skips_small_and_binary_bodies(self):
+        small = self.get(HttpResponse(b'{"ok": true}', content_type='application/json'), 'br')
+        self.assertFalse(small.has_header('Content-Encoding'))
+        binary = self.get(HttpResponse(self.body, content_type='application/zip'), 'br')
+        self.assertFalse(binary.has_header('Content-Encoding'))
+
+    def test_streams_gzip(self):
+        chunks = [self.body[i:i + 100] for i in range(0, len(self.body), 100)]
+        response = self.get(StreamingHttpResponse(iter(chunks), content_type='text/csv'), 'gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.body)
+
+    def test_html_is_not_compressed_by_default(self):
+        response = self.get(HttpResponse(self.body, content_type='text/html; charset=utf-8'), 'gzip, br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, self.body)
+
+    @override_settings(COMPRESSION_HTML=True, COMPRESSION_HTML_MAX_RANDOM_BYTES=100)
+    def test_html_is_gzipped_with_padding_when_enabled(self):
+        response = self.get(HttpResponse(self.body, content_type='text/html'), 'br, gzip')
+        # No Brotli, since it can't be padded
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response.content[3] & gzip.FNAME)
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+        chunks = [self.body[i:i + 100] for i in range(0, len(self.body), 100)]
+        streamed = self.get(StreamingHttpResponse(iter(chunks), content_type='text/html'), 'br, gzip')
+        content = b''.join(streamed.streaming_content)
+        self.assertTrue(content[3] & gzip.FNAME)
+        self.assertEqual(gzip.decompress(content), self.body)
+        self.assertEqual(compression.get_stats()['html']['responses'], 2)
+
+
+class PrecompressedStaticFilesTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.css = b'.appointment { color: #333; margin: 0 auto; }\n' * 50
+        with open(os.path.join(self.root, 'app.css'), 'wb') as f:
+            f.write(self.css)
+        with open(os.path.join(self.root, 'logo.png'), 'wb') as f:
+            f.write(os.urandom(1024))
+
+    def collect(self):
+        storage = PrecompressedStaticFilesStorage(location=self.root)
+        return list(storage.post_process({'app.css': None, 'logo.png': None}))
+
+    def test_post_process_writes_variants(self):
+        self.assertEqual([name for name, _, _ in self.collect()], ['app.css'])
+        with open(os.path.join(self.root, 'app.css.gz'), 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), self.css)
+        with open(os.path.join(self.root, 'app.css.br'), 'rb') as f:
+            self.assertEqual(brotli.decompress(f.read()), self.css)
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'logo.png.br')))
+        # Up-to-date variants are not rewritten
+        self.assertEqual(self.collect(), [])
+
+    def test_serves_best_accepted_variant(self):
+        self.collect()
+        factory = RequestFactory()
+        with override_settings(STATIC_ROOT=self.root):
+            response = serve_precompressed(factory.get('/static/app.css', HTTP_ACCEPT_ENCODING='gzip'), 'app.css')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(response['Content-Type'], 'text/css')
+            self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.css)
+            response.close()
+
+            plain = serve_precompressed(factory.get('/static/app.css'), 'app.css')
+            self.assertFalse(plain.has_header('Content-Encoding'))
+            self.assertEqual(b''.join(plain.streaming_content), self.css)
+            plain.close()
+        self.assertEqual(compression.get_stats()['static']['responses'], 1)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        metrics.registry.reset()
+        self.factory = RequestFactory()
+
+    def test_records_latency_queries_and_external_time_per_view(self):
+        def view(request):
+            request.resolver_match = resolve('/metrics')
+            list(User.objects.all())
+            User.objects.count()
+            with metrics.external_call('ldap'):
+                pass
+            return HttpResponse('ok')
+
+        RequestMetricsMiddleware(view)(self.factory.get('/metrics'))
+        registry = metrics.registry
+        self.assertEqual(registry.requests[('metrics', 'GET', '200')], 1)
+        self.assertEqual(registry.latency['metrics'].count, 1)
+        self.assertEqual(registry.db_queries['metrics'], 2)
+        self.assertGreater(registry.db_seconds['metrics'], 0)
+        self.assertIn(('metrics', 'ldap'), registry.view_external)
+        self.assertEqual(registry.external['ldap'].count, 1)
+
+    def test_external_calls(self):
+        with metrics.external_call('caldav'):
+            with metrics.external_call('caldav'):
+                pass
+        with self.assertRaises(ConnectionError):
+            with metrics.external_call('erpnext'):
+                raise ConnectionError
+        # Nested calls to the same service are counted once
+        self.assertEqual(metrics.registry.external['caldav'].count, 1)
+        self.assertEqual(metrics.registry.external_errors, {'erpnext': 1})
+
+    @override_settings(METRICS_BEARER_TOKEN='scrape-secret')
+    def test_metrics_endpoint(self):
+        self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_requests_total{view="metrics",method="GET",status="200"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="metrics",le="+Inf"} 1', body)
+
+    @override_settings(METRICS_BEARER_TOKEN='scrape-secret', METRICS_ALLOWED_IPS=['10.0.0.5'], TRUSTED_PROXY_COUNT=1)
+    def test_metrics_endpoint_is_restricted(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.9').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        # Requests relayed by a same-host proxy all come from loopback
+        forwarded = self.client.get('/metrics', REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.9')
+        self.assertEqual(forwarded.status_code, 403)
+        allowed = self.client.get('/metrics', REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='10.0.0.5')
+        self.assertEqual(allowed.status_code, 200)
+
+    def test_unknown_methods_share_a_label(self):
+        middleware = RequestMetricsMiddleware(lambda request: HttpResponse(status=405))
+        for method in ('PROPFIND', 'X-RANDOM-1', 'X-RANDOM-2'):
+            middleware(self.factory.generic(method, '/metrics'))
+        middleware(self.factory.delete('/metrics'))
+        self.assertEqual(metrics.registry.requests, {
+            ('unresolved', 'OTHER', '405'): 3,
+            ('unresolved', 'DELETE', '405'): 1,
+        })
@@ -0,0 +1,175 @@
+# common/utils/audit.py
+import atexit
+import contextvars
+import logging
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Request being handled by the current thread/task (set by common.middleware.AuditLogMiddleware)
+current_request = contextvars.ContextVar('audit_current_request', default=None)
+
+
+def get_client_ip(request):
+    """
+    Get the client IP. X-Forwarded-For is only honoured behind
+    TRUSTED_PROXY_COUNT reverse proxies: each appends the address it
+    received from, so the client is the hop just before theirs. Earlier
+    hops are supplied by the client and can't be trusted.
+    """
+    proxy_count = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxy_count and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',')]
+        if len(hops) >= proxy_count:
+            return hops[-proxy_count] or None
+    return request.META.get('REMOTE_ADDR') or None
+
+
+class AuditLogWriter:
+    """
+    Buffered writer for AuditEvent rows.
+
+    log() only appends to an in-memory buffer; rows are written with
+    bulk_create when a request finishes (AuditLogMiddleware), when the
+    buffer reaches ``AUDIT_LOG_BUFFER_SIZE`` or every
+    ``AUDIT_LOG_FLUSH_INTERVAL`` seconds from a background timer
+    (0 disables the timer).
+
+    Each write runs in its own savepoint so a failure can't break the
+    caller's transaction. If a batch fails its events are written one by
+    one, so one bad event doesn't lose the rest of the batch.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._timer_lock = threading.Lock()
+
+    @property
+    def buffer_size(self):
+        return getattr(settings, 'AUDIT_LOG_BUFFER_SIZE', 500)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 5)
+
+    def log(self, action, actor=None, entity_type='', entity_id=None, details='',
+            success=True, ip_address=None, request=None):
+        """
+        Queue an audit event; actor and IP default to the current request
+        """
+        request = request or current_request.get()
+        if request is not None:
+            user = getattr(request, 'user', None)
+            if actor is None and user is not None and user.is_authenticated:
+                actor = user
+            if ip_address is None:
+                ip_address = get_client_ip(request)
+
+        AuditEvent = apps.get_model('common', 'AuditEvent')
+        event = AuditEvent(
+            actor=actor,
+            actor_username=actor.get_username() if actor is not None else '',
+            action=str(action).upper()[:50],
+            entity_type=entity_type or '',
+            entity_id='' if entity_id is None else str(entity_id)[:64],
+            ip_address=ip_address,
+            details=details or '',
+            success=success,
+            created_at=timezone.now(),
+        )
+
+        with self._lock:
+            self._buffer.append(event)
+            pending = len(self._buffer)
+
+        if pending >= self.buffer_size:
+            self.flush()
+        else:
+            self._ensure_timer()
+
+    def flush(self):
+        """Write buffered events; returns the number of rows written"""
+        with self._lock:
+            events, self._buffer = self._buffer, []
+
+        if not events:
+            return 0
+
+        AuditEvent = apps.get_model('common', 'AuditEvent')
+        try:
+            self._drop_missing_actors(events)
+            with transaction.atomic():
+                AuditEvent.objects.bulk_create(events, batch_size=self.buffer_size)
+            return len(events)
+        except Exception as e:
+            logger.warning(f"Error writing {len(events)} audit events, retrying one by one: {str(e)}")
+
+        return sum(self._write_one(event) for event in events)
+
+    @staticmethod
+    def _drop_missing_actors(events):
+        """
+        Clear actors deleted since their events were logged (the username is
+        kept). Foreign keys are checked at commit, which could be the
+        caller's, so this can't be left to the insert failing.
+        """
+        actor_ids = {event.actor_id for event in events if event.actor_id is not None}
+        if not actor_ids:
+            return
+        User = apps.get_model(settings.AUTH_USER_MODEL)
+        existing = set(User.objects.filter(pk__in=actor_ids).values_list('pk', flat=True))
+        for event in events:
+            if event.actor_id is not None and event.actor_id not in existing:
+                event.actor = None
+
+    @staticmethod
+    def _write_one(event):
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    event.save(force_insert=True)
+                return 1
+            except Exception as e:
+                if attempt == 0 and event.actor_id is not None:
+                    event.actor = None
+                    continue
+                logger.error(
+                    f"Error writing audit event {event.action} by '{event.actor_username}' "
+                    f"on {event.entity_type} {event.entity_id} at {event.created_at.isoformat()}: {str(e)}"
+                )
+                return 0
+
+    def _ensure_timer(self):
+        if self.flush_interval <= 0:
+            return
+        with self._timer_lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_from_timer(self):
+        with self._timer_lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            # The timer thread opened its own connection; don't leak it
+            connections.close_all()
+
+    def pending(self):
+        with self._lock:
+            return len(self._buffer)
+
+
+audit_log = AuditLogWriter()
+atexit.register(audit_log.flush)
+
@@ -0,0 +1,262 @@
+# common/utils/compression.py
+"""
+Brotli/gzip helpers shared by CompressionMiddleware and the precompressed
+static files storage (common.staticfiles), with per response class
+counters of bytes saved and CPU spent.
+"""
+import gzip
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zopfli.gzip as zopfli_gzip
+except ImportError:
+    zopfli_gzip = None
+
+# Preferred first when the client weighs encodings equally
+ENCODINGS = ['br', 'gzip']
+
+# File suffix of each precompressed static variant
+VARIANT_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'application/x-javascript',
+    'application/xml',
+    'application/xhtml+xml',
+    'application/manifest+json',
+    'application/wasm',
+    'image/svg+xml',
+    'image/x-icon',
+    'font/ttf',
+    'font/otf',
+}
+
+# Pages that can reflect user input next to secrets (CSRF tokens, PHI), so
+# compressing them on the fly exposes those secrets to BREACH
+HTML_TYPES = {'text/html', 'application/xhtml+xml'}
+
+STATS_KEY_PREFIX = 'compression'
+RESPONSE_CLASSES = ['json', 'html', 'css', 'javascript', 'static', 'other']
+STAT_FIELDS = ['responses', 'original_bytes', 'compressed_bytes', 'cpu_us']
+
+
+def supported_encodings():
+    return [encoding for encoding in ENCODINGS if encoding != 'br' or brotli is not None]
+
+
+def is_compressible(content_type):
+    """Whether a media type is worth compressing (text-like, not already compressed)"""
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    return (
+        media_type.startswith('text/')
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith('+json')
+        or media_type.endswith('+xml')
+    )
+
+
+def is_html(content_type):
+    return (content_type or '').split(';')[0].strip().lower() in HTML_TYPES
+
+
+def response_class(content_type):
+    """Bucket a response by media type for the compression stats"""
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    if 'json' in media_type:
+        return 'json'
+    if media_type in ('text/html', 'application/xhtml+xml'):
+        return 'html'
+    if media_type == 'text/css':
+        return 'css'
+    if 'javascript' in media_type:
+        return 'javascript'
+    return 'other'
+
+
+def parse_accept_encoding(header):
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    weights = {}
+    for item in (header or '').split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    return weights
+
+
+def choose_encoding(header, available=None):
+    """
+    The best encoding the client accepts among ``available`` (default:
+    every supported one), or None to send the response as is
+    """
+    weights = parse_accept_encoding(header)
+    best, best_weight = None, 0.0
+    for encoding in available if available is not None else supported_encodings():
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data, encoding, max_random_bytes=None):
+    """
+    Compress a whole body at the on-the-fly quality.
+
+    With ``max_random_bytes``, the body is gzip'd by Django's
+    compress_string, which pads the gzip header with a random length
+    filename so the compressed size no longer leaks the content (BREACH).
+    """
+    if max_random_bytes:
+        return compress_string(data, max_random_bytes=max_random_bytes)
+    if encoding == 'br':
+        return brotli.compress(data, quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5))
+    return gzip.compress(data, compresslevel=getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6), mtime=0)
+
+
+def compress_static(data, encoding):
+    """Compress a static file once, at maximum ratio (zopfli for gzip when installed)"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    if zopfli_gzip is not None:
+        return zopfli_gzip.compress(data, numiterations=getattr(settings, 'STATIC_ZOPFLI_ITERATIONS', 15))
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_stream(chunks, encoding, stats_class=None, max_random_bytes=None):
+    """
+    Compress a streamed body chunk by chunk.
+
+    Every chunk is flushed so the client receives data as it is produced,
+    which matters for long exports and event streams. With
+    ``max_random_bytes`` the body is gzip'd with a padded header instead
+    (see compress).
+    """
+    if max_random_bytes:
+        yield from _compress_stream_padded(chunks, stats_class, max_random_bytes)
+        return
+
+    original = compressed = cpu_ns = 0
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5))
+
+        def process(chunk):
+            return compressor.process(chunk) + compressor.flush()
+
+        finish = compressor.finish
+    else:
+        compressor = zlib.compressobj(
+            getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+        def process(chunk):
+            return compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        finish = compressor.flush
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode(settings.DEFAULT_CHARSET)
+        started = time.thread_time_ns()
+        out = process(chunk)
+        cpu_ns += time.thread_time_ns() - started
+        original += len(chunk)
+        compressed += len(out)
+        if out:
+            yield out
+
+    started = time.thread_time_ns()
+    out = finish()
+    cpu_ns += time.thread_time_ns() - started
+    compressed += len(out)
+    if stats_class:
+        record(stats_class, original, compressed, cpu_ns)
+    yield out
+
+
+def _compress_stream_padded(chunks, stats_class, max_random_bytes):
+    """
+    gzip a stream through Django's compress_sequence. Chunks are not
+    flushed one by one, and CPU time isn't counted since it can't be told
+    apart from the time spent producing the chunks.
+    """
+    sizes = {'original': 0, 'compressed': 0}
+
+    def encoded():
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(settings.DEFAULT_CHARSET)
+            sizes['original'] += len(chunk)
+            yield chunk
+
+    for out in compress_sequence(encoded(), max_random_bytes=max_random_bytes):
+        sizes['compressed'] += len(out)
+        if out:
+            yield out
+    if stats_class:
+        record(stats_class, sizes['original'], sizes['compressed'])
+
+
+def record(stats_class, original_bytes, compressed_bytes, cpu_ns=0):
+    """Count a compressed response towards its class's totals"""
+    if not getattr(settings, 'COMPRESSION_STATS_ENABLED', True):
+        return
+    values = {
+        'responses': 1,
+        'original_bytes': original_bytes,
+        'compressed_bytes': compressed_bytes,
+        'cpu_us': cpu_ns // 1000,
+    }
+    for field, value in values.items():
+        key = f'{STATS_KEY_PREFIX}:stats:{stats_class}:{field}'
+        if not cache.add(key, value, None):
+            try:
+                cache.incr(key, value)
+            except ValueError:
+                cache.set(key, value, None)
+
+
+def get_stats():
+    """Bytes saved and CPU cost per response class"""
+    keys = {
+        f'{STATS_KEY_PREFIX}:stats:{stats_class}:{field}': (stats_class, field)
+        for stats_class in RESPONSE_CLASSES for field in STAT_FIELDS
+    }
+    values = cache.get_many(list(keys))
+    stats = {}
+    for stats_class in RESPONSE_CLASSES:
+        counters = {
+            field: values.get(f'{STATS_KEY_PREFIX}:stats:{stats_class}:{field}', 0) for field in STAT_FIELDS
+        }
+        responses = counters['responses']
+        saved = counters['original_bytes'] - counters['compressed_bytes']
+        stats[stats_class] = {
+            'responses': responses,
+            'original_bytes': counters['original_bytes'],
+            'compressed_bytes': counters['compressed_bytes'],
+            'bytes_saved': saved,
+            'ratio': round(counters['compressed_bytes'] / counters['original_bytes'], 4)
+            if counters['original_bytes'] else None,
+            'cpu_ms': round(counters['cpu_us'] / 1000, 3),
+            'cpu_ms_per_response': round(counters['cpu_us'] / 1000 / responses, 3) if responses else None,
+        }
+    return stats
@@ -0,0 +1,123 @@
+# common/utils/config_registry.py
+import json
+import logging
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+
+class ModelConfigRegistry:
+    """
+    Process-level registry of active AI model configurations.
+
+    Active rows are loaded with a single query, their JSON
+    ``configuration_data`` is parsed once, and lookups by id or model type
+    are plain dictionary reads. The snapshot is dropped whenever a config
+    is saved or deleted in this process; ``AI_CONFIG_REGISTRY_TTL`` (seconds)
+    bounds how long other worker processes can serve a stale snapshot.
+
+    Entries are shared between callers and must be treated as read-only.
+
+    Every invalidation bumps a generation counter. A load that overlaps an
+    invalidation may have read the old rows, so its snapshot is returned
+    to its caller but not kept.
+    """
+
+    def __init__(self, model_label):
+        self.model_label = model_label
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._load_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+        post_save.connect(self._on_change, sender=model_label, weak=False)
+        post_delete.connect(self._on_change, sender=model_label, weak=False)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AI_CONFIG_REGISTRY_TTL', 300)
+
+    def _on_change(self, sender, **kwargs):
+        self.invalidate()
+        # Drop again once the write is visible to other connections
+        transaction.on_commit(self.invalidate)
+
+    def invalidate(self):
+        """Force the next lookup to reload from the database"""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def _load(self):
+        model = apps.get_model(self.model_label)
+        rows = model.objects.filter(is_active=True).order_by('name').values(
+            'id', 'name', 'model_type', 'api_endpoint', 'configuration_data'
+        )
+
+        by_id = {}
+        by_type = {}
+        for row in rows:
+            raw = row.pop('configuration_data')
+            try:
+                row['configuration'] = json.loads(raw) if raw else {}
+            except (TypeError, ValueError):
+                logger.warning(f"Invalid configuration JSON for {self.model_label} {row['id']}")
+                row['configuration'] = {}
+            by_id[row['id']] = row
+            by_type.setdefault(row['model_type'], []).append(row)
+
+        return {
+            'by_id': by_id,
+            'by_type': {model_type: tuple(entries) for model_type, entries in by_type.items()},
+        }
+
+    def _get_snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return snapshot
+
+        with self._load_lock:
+            # Another thread may have reloaded while we waited
+            if self._snapshot is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return self._snapshot
+            generation = self._generation
+            snapshot = self._load()
+            with self._lock:
+                if self._generation == generation:
+                    self._snapshot = snapshot
+                    self._loaded_at = time.monotonic()
+            return snapshot
+
+    def get_active(self, model_type):
+        """Get the active config for a model type (first by name), or None"""
+        entries = self._get_snapshot()['by_type'].get(model_type)
+        return entries[0] if entries else None
+
+    def get_active_configs(self, model_type):
+        """Get all active configs for a model type"""
+        return self._get_snapshot()['by_type'].get(model_type, ())
+
+    def get(self, config_id):
+        """Get an active config by id, or None"""
+        return self._get_snapshot()['by_id'].get(config_id)
+
+    def get_configuration(self, config_id):
+        """Get the parsed configuration of an active config"""
+        entry = self.get(config_id)
+        return entry['configuration'] if entry else {}
+
+    def has_active(self, *model_types):
+        """Check whether any of the given model types has an active config"""
+        by_type = self._get_snapshot()['by_type']
+        return any(model_type in by_type for model_type in model_types)
+
+
+# Active provider AI model configurations
+ai_model_configs = ModelConfigRegistry('provider.AIModelConfig')
@@ -0,0 +1,26 @@
+# common/utils/dates.py
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+
+def local_day_bounds(day, tz=None):
+    """
+    Convert a local calendar day into a half-open [start, end) range of
+    aware datetimes.
+
+    Filtering on ``time__gte=start, time__lt=end`` keeps the indexed column
+    bare, unlike ``time__date=day`` which wraps it in a DATE() cast.
+    """
+    return local_range_bounds(day, day, tz)
+
+
+def local_range_bounds(start_date, end_date, tz=None):
+    """
+    Convert an inclusive range of local calendar days into a half-open
+    [start, end) range of aware datetimes.
+    """
+    tz = tz or timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tz)
+    return start, end
@@ -0,0 +1,48 @@
+# common/utils/keyset.py
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(created_at, pk):
+    """Encode a (timestamp, id) position as an opaque URL-safe cursor"""
+    raw = f"{created_at.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into (timestamp, id), or None if it is invalid"""
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def keyset_page(queryset, cursor=None, limit=20, field='created_at'):
+    """
+    Get one page of a queryset, newest first, positioned after a cursor.
+
+    Orders by (field, id) descending so the read is a single range scan on
+    an index ending in ``field``; no OFFSET or COUNT is needed. Returns
+    ``(rows, next_cursor)`` where next_cursor is None on the last page.
+    """
+    if cursor:
+        position = decode_cursor(cursor)
+        if position:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{field}__lt': value}) |
+                Q(**{field: value, 'pk__lt': pk})
+            )
+
+    # Fetch one extra row to know whether there is a next page
+    rows = list(queryset.order_by(f'-{field}', '-pk')[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+
+    return rows, next_cursor
@@ -5,6 +5,7 @@ import hashlib
 import os
 import base64
 from django.conf import settings
+from common.utils.metrics import external_call
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,7 @@ class LDAPClient:
         
         self.conn = None
         
+    @external_call('ldap')
     def connect(self):
         """Establish a connection to the LDAP server."""
         try:
@@ -35,12 +37,14 @@ class LDAPClient:
             logger.error(f"LDAP connection error: {e}")
             return False
     
+    @external_call('ldap')
     def disconnect(self):
         """Close the LDAP connection."""
         if self.conn:
             self.conn.unbind_s()
             self.conn = None
     
+    @external_call('ldap')
     def user_exists(self, username):
         """Check if a user exists in LDAP."""
         if not self.conn:
@@ -58,6 +62,7 @@ class LDAPClient:
             logger.error(f"LDAP search error: {e}")
             return False
     
+    @external_call('ldap')
     def create_user(self, user_data):
         """
         Create a new user in LDAP.
@@ -131,6 +136,7 @@ class LDAPClient:
             logger.error(f"Error creating user in LDAP: {e}")
             return False
     
+    @external_call('ldap')
     def add_user_to_group(self, username, group_dn):
         """
         Add a user to an LDAP group.
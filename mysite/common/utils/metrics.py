@@ -0,0 +1,236 @@
+# common/utils/metrics.py
+"""
+In-process request metrics, exposed in the Prometheus text format at
+/metrics.
+
+RequestMetricsMiddleware (common.middleware) records, per resolved view,
+request latency, database queries and time, and time spent in external
+services. Calls to external services (LDAP, CalDAV, SMTP, ERPNext, AI
+endpoints) are timed with ``external_call``. Aggregates live in the
+worker process: scrape each worker, or read /metrics as one worker's
+sample.
+"""
+import bisect
+import contextvars
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from common.utils.audit import get_client_ip
+
+# Seconds
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Request methods recorded as-is; anything else is counted as 'OTHER' so
+# clients can't create label values
+HTTP_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE', 'CONNECT'})
+
+
+class RequestTimings:
+    """Queries and external time accumulated by the request being handled"""
+    __slots__ = ('queries', 'query_seconds', 'external')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.external = {}
+
+
+# Timings of the current request (set by common.middleware.RequestMetricsMiddleware)
+current_timings = contextvars.ContextVar('metrics_current_timings', default=None)
+
+# External services being timed in the current context, so nested calls aren't counted twice
+_active_services = contextvars.ContextVar('metrics_active_services', default=frozenset())
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Thread-safe aggregates of request and external call metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def latency_buckets(self):
+        return tuple(getattr(settings, 'METRICS_LATENCY_BUCKETS', DEFAULT_LATENCY_BUCKETS))
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}        # (view, method, status) -> count
+            self.latency = {}         # view -> Histogram
+            self.db_queries = {}      # view -> count
+            self.db_seconds = {}      # view -> seconds
+            self.view_external = {}   # (view, service) -> seconds
+            self.external = {}        # service -> Histogram
+            self.external_errors = {}  # service -> count
+
+    def observe_request(self, view, method, status, duration, timings):
+        with self._lock:
+            key = (view, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.get(view)
+            if histogram is None:
+                histogram = self.latency[view] = Histogram(self.latency_buckets)
+            histogram.observe(duration)
+            self.db_queries[view] = self.db_queries.get(view, 0) + timings.queries
+            self.db_seconds[view] = self.db_seconds.get(view, 0.0) + timings.query_seconds
+            for service, seconds in timings.external.items():
+                self.view_external[(view, service)] = self.view_external.get((view, service), 0.0) + seconds
+
+    def observe_external(self, service, duration, failed=False):
+        with self._lock:
+            histogram = self.external.get(service)
+            if histogram is None:
+                histogram = self.external[service] = Histogram(self.latency_buckets)
+            histogram.observe(duration)
+            if failed:
+                self.external_errors[service] = self.external_errors.get(service, 0) + 1
+
+    def _histogram_lines(self, name, histograms, label):
+        lines = []
+        for value, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(**{label: value, "le": bound})} {cumulative}')
+            lines.append(f'{name}_bucket{_labels(**{label: value, "le": "+Inf"})} {histogram.count}')
+            lines.append(f'{name}_sum{_labels(**{label: value})} {_number(histogram.sum)}')
+            lines.append(f'{name}_count{_labels(**{label: value})} {histogram.count}')
+        return lines
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            sections = [
+                ('http_requests_total', 'counter', 'Requests handled, by view, method and status.', [
+                    f'http_requests_total{_labels(view=view, method=method, status=status)} {count}'
+                    for (view, method, status), count in sorted(self.requests.items())
+                ]),
+                ('http_request_duration_seconds', 'histogram', 'Request latency by view.',
+                 self._histogram_lines('http_request_duration_seconds', self.latency, 'view')),
+                ('http_request_db_queries_total', 'counter', 'Database queries run by requests, by view.', [
+                    f'http_request_db_queries_total{_labels(view=view)} {count}'
+                    for view, count in sorted(self.db_queries.items())
+                ]),
+                ('http_request_db_duration_seconds_total', 'counter',
+                 'Time requests spent in database queries, by view.', [
+                     f'http_request_db_duration_seconds_total{_labels(view=view)} {_number(seconds)}'
+                     for view, seconds in sorted(self.db_seconds.items())
+                 ]),
+                ('http_request_external_duration_seconds_total', 'counter',
+                 'Time requests spent calling external services, by view and service.', [
+                     f'http_request_external_duration_seconds_total{_labels(view=view, service=service)} '
+                     f'{_number(seconds)}'
+                     for (view, service), seconds in sorted(self.view_external.items())
+                 ]),
+                ('external_call_duration_seconds', 'histogram', 'External service call latency by service.',
+                 self._histogram_lines('external_call_duration_seconds', self.external, 'service')),
+                ('external_call_errors_total', 'counter', 'External service calls that raised, by service.', [
+                    f'external_call_errors_total{_labels(service=service)} {count}'
+                    for service, count in sorted(self.external_errors.items())
+                ]),
+            ]
+        lines = []
+        for name, metric_type, help_text, samples in sections:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def time_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries towards the current request"""
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.query_seconds += time.perf_counter() - started
+
+
+@contextmanager
+def external_call(service):
+    """
+    Time a call to an external service, as a context manager or decorator.
+    Calls made while the same service is already being timed are not
+    counted again.
+    """
+    active = _active_services.get()
+    if service in active or not getattr(settings, 'METRICS_ENABLED', True):
+        yield
+        return
+
+    token = _active_services.set(active | {service})
+    started = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        duration = time.perf_counter() - started
+        _active_services.reset(token)
+        registry.observe_external(service, duration, failed)
+        timings = current_timings.get()
+        if timings is not None:
+            timings.external[service] = timings.external.get(service, 0.0) + duration
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Open to staff users, to scrapers sending
+    ``Authorization: Bearer <METRICS_BEARER_TOKEN>`` and to client
+    addresses in METRICS_ALLOWED_IPS (see get_client_ip). Nothing is
+    allowed by default: behind a same-host proxy every request comes
+    from loopback.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
+
+    token = getattr(settings, 'METRICS_BEARER_TOKEN', None)
+    scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and secrets.compare_digest(credentials.strip(), token):
+        return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
+
+    if get_client_ip(request) in getattr(settings, 'METRICS_ALLOWED_IPS', []):
+        return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
+    return HttpResponseForbidden("Metrics are only available to allowed clients.")
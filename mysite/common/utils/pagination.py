@@ -0,0 +1,63 @@
+# common/utils/pagination.py
+import logging
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_row_count(model, using='default'):
+    """
+    Get the planner's row estimate for a model's table, or None when the
+    backend has no cheap estimate (e.g. SQLite)
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            elif connection.vendor == 'mysql':
+                cursor.execute(
+                    "SELECT table_rows FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = %s", [table]
+                )
+            else:
+                return None
+            row = cursor.fetchone()
+    except Exception as e:
+        logger.warning(f"Could not estimate row count for {table}: {str(e)}")
+        return None
+
+    # PostgreSQL reports -1 for tables that were never analyzed
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator that can use the table's row estimate instead of COUNT(*).
+
+    Only meaningful for unfiltered querysets over large tables; below
+    ``threshold`` rows (or without an estimate) the exact count is used.
+    ``is_approximate`` tells templates to render the total as "about N".
+    """
+
+    def __init__(self, object_list, per_page, approximate=False, threshold=10000, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.approximate = approximate
+        self.threshold = threshold
+        self.is_approximate = False
+
+    @cached_property
+    def count(self):
+        if self.approximate and hasattr(self.object_list, 'model'):
+            estimate = estimate_row_count(self.object_list.model, using=self.object_list.db)
+            if estimate is not None and estimate >= self.threshold:
+                self.is_approximate = True
+                return estimate
+        return super().count
@@ -0,0 +1,61 @@
+# common/utils/zipstream.py
+import zipfile
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class _StreamSink:
+    """
+    Write-only, unseekable file object for ZipFile.
+
+    Without seek/tell ZipFile writes data descriptors after each member
+    instead of rewinding to patch local headers, so the archive can be
+    emitted front to back while it is being built.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Hand over (and forget) everything written so far"""
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def stream_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    """
+    Build a ZIP archive on the fly.
+
+    ``entries`` is an iterable of ``(name, chunks)`` where ``chunks`` is an
+    iterable of bytes; both are consumed lazily, so only the chunk being
+    compressed is held in memory. Yields the archive as bytes chunks,
+    suitable for StreamingHttpResponse or writing to a file.
+    """
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, mode='w', compression=compression) as archive:
+        for name, chunks in entries:
+            # Sizes are unknown up front; zip64 headers keep members > 2 GiB valid
+            with archive.open(name, mode='w', force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+def iter_file(file, chunk_size=FILE_CHUNK_SIZE):
+    """Read an open file in fixed-size chunks, closing it at the end"""
+    with file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
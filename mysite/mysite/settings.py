@@ -64,12 +64,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'common.middleware.RequestMetricsMiddleware',  # Latency/DB/external timings per view; outermost
     'django.middleware.security.SecurityMiddleware',
+    'common.middleware.CompressionMiddleware',  # Brotli/gzip; outermost body-rewriting middleware
+    'api.middleware.LegacyApiAliasMiddleware',  # Legacy /api/ paths -> v1; before CommonMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'common.middleware.AuditLogMiddleware',  # Flushes buffered audit events
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_browser_reload.middleware.BrowserReloadMiddleware',  # Enable auto-reload
@@ -218,6 +222,28 @@ AUTHENTICATION_BACKENDS = [
 LOGIN_URL = 'https://auth.isnord.ca/'
 LOGIN_REDIRECT_URL = '/provider-dashboard/'
 
+# =========================================================================
+# CACHE CONFIGURATION
+# =========================================================================
+
+# Token lookups and rate limits must be shared by every worker, so
+# production points REDIS_URL at Redis. Without it each process gets its
+# own local memory cache, which is only suitable for development.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # =========================================================================
 # INTERNATIONALIZATION
 # =========================================================================
@@ -242,6 +268,19 @@ STATICFILES_DIRS = [
     BASE_DIR / "theme_name" / "static_src",
 ]
 
+# collectstatic writes .br/.gz variants next to each compressible file
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "common.staticfiles.PrecompressedStaticFilesStorage"},
+}
+STATIC_PRECOMPRESS_MIN_SIZE = 256  # bytes
+STATIC_ZOPFLI_ITERATIONS = 15
+
+# Serve STATIC_URL from STATIC_ROOT through Django, preferring the
+# precompressed variants, when no front-end server handles it
+STATIC_SERVE_PRECOMPRESSED = not DEBUG
+STATIC_MAX_AGE = 3600  # seconds
+
 # =========================================================================
 # EMAIL CONFIGURATION
 # =========================================================================
@@ -286,6 +325,32 @@ ERP_API_KEY = "e7e440ba311946c"
 ERP_API_SECRET = "dc461decd332261"
 ERP_INTEGRATION_ENABLED = True
 
+# Seconds a worker may serve its cached active AI model configs before
+# reloading them (saves in the same process invalidate immediately)
+AI_CONFIG_REGISTRY_TTL = 300
+
+# Audit events are buffered and bulk-written at the end of each request,
+# when this many are queued, or every AUDIT_LOG_FLUSH_INTERVAL seconds
+AUDIT_LOG_BUFFER_SIZE = 500
+AUDIT_LOG_FLUSH_INTERVAL = 5
+
+# Reverse proxies in front of the app that append to X-Forwarded-For.
+# Client IPs (audit log) are read from the hop the outermost proxy saw;
+# 0 ignores the header and uses REMOTE_ADDR.
+TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+
+# Raw AIUsageLog rows older than this are purged (in chunks) by
+# rollup_ai_usage --purge once they are folded into the rollup tables
+AI_USAGE_LOG_RETENTION_DAYS = 90
+AI_USAGE_PURGE_CHUNK_SIZE = 5000
+
+# Minimum similarity (0-1) for two patients to be flagged as likely duplicates
+PATIENT_DUPLICATE_THRESHOLD = 0.85
+
+# Patient record exports estimated larger than this are built in the
+# background by the process_data_exports command instead of streamed
+PATIENT_EXPORT_STREAM_MAX_BYTES = 100 * 1024 * 1024
+
 CONTACT_FORM_RECIPIENT = 'admin@example.com'
 DEFAULT_FROM_EMAIL = 'noreply@example.com'
 
@@ -394,18 +459,32 @@ except ImportError:
 # Excerpt for settings.py - REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed JSON when installed, stdlib otherwise (see api.renderers)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # Token buckets per client and scope (see api.throttling, API_RATE_LIMITS)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.TokenBucketThrottle',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'api.versioning.VersionedPagination',
     'PAGE_SIZE': 10,
     
@@ -415,3 +494,77 @@ REST_FRAMEWORK = {
     'ALLOWED_VERSIONS': ['v1'],
     'VERSION_PARAM': 'version',
 }
+
+# Per-user API response cache (api.response_cache). Entries are invalidated
+# by model signals; the timeout only bounds staleness from changes made
+# outside the ORM. Use a shared cache backend in production so the
+# single-flight lock and hit/miss counters span workers.
+API_RESPONSE_CACHE_ENABLED = True
+API_RESPONSE_CACHE_TIMEOUT = 300
+API_RESPONSE_CACHE_WAIT = 5  # seconds to wait for another request's recomputation
+
+# Largest batch accepted by the bulk/ and bulk-status/ API actions
+API_BULK_MAX_ITEMS = 500
+
+# Delta sync (/api/v1/sync/, see api.sync). Changes younger than the settle
+# window are held back so rows from transactions still in flight aren't
+# skipped by a client's cursor.
+SYNC_PAGE_SIZE = 200
+SYNC_MAX_PAGE_SIZE = 1000
+SYNC_SETTLE_SECONDS = 2
+
+# On-the-fly response compression (common.middleware.CompressionMiddleware)
+COMPRESSION_ENABLED = True
+COMPRESSION_MIN_SIZE = 512  # bytes; smaller bodies are sent as is
+COMPRESSION_BROTLI_QUALITY = 5  # favour CPU over ratio for dynamic responses
+COMPRESSION_GZIP_LEVEL = 6
+# HTML pages mix reflected input with CSRF tokens and PHI, so compressing
+# them exposes those to BREACH. When turned on they are gzip'd with a
+# random length header padding of up to COMPRESSION_HTML_MAX_RANDOM_BYTES.
+COMPRESSION_HTML = False
+COMPRESSION_HTML_MAX_RANDOM_BYTES = 100
+COMPRESSION_STATS_ENABLED = True
+
+# API tokens (api.authentication). Tokens older than API_TOKEN_TTL seconds
+# are rejected; token-auth/ hands out a fresh one and token-auth/rotate/
+# replaces a live one. None (the default) disables expiry: turning it on
+# rejects every existing token older than the TTL at once, so give clients
+# time to rotate first. Lookups are cached for API_TOKEN_CACHE_TIMEOUT in
+# the API_TOKEN_CACHE_ALIAS cache, only when it is shared between workers
+# (see the api.W001 check).
+API_TOKEN_TTL = None  # e.g. 60 * 60 * 24 * 30
+API_TOKEN_CACHE_TIMEOUT = 300
+API_TOKEN_CACHE_ALIAS = 'default'
+
+# API rate limits (api.throttling.TokenBucketThrottle): per client and
+# scope, a bucket of `capacity` requests refilled at `rate` per second.
+# Buckets live in the default cache: without REDIS_URL each worker keeps
+# its own, so the effective limit is multiplied by the worker count
+# (system check api.W002).
+API_RATE_LIMIT_ENABLED = True
+API_RATE_LIMITS = {
+    'read': {'capacity': 300, 'rate': 10},
+    'search': {'capacity': 30, 'rate': 1},   # reads with ?search=
+    'write': {'capacity': 60, 'rate': 2},
+}
+
+# Legacy unversioned API paths are served as their v1 equivalents (see
+# api.legacy); requests per legacy path are counted at
+# /api/v1/legacy-api-stats/ so unused ones can be retired.
+LEGACY_API_STATS_ENABLED = True
+
+# Precomputed OpenAPI schema and API reference (api.schema), built per
+# deploy with `manage.py generate_api_docs --artifacts` and regenerated
+# on first use if the API code changed since.
+API_DOCS_ROOT = STATIC_ROOT / 'api-docs'
+API_DOCS_SOURCE_DIRS = ['api', 'common', 'patient', 'provider']
+
+# Request metrics (common.utils.metrics), scraped from /metrics by
+# Prometheus. Aggregates are per worker process. The endpoint is open to
+# staff users, to METRICS_BEARER_TOKEN and to METRICS_ALLOWED_IPS (client
+# addresses, resolved through TRUSTED_PROXY_COUNT). Loopback isn't allowed
+# by default since the reverse proxy connects from it.
+METRICS_ENABLED = True
+METRICS_BEARER_TOKEN = os.environ.get('METRICS_BEARER_TOKEN') or None
+METRICS_ALLOWED_IPS = [ip for ip in os.environ.get('METRICS_ALLOWED_IPS', '').split(',') if ip]
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
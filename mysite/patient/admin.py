@@ -1,5 +1,23 @@
 from django.contrib import admin
-from .models import PrescriptionRequest
+from .models import PatientDataExport, PotentialDuplicate, PrescriptionRequest
 
 # Register your models here
 admin.site.register(PrescriptionRequest)
+
+
+@admin.register(PotentialDuplicate)
+class PotentialDuplicateAdmin(admin.ModelAdmin):
+    list_display = ('patient_a', 'patient_b', 'score', 'matched_on', 'status', 'updated_at')
+    list_filter = ('status',)
+    list_editable = ('status',)
+    list_select_related = ('patient_a__user', 'patient_b__user')
+    raw_id_fields = ('patient_a', 'patient_b')
+
+
+@admin.register(PatientDataExport)
+class PatientDataExportAdmin(admin.ModelAdmin):
+    list_display = ('id', 'patient', 'format', 'status', 'size', 'requested_by', 'created_at', 'completed_at')
+    list_filter = ('status', 'format')
+    list_select_related = ('patient__user', 'requested_by')
+    raw_id_fields = ('patient', 'requested_by')
+    readonly_fields = ('size', 'error', 'created_at', 'started_at', 'completed_at')
@@ -0,0 +1,201 @@
+# patient/deduplication.py
+from datetime import date, datetime
+
+from .normalization import normalize_search_text
+
+SOUNDEX_CODES = {
+    letter: digit
+    for digit, letters in (('1', 'bfpv'), ('2', 'cgjkqsxz'), ('3', 'dt'), ('4', 'l'), ('5', 'mn'), ('6', 'r'))
+    for letter in letters
+}
+
+# Patient columns holding the precomputed blocking keys; two patients are
+# only ever compared when they share at least one of them
+BLOCKING_FIELDS = ['dedupe_name_key', 'dedupe_dob_key', 'dedupe_ohip_key']
+
+OHIP_BLOCK_LENGTH = 8
+
+
+def soundex(value):
+    """American Soundex code of a name, e.g. 'Robert' -> 'R163'; '' without letters"""
+    letters = [char for char in normalize_search_text(value) if 'a' <= char <= 'z']
+    if not letters:
+        return ''
+
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w don't separate letters with the same code
+        if char not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def as_date(value):
+    """Coerce a date, datetime or ISO string to a date (None if empty)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def blocking_keys(first_name, last_name, date_of_birth, ohip_normalized):
+    """
+    Blocking keys for a patient:
+
+    - dedupe_name_key: surname Soundex + birth year (first-name typos)
+    - dedupe_dob_key: given-name Soundex + full birth date (surname changes)
+    - dedupe_ohip_key: leading OHIP digits (version code/trailing digit typos)
+    """
+    birth_date = as_date(date_of_birth)
+    surname_code = soundex(last_name)
+    given_code = soundex(first_name)
+    ohip = ohip_normalized or ''
+
+    return {
+        'dedupe_name_key': f"{surname_code}{birth_date.year}" if surname_code and birth_date else '',
+        'dedupe_dob_key': f"{given_code}{birth_date:%Y%m%d}" if given_code and birth_date else '',
+        'dedupe_ohip_key': ohip[:OHIP_BLOCK_LENGTH] if ohip[:OHIP_BLOCK_LENGTH].isdigit() and len(ohip) >= OHIP_BLOCK_LENGTH else '',
+    }
+
+
+def jaro_winkler(first, second):
+    """Jaro-Winkler similarity of two strings in [0, 1]"""
+    if not first or not second:
+        return 0.0
+    if first == second:
+        return 1.0
+
+    window = max(max(len(first), len(second)) // 2 - 1, 0)
+    first_matched = [False] * len(first)
+    second_matched = [False] * len(second)
+    matches = 0
+    for i, char in enumerate(first):
+        for j in range(max(0, i - window), min(len(second), i + window + 1)):
+            if not second_matched[j] and second[j] == char:
+                first_matched[i] = second_matched[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+
+    first_chars = [char for char, matched in zip(first, first_matched) if matched]
+    second_chars = [char for char, matched in zip(second, second_matched) if matched]
+    transpositions = sum(a != b for a, b in zip(first_chars, second_chars)) / 2
+
+    jaro = (matches / len(first) + matches / len(second) + (matches - transpositions) / matches) / 3
+
+    prefix = 0
+    for a, b in zip(first[:4], second[:4]):
+        if a != b:
+            break
+        prefix += 1
+    return jaro + prefix * 0.1 * (1 - jaro)
+
+
+def _name_similarity(a, b):
+    """(surname, given name) similarity, allowing the two to be swapped"""
+    straight = (jaro_winkler(a['search_last_name'], b['search_last_name']),
+                jaro_winkler(a['search_first_name'], b['search_first_name']))
+    swapped = (jaro_winkler(a['search_last_name'], b['search_first_name']),
+               jaro_winkler(a['search_first_name'], b['search_last_name']))
+    return straight if sum(straight) >= sum(swapped) else swapped
+
+
+def _dob_similarity(a, b):
+    first, second = as_date(a['date_of_birth']), as_date(b['date_of_birth'])
+    if first is None or second is None:
+        return None
+    if first == second:
+        return 1.0
+    if first.year == second.year and (first.month, first.day) == (second.day, second.month):
+        # Day and month entered the wrong way round
+        return 0.8
+    same = (first.year == second.year) + (first.month == second.month) + (first.day == second.day)
+    return 0.5 if same == 2 else 0.0
+
+
+def _ohip_similarity(a, b):
+    first, second = a['ohip_normalized'] or '', b['ohip_normalized'] or ''
+    if not first[:10].isdigit() or not second[:10].isdigit():
+        return None
+    if first == second:
+        return 1.0
+    if first[:10] == second[:10]:
+        # Same card, different version code
+        return 0.9
+    differences = sum(x != y for x, y in zip(first[:10], second[:10]))
+    return 0.7 if differences == 1 else 0.0
+
+
+def _exact(field):
+    def similarity(a, b):
+        if not a[field] or not b[field]:
+            return None
+        return 1.0 if a[field] == b[field] else 0.0
+    return similarity
+
+
+# (name, weight) of each comparison feature; missing values drop out of
+# both the score and its normaliser
+FEATURE_WEIGHTS = [
+    ('last_name', 0.25),
+    ('first_name', 0.20),
+    ('date_of_birth', 0.25),
+    ('ohip', 0.20),
+    ('phone', 0.05),
+    ('email', 0.05),
+]
+
+
+def feature_columns(pairs):
+    """
+    Compare every (a, b) record pair, one column of feature values per
+    FEATURE_WEIGHTS entry
+    """
+    names = [_name_similarity(a, b) for a, b in pairs]
+    return [
+        [last for last, _ in names],
+        [first for _, first in names],
+        [_dob_similarity(a, b) for a, b in pairs],
+        [_ohip_similarity(a, b) for a, b in pairs],
+        [_exact('primary_phone_normalized')(a, b) for a, b in pairs],
+        [_exact('search_email')(a, b) for a, b in pairs],
+    ]
+
+
+def score_pairs(pairs):
+    """
+    Score candidate record pairs in [0, 1], the FEATURE_WEIGHTS weighted
+    mean of each pair's features.
+
+    This is plain Python, one pair at a time; batching only lets the
+    caller hand over many pairs in one call.
+    """
+    if not pairs:
+        return []
+
+    weights = [weight for _, weight in FEATURE_WEIGHTS]
+    scores = []
+    for values in zip(*feature_columns(pairs)):
+        total = weight_sum = 0.0
+        for weight, value in zip(weights, values):
+            if value is None:
+                continue
+            total += weight * value
+            weight_sum += weight
+        scores.append(round(total / weight_sum, 4) if weight_sum else 0.0)
+    return scores
+
+
+def shared_blocks(a, b):
+    """Names of the blocking keys two records have in common"""
+    return [field for field in BLOCKING_FIELDS if a[field] and a[field] == b[field]]
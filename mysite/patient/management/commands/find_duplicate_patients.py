@@ -0,0 +1,43 @@
+# patient/management/commands/find_duplicate_patients.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from patient.services.duplicate_service import DuplicatePatientService
+
+
+class Command(BaseCommand):
+    help = 'Scan all patients for likely duplicates and record them for review'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-score',
+            type=float,
+            default=None,
+            help='Minimum similarity (0-1) to record; defaults to PATIENT_DUPLICATE_THRESHOLD',
+        )
+        parser.add_argument(
+            '--max-block-size',
+            type=int,
+            default=DuplicatePatientService.MAX_BLOCK_SIZE,
+            help='Skip blocking keys shared by more patients than this',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        result = DuplicatePatientService.find_duplicates(
+            min_score=options['min_score'],
+            max_block_size=options['max_block_size']
+        )
+
+        if not result['success']:
+            self.stdout.write(self.style.ERROR(f"Duplicate scan failed: {result['error']}"))
+            return
+
+        self.stdout.write(
+            f"Compared {result['pairs_scored']} pair(s) in {result['blocks']} block(s) "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        if result['skipped_blocks']:
+            self.stdout.write(self.style.WARNING(f"Skipped {result['skipped_blocks']} oversized block(s)"))
+        self.stdout.write(self.style.SUCCESS(f"Recorded {result['duplicates']} likely duplicate pair(s)"))
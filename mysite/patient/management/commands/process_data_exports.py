@@ -0,0 +1,37 @@
+# patient/management/commands/process_data_exports.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from patient.services.export_service import PatientExportService
+
+
+class Command(BaseCommand):
+    help = 'Build queued patient record exports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Seconds between polls for new exports. 0 processes the queue once and exits.',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Exports built per poll',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        while True:
+            started = time.monotonic()
+            processed = PatientExportService.process_pending(limit=options['limit'])
+            if processed or interval <= 0:
+                self.stdout.write(f"Processed {processed} export(s) in {time.monotonic() - started:.2f}s")
+
+            if interval <= 0:
+                break
+            time.sleep(max(0, interval - (time.monotonic() - started)))
@@ -2,6 +2,7 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User, Group
 from patient.models import Patient
+from patient.services.duplicate_service import DuplicatePatientService
 from theme_name.repositories import PatientRepository
 from common.utils.ldap_client import LDAPClient
 import logging
@@ -88,6 +89,11 @@ class Command(BaseCommand):
                     
                     self.stdout.write(self.style.SUCCESS(f"Created patient profile for: {user.username}"))
                     
+                    for duplicate in DuplicatePatientService.check_patient(patient):
+                        self.stdout.write(self.style.WARNING(
+                            f"Possible duplicate of patient {duplicate['patient_id']} (score {duplicate['score']:.2f})"
+                        ))
+                    
                     # Create LDAP entry if requested
                     if create_ldap:
                         self._create_ldap_user(user, repo_patient)
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+from patient.normalization import normalize_ohip, normalize_search_text
+
+BATCH_SIZE = 1000
+SEARCH_FIELDS = ['search_first_name', 'search_last_name', 'search_email', 'ohip_normalized']
+
+
+def backfill_search_columns(apps, schema_editor):
+    Patient = apps.get_model('patient', 'Patient')
+
+    batch = []
+    for patient in Patient.objects.select_related('user').iterator(chunk_size=BATCH_SIZE):
+        patient.search_first_name = normalize_search_text(patient.user.first_name)[:150]
+        patient.search_last_name = normalize_search_text(patient.user.last_name)[:150]
+        patient.search_email = normalize_search_text(patient.user.email)[:254]
+        patient.ohip_normalized = normalize_ohip(patient.ohip_number)[:12]
+        batch.append(patient)
+        if len(batch) >= BATCH_SIZE:
+            Patient.objects.bulk_update(batch, SEARCH_FIELDS)
+            batch = []
+
+    if batch:
+        Patient.objects.bulk_update(batch, SEARCH_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patient', '0003_alter_prescriptionrequest_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='search_first_name',
+            field=models.CharField(blank=True, editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='search_last_name',
+            field=models.CharField(blank=True, editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='search_email',
+            field=models.CharField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='ohip_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['search_last_name', 'search_first_name'], name='patient_pat_search__1b7e2a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['search_first_name'], name='patient_pat_search__9c40d5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['search_email'], name='patient_pat_search__e62f18_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['ohip_normalized'], name='patient_pat_ohip_no_3a5c97_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.1.6 on 2026-10-19 15:10
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+from patient.normalization import normalize_ohip, normalize_phone
+
+BATCH_SIZE = 1000
+IDENTITY_FIELDS = ['ohip_normalized', 'primary_phone_normalized', 'alternate_phone_normalized']
+
+
+def backfill_identity_columns(apps, schema_editor):
+    Patient = apps.get_model('patient', 'Patient')
+
+    seen = defaultdict(list)
+    batch = []
+    for patient in Patient.objects.only('id', 'ohip_number', 'primary_phone', 'alternate_phone').iterator(chunk_size=BATCH_SIZE):
+        patient.ohip_normalized = normalize_ohip(patient.ohip_number)[:12] or None
+        patient.primary_phone_normalized = normalize_phone(patient.primary_phone)
+        patient.alternate_phone_normalized = normalize_phone(patient.alternate_phone)
+        if patient.ohip_normalized:
+            seen[patient.ohip_normalized].append(patient.id)
+        batch.append(patient)
+        if len(batch) >= BATCH_SIZE:
+            Patient.objects.bulk_update(batch, IDENTITY_FIELDS)
+            batch = []
+
+    if batch:
+        Patient.objects.bulk_update(batch, IDENTITY_FIELDS)
+
+    # The same card entered in two formats is a duplicate patient; it has to
+    # be merged by hand before the unique index can be built
+    duplicates = {ohip: ids for ohip, ids in seen.items() if len(ids) > 1}
+    if duplicates:
+        details = '; '.join(f"{ohip}: patients {ids}" for ohip, ids in sorted(duplicates.items()))
+        raise RuntimeError(f"Duplicate OHIP numbers after normalization, merge these patients first: {details}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patient', '0004_patient_search_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='patient',
+            name='patient_pat_ohip_no_3a5c97_idx',
+        ),
+        migrations.AlterField(
+            model_name='patient',
+            name='ohip_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='primary_phone_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='alternate_phone_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.RunPython(backfill_identity_columns, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='patient',
+            name='ohip_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['primary_phone_normalized'], name='patient_pat_primary_7f3c21_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['alternate_phone_normalized'], name='patient_pat_alterna_d84e06_idx'),
+        ),
+    ]
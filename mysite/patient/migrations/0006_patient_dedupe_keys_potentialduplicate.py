@@ -0,0 +1,83 @@
+# Generated by Django 5.1.6 on 2026-10-19 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from patient.deduplication import BLOCKING_FIELDS, blocking_keys
+
+BATCH_SIZE = 1000
+
+
+def backfill_blocking_keys(apps, schema_editor):
+    Patient = apps.get_model('patient', 'Patient')
+
+    batch = []
+    for patient in Patient.objects.select_related('user').iterator(chunk_size=BATCH_SIZE):
+        keys = blocking_keys(
+            patient.user.first_name, patient.user.last_name, patient.date_of_birth, patient.ohip_normalized
+        )
+        for field, value in keys.items():
+            setattr(patient, field, value)
+        batch.append(patient)
+        if len(batch) >= BATCH_SIZE:
+            Patient.objects.bulk_update(batch, BLOCKING_FIELDS)
+            batch = []
+
+    if batch:
+        Patient.objects.bulk_update(batch, BLOCKING_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patient', '0005_patient_identity_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='dedupe_name_key',
+            field=models.CharField(blank=True, editable=False, max_length=8),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='dedupe_dob_key',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='dedupe_ohip_key',
+            field=models.CharField(blank=True, editable=False, max_length=8),
+        ),
+        migrations.RunPython(backfill_blocking_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['dedupe_name_key'], name='patient_pat_dedupe__2c8f41_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['dedupe_dob_key'], name='patient_pat_dedupe__7a1d93_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['dedupe_ohip_key'], name='patient_pat_dedupe__e4b605_idx'),
+        ),
+        migrations.CreateModel(
+            name='PotentialDuplicate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('matched_on', models.CharField(blank=True, max_length=100)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('merged', 'Merged'), ('dismissed', 'Not a duplicate')], default='open', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('patient_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='patient.patient')),
+                ('patient_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='patient.patient')),
+            ],
+            options={
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['status', '-score'], name='patient_pot_status_6a0e3b_idx')],
+                'constraints': [models.UniqueConstraint(fields=('patient_a', 'patient_b'), name='patient_potentialduplicate_pair_uniq')],
+            },
+        ),
+    ]
@@ -12,6 +12,68 @@ from .validators import (
     validate_dosage,
     validate_postal_code
 )
+from .deduplication import blocking_keys
+from .normalization import normalize_ohip, normalize_phone, normalize_search_text, prefix_q
+
+class PatientQuerySet(models.QuerySet):
+    """Indexed search over the normalized shadow columns"""
+    
+    def search(self, query):
+        """
+        Prefix search on name, email or OHIP number, or an exact phone number.
+        
+        A single term matches the start of the first name, last name, email
+        or OHIP number; two or more terms match first and last name in
+        either order ('jane do' / 'do jane').
+        """
+        term = normalize_search_text(query)
+        if not term:
+            return self
+        
+        ohip = normalize_ohip(term)
+        # Only a complete phone number is matched (exactly) against phones
+        phone = '' if any(char.isalpha() for char in term) else normalize_phone(term)
+        if ohip[:1].isdigit() or phone:
+            condition = models.Q()
+            if ohip[:1].isdigit():
+                condition |= prefix_q('ohip_normalized', ohip)
+            if phone:
+                condition |= self._phone_q(phone)
+            return self.filter(condition)
+        if '@' in term:
+            return self.filter(prefix_q('search_email', term))
+        
+        parts = term.split(' ')
+        if len(parts) == 1:
+            return self.filter(
+                prefix_q('search_last_name', term) |
+                prefix_q('search_first_name', term) |
+                prefix_q('search_email', term)
+            )
+        first, last = parts[0], ' '.join(parts[1:])
+        return self.filter(
+            (prefix_q('search_first_name', first) & prefix_q('search_last_name', last)) |
+            (prefix_q('search_first_name', last) & prefix_q('search_last_name', first))
+        )
+    
+    def by_ohip(self, value):
+        """Exact OHIP match as a point lookup on the unique normalized column"""
+        ohip = normalize_ohip(value)
+        return self.filter(ohip_normalized=ohip) if ohip else self.none()
+    
+    def by_phone(self, value):
+        """Exact match on the primary or alternate phone number"""
+        phone = normalize_phone(value)
+        return self.filter(self._phone_q(phone)) if phone else self.none()
+    
+    @staticmethod
+    def _phone_q(phone):
+        return models.Q(primary_phone_normalized=phone) | models.Q(alternate_phone_normalized=phone)
+    
+    def in_name_order(self):
+        """Order by the indexed (last name, first name) search columns"""
+        return self.order_by('search_last_name', 'search_first_name', 'id')
+
 
 class Patient(models.Model):
     """SECURED: Patient model with comprehensive validation"""
@@ -102,14 +164,67 @@ class Patient(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     erpnext_id = models.CharField(max_length=50, blank=True)
     
+    # Normalized shadow columns for indexed search and identity lookups
+    # (see refresh_search_fields)
+    search_first_name = models.CharField(max_length=150, blank=True, editable=False)
+    search_last_name = models.CharField(max_length=150, blank=True, editable=False)
+    search_email = models.CharField(max_length=254, blank=True, editable=False)
+    # NULL rather than '' when missing so the unique index ignores it
+    ohip_normalized = models.CharField(max_length=12, null=True, blank=True, unique=True, editable=False)
+    primary_phone_normalized = models.CharField(max_length=10, blank=True, editable=False)
+    alternate_phone_normalized = models.CharField(max_length=10, blank=True, editable=False)
+    # Duplicate-detection blocking keys (see patient.deduplication.blocking_keys)
+    dedupe_name_key = models.CharField(max_length=8, blank=True, editable=False)
+    dedupe_dob_key = models.CharField(max_length=12, blank=True, editable=False)
+    dedupe_ohip_key = models.CharField(max_length=8, blank=True, editable=False)
+    
+    objects = PatientQuerySet.as_manager()
+    
     class Meta:
         ordering = ['user__last_name', 'user__first_name']
         indexes = [
             models.Index(fields=['ohip_number']),
             models.Index(fields=['user']),
             models.Index(fields=['primary_provider']),
+            models.Index(fields=['search_last_name', 'search_first_name'], name='patient_pat_search__1b7e2a_idx'),
+            models.Index(fields=['search_first_name'], name='patient_pat_search__9c40d5_idx'),
+            models.Index(fields=['search_email'], name='patient_pat_search__e62f18_idx'),
+            models.Index(fields=['primary_phone_normalized'], name='patient_pat_primary_7f3c21_idx'),
+            models.Index(fields=['alternate_phone_normalized'], name='patient_pat_alterna_d84e06_idx'),
+            models.Index(fields=['dedupe_name_key'], name='patient_pat_dedupe__2c8f41_idx'),
+            models.Index(fields=['dedupe_dob_key'], name='patient_pat_dedupe__7a1d93_idx'),
+            models.Index(fields=['dedupe_ohip_key'], name='patient_pat_dedupe__e4b605_idx'),
         ]
     
+    SEARCH_FIELDS = [
+        'search_first_name', 'search_last_name', 'search_email',
+        'ohip_normalized', 'primary_phone_normalized', 'alternate_phone_normalized',
+        'dedupe_name_key', 'dedupe_dob_key', 'dedupe_ohip_key',
+    ]
+    
+    def refresh_search_fields(self):
+        """Recompute the normalized shadow columns and blocking keys"""
+        user = self.user if self.user_id else None
+        self.search_first_name = normalize_search_text(user.first_name if user else '')[:150]
+        self.search_last_name = normalize_search_text(user.last_name if user else '')[:150]
+        self.search_email = normalize_search_text(user.email if user else '')[:254]
+        self.ohip_normalized = normalize_ohip(self.ohip_number)[:12] or None
+        self.primary_phone_normalized = normalize_phone(self.primary_phone)
+        self.alternate_phone_normalized = normalize_phone(self.alternate_phone)
+        for field, value in blocking_keys(
+            user.first_name if user else '', user.last_name if user else '',
+            self.date_of_birth, self.ohip_normalized
+        ).items():
+            setattr(self, field, value)
+    
+    def save(self, *args, **kwargs):
+        self.refresh_search_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            # updated_at is the API's change validator, so partial saves bump it too
+            kwargs['update_fields'] = set(update_fields) | set(self.SEARCH_FIELDS) | {'updated_at'}
+        super().save(*args, **kwargs)
+    
     @property
     def full_name(self):
         """Get patient's full name"""
@@ -166,6 +281,69 @@ class Patient(models.Model):
     def __str__(self):
         return f"{self.full_name} (OHIP: {self.ohip_number})"
 
+class PotentialDuplicate(models.Model):
+    """A pair of patients the duplicate detector thinks may be the same person"""
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('merged', 'Merged'),
+        ('dismissed', 'Not a duplicate'),
+    ]
+    
+    # patient_a always has the lower id so each pair is stored once
+    patient_a = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='+')
+    patient_b = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    matched_on = models.CharField(max_length=100, blank=True)  # Comma-separated blocking keys
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-score']
+        constraints = [
+            models.UniqueConstraint(fields=['patient_a', 'patient_b'], name='patient_potentialduplicate_pair_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-score'], name='patient_pot_status_6a0e3b_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Possible duplicate: {self.patient_a_id} / {self.patient_b_id} ({self.score:.2f})"
+
+class PatientDataExport(models.Model):
+    """A full record export (access request) built in the background"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+    
+    FORMAT_CHOICES = [
+        ('ndjson', 'NDJSON'),
+        ('csv', 'CSV'),
+    ]
+    
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='data_exports')
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='ndjson')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    file = models.FileField(upload_to='exports/%Y/%m/', blank=True)
+    size = models.BigIntegerField(default=0)  # Size in bytes
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='patient_pat_status_0d4a7e_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Export {self.id} for patient {self.patient_id} ({self.status})"
+
 class PrescriptionRequest(models.Model):
     """SECURED: Prescription request with validation"""
     STATUS_CHOICES = [
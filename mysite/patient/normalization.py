@@ -0,0 +1,59 @@
+# patient/normalization.py
+import re
+import unicodedata
+
+from django.db.models import Q
+
+# The highest code point, so under a code point collation [prefix,
+# prefix + PREFIX_END) covers exactly the values starting with prefix
+PREFIX_END = '\U0010ffff'
+
+
+def normalize_search_text(value):
+    """
+    Normalize a name or email for indexed prefix search: accents removed,
+    case-folded and whitespace collapsed (e.g. ' José  Núñez' -> 'jose nunez')
+    """
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(value))
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+def normalize_ohip(value):
+    """
+    Normalize an OHIP number to the canonical form validate_ohip_number
+    checks, e.g. '1234-567-890-ab' -> '1234567890AB'
+    """
+    if not value:
+        return ''
+    return re.sub(r'[\s\-]', '', str(value)).upper()
+
+
+def normalize_phone(value):
+    """
+    Normalize a phone number to the 10 bare digits validate_canadian_phone
+    accepts, e.g. '+1 (416) 555-1234' -> '4165551234'; '' if it has no
+    such form
+    """
+    if not value:
+        return ''
+    digits = re.sub(r'\D', '', str(value))
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else ''
+
+
+def prefix_q(field, prefix):
+    """
+    Match values of an (already normalized) column starting with prefix.
+
+    Expressed as a half-open range rather than LIKE so a plain B-tree index
+    on the column is used. This assumes the column compares by code point:
+    SQLite's default BINARY collation, or a "C"/binary collation elsewhere.
+    Under a linguistic collation (e.g. PostgreSQL's en_US.UTF-8) the range
+    can miss matching rows; use ``__startswith`` with a varchar_pattern_ops
+    index there instead.
+    """
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + PREFIX_END})
@@ -1,9 +1,11 @@
 # patient/services/__init__.py
 from .appointment_service import AppointmentService
 from .dashboard_service import DashboardService
+from .duplicate_service import DuplicatePatientService
 from .help_service import HelpService
 from .prescription_service import PrescriptionService
 from .profile_service import ProfileService
 from .search_service import SearchService
 from .video_service import VideoService
 from .email_service import EmailService
+from .export_service import PatientExportService
@@ -0,0 +1,186 @@
+# patient/services/duplicate_service.py
+import logging
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from patient.deduplication import BLOCKING_FIELDS, score_pairs, shared_blocks
+from patient.models import Patient, PotentialDuplicate
+
+logger = logging.getLogger(__name__)
+
+RECORD_FIELDS = [
+    'id', 'search_first_name', 'search_last_name', 'date_of_birth', 'ohip_normalized',
+    'primary_phone_normalized', 'search_email',
+] + BLOCKING_FIELDS
+
+
+class DuplicatePatientService:
+    """
+    Duplicate-patient detection.
+
+    Patients are only compared with others sharing a precomputed blocking
+    key (see patient.deduplication), so ``check_patient()`` is one indexed
+    query plus a handful of comparisons and ``find_duplicates()`` costs
+    O(n) reads plus the pairs inside each block rather than O(n^2).
+    Likely duplicates are recorded as PotentialDuplicate rows for review.
+    """
+
+    CANDIDATE_LIMIT = 50  # candidates fetched by the inline check
+    MAX_BLOCK_SIZE = 200  # larger blocks are too unselective to compare
+    SCORE_BATCH_SIZE = 5000  # pairs scored per batch by the full scan
+
+    @staticmethod
+    def get_threshold():
+        return getattr(settings, 'PATIENT_DUPLICATE_THRESHOLD', 0.85)
+
+    @staticmethod
+    def _record(patient):
+        return {field: getattr(patient, field) for field in RECORD_FIELDS}
+
+    @staticmethod
+    def find_candidates(patient, limit=None):
+        """Other patients sharing a blocking key or phone number with this one"""
+        condition = Q()
+        for field in BLOCKING_FIELDS:
+            value = getattr(patient, field)
+            if value:
+                condition |= Q(**{field: value})
+        if patient.primary_phone_normalized:
+            condition |= Q(primary_phone_normalized=patient.primary_phone_normalized)
+        if not condition:
+            return []
+
+        return list(
+            Patient.objects.filter(condition).exclude(id=patient.id).order_by().values(*RECORD_FIELDS)
+            [:limit or DuplicatePatientService.CANDIDATE_LIMIT]
+        )
+
+    @staticmethod
+    def _save_matches(matches):
+        """Upsert {(patient_a_id, patient_b_id): (score, matched_on)}, keeping review status"""
+        if not matches:
+            return
+        PotentialDuplicate.objects.bulk_create(
+            [
+                PotentialDuplicate(
+                    patient_a_id=pair[0], patient_b_id=pair[1], score=score,
+                    matched_on=','.join(matched_on)
+                )
+                for pair, (score, matched_on) in matches.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['patient_a', 'patient_b'],
+            update_fields=['score', 'matched_on', 'updated_at'],
+        )
+
+    @staticmethod
+    def check_patient(patient, min_score=None, record=True):
+        """
+        Inline check for a newly created or edited patient.
+
+        Returns the likely duplicates as [{'patient_id', 'score',
+        'matched_on'}], best first; failures are logged and return [].
+        Runs in a savepoint, so a failure doesn't break a surrounding
+        transaction (e.g. registration).
+        """
+        min_score = DuplicatePatientService.get_threshold() if min_score is None else min_score
+        try:
+            with transaction.atomic():
+                record_a = DuplicatePatientService._record(patient)
+                candidates = DuplicatePatientService.find_candidates(patient)
+                scores = score_pairs([(record_a, candidate) for candidate in candidates])
+
+                matches = {}
+                for candidate, score in zip(candidates, scores):
+                    if score >= min_score:
+                        pair = tuple(sorted((patient.id, candidate['id'])))
+                        matches[pair] = (score, shared_blocks(record_a, candidate))
+
+                if record:
+                    DuplicatePatientService._save_matches(matches)
+
+            return sorted(
+                [
+                    {
+                        'patient_id': pair[1] if pair[0] == patient.id else pair[0],
+                        'score': score,
+                        'matched_on': matched_on
+                    }
+                    for pair, (score, matched_on) in matches.items()
+                ],
+                key=itemgetter('score'),
+                reverse=True
+            )
+        except Exception as e:
+            logger.error(f"Error checking patient {patient.id} for duplicates: {str(e)}")
+            return []
+
+    @staticmethod
+    def find_duplicates(min_score=None, max_block_size=None):
+        """
+        Batch job: scan the whole table block by block and record every
+        likely duplicate pair.
+
+        Each blocking column is read once in index order, so rows arrive
+        grouped by key; only pairs within a block are compared.
+        """
+        min_score = DuplicatePatientService.get_threshold() if min_score is None else min_score
+        max_block_size = max_block_size or DuplicatePatientService.MAX_BLOCK_SIZE
+        seen = set()
+        pending = []
+        stats = {'blocks': 0, 'skipped_blocks': 0, 'pairs_scored': 0, 'duplicates': 0}
+
+        def flush():
+            scores = score_pairs(pending)
+            matches = {}
+            for (a, b), score in zip(pending, scores):
+                if score >= min_score:
+                    matches[(a['id'], b['id'])] = (score, shared_blocks(a, b))
+            DuplicatePatientService._save_matches(matches)
+            stats['pairs_scored'] += len(pending)
+            stats['duplicates'] += len(matches)
+            pending.clear()
+
+        try:
+            for field in BLOCKING_FIELDS:
+                rows = Patient.objects.exclude(**{field: ''}).order_by(field, 'id').values(*RECORD_FIELDS)
+                for key, block in groupby(rows.iterator(chunk_size=2000), key=itemgetter(field)):
+                    block = list(block)
+                    if len(block) < 2:
+                        continue
+                    stats['blocks'] += 1
+                    if len(block) > max_block_size:
+                        stats['skipped_blocks'] += 1
+                        logger.warning(f"Skipping {field} block {key!r} with {len(block)} patients")
+                        continue
+
+                    # Rows are in id order, so (a, b) always has a.id < b.id
+                    for i, a in enumerate(block):
+                        for b in block[i + 1:]:
+                            if (a['id'], b['id']) in seen:
+                                continue
+                            seen.add((a['id'], b['id']))
+                            pending.append((a, b))
+                            if len(pending) >= DuplicatePatientService.SCORE_BATCH_SIZE:
+                                flush()
+            flush()
+
+            return {'success': True, **stats}
+        except Exception as e:
+            logger.error(f"Error finding duplicate patients: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                **stats
+            }
+
+    @staticmethod
+    def get_open_duplicates(limit=100):
+        """Unreviewed duplicate pairs, most likely first"""
+        return PotentialDuplicate.objects.filter(status='open').select_related(
+            'patient_a__user', 'patient_b__user'
+        ).order_by('-score')[:limit]
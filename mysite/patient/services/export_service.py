@@ -0,0 +1,262 @@
+# patient/services/export_service.py
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q, Sum
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from common.models import Appointment, Message, MessageAttachment, Prescription
+from common.utils.audit import audit_log
+from common.utils.zipstream import iter_file, stream_zip
+from patient.models import Patient, PatientDataExport, PrescriptionRequest
+from provider.models import ClinicalNote, GeneratedDocument
+
+logger = logging.getLogger(__name__)
+
+ROW_CHUNK_SIZE = 500  # rows fetched per round trip
+WRITE_CHUNK_BYTES = 64 * 1024  # serialized rows are handed to the ZIP in ~64 KiB pieces
+ROW_SIZE_ESTIMATE = 1024  # bytes per exported row when sizing an export
+
+PROFILE_FIELDS = [
+    'id', 'user__username', 'user__first_name', 'user__last_name', 'user__email',
+    'date_of_birth', 'ohip_number', 'primary_phone', 'alternate_phone', 'address',
+    'emergency_contact_name', 'emergency_contact_phone', 'primary_provider_id',
+    'current_medications', 'allergies', 'pharmacy_details',
+    'virtual_care_consent', 'ehr_consent', 'created_at', 'updated_at',
+]
+
+
+def _datasets(patient):
+    """(name, queryset of dicts) for every record set in an export"""
+    user = patient.user
+    messages = Message.objects.filter(Q(sender=user) | Q(recipient=user))
+    return [
+        ('appointments', Appointment.objects.filter(patient=user).order_by('time', 'id').values(
+            'id', 'time', 'type', 'status', 'reason', 'notes',
+            'doctor_id', 'doctor__user__first_name', 'doctor__user__last_name',
+        )),
+        ('prescriptions', Prescription.objects.filter(patient=user).order_by('created_at', 'id').values(
+            'id', 'medication_name', 'dosage', 'instructions', 'status', 'expires',
+            'refills', 'refills_remaining', 'notes', 'doctor_id', 'created_at', 'updated_at',
+        )),
+        ('prescription_requests', PrescriptionRequest.objects.filter(patient=patient).order_by('created_at', 'id').values()),
+        ('messages', messages.order_by('created_at', 'id').values(
+            'id', 'thread_id', 'created_at', 'read_at', 'status', 'priority',
+            'sender__username', 'recipient__username', 'recipient_type', 'subject', 'content',
+        )),
+        ('message_attachments', MessageAttachment.objects.filter(message__in=messages).order_by('id').values(
+            'id', 'message_id', 'file_name', 'file_size', 'uploaded_at', 'file',
+        )),
+        ('generated_documents', GeneratedDocument.objects.filter(patient=user).order_by('created_at', 'id').values(
+            'id', 'template__name', 'template__template_type', 'status', 'provider_id',
+            'document_data', 'rendered_content', 'pdf_storage_path', 'created_at', 'updated_at',
+        )),
+        ('clinical_notes', ClinicalNote.objects.filter(appointment__patient=user).order_by('created_at', 'id').values(
+            'id', 'appointment_id', 'provider_id', 'status', 'ai_generated_text',
+            'provider_edited_text', 'created_at', 'updated_at',
+        )),
+    ]
+
+
+def _batched(lines):
+    """Join small encoded lines into ~WRITE_CHUNK_BYTES pieces"""
+    batch, size = [], 0
+    for line in lines:
+        batch.append(line)
+        size += len(line)
+        if size >= WRITE_CHUNK_BYTES:
+            yield b''.join(batch)
+            batch, size = [], 0
+    if batch:
+        yield b''.join(batch)
+
+
+def _ndjson_lines(rows, counter):
+    for row in rows:
+        counter['rows'] += 1
+        yield (json.dumps(row, cls=DjangoJSONEncoder) + '\n').encode('utf-8')
+
+
+def _csv_lines(rows, counter):
+    buffer = io.StringIO()
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row))
+            writer.writeheader()
+        counter['rows'] += 1
+        writer.writerow({key: '' if value is None else value for key, value in row.items()})
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _stored_file(path, manifest):
+    """Chunks of a file in default storage; missing files are noted in the manifest"""
+    try:
+        handle = default_storage.open(path, 'rb')
+    except Exception as e:
+        logger.warning(f"Export could not open {path}: {str(e)}")
+        manifest['missing_files'].append(path)
+        return iter(())
+    return iter_file(handle)
+
+
+class PatientExportService:
+    """
+    Full patient record exports as a ZIP archive.
+
+    The archive is produced by ``iter_archive()`` while it is being sent:
+    record sets are read with ``.iterator()`` and serialized row by row,
+    and attachments/PDFs are copied in fixed-size chunks, so memory use
+    does not depend on the size of the record. Exports larger than
+    ``PATIENT_EXPORT_STREAM_MAX_BYTES`` are built by the
+    ``process_data_exports`` command into a stored file instead.
+    """
+
+    @staticmethod
+    def iter_archive(patient, export_format='ndjson'):
+        """Yield the export ZIP for a patient as bytes chunks"""
+        return stream_zip(PatientExportService._entries(patient, export_format))
+
+    @staticmethod
+    def _entries(patient, export_format):
+        serialize = _csv_lines if export_format == 'csv' else _ndjson_lines
+        extension = 'csv' if export_format == 'csv' else 'ndjson'
+        manifest = {
+            'patient_id': patient.id,
+            'generated_at': timezone.now(),
+            'format': extension,
+            'record_counts': {},
+            'files': 0,
+            'missing_files': [],
+        }
+
+        profile = Patient.objects.filter(id=patient.id).values(*PROFILE_FIELDS).get()
+        yield 'profile.json', [json.dumps(profile, cls=DjangoJSONEncoder, indent=2).encode('utf-8')]
+
+        for name, rows in _datasets(patient):
+            counter = {'rows': 0}
+            yield f"{name}.{extension}", _batched(serialize(rows.iterator(chunk_size=ROW_CHUNK_SIZE), counter))
+            manifest['record_counts'][name] = counter['rows']
+
+        for attachment in MessageAttachment.objects.filter(
+            Q(message__sender=patient.user) | Q(message__recipient=patient.user)
+        ).order_by('id').values('id', 'message_id', 'file', 'file_name').iterator(chunk_size=ROW_CHUNK_SIZE):
+            if not attachment['file']:
+                continue
+            manifest['files'] += 1
+            file_name = os.path.basename((attachment['file_name'] or attachment['file']).replace('\\', '/'))
+            yield (
+                f"attachments/{attachment['message_id']}/{attachment['id']}_{file_name}",
+                _stored_file(attachment['file'], manifest)
+            )
+
+        for document in GeneratedDocument.objects.filter(
+            patient=patient.user
+        ).exclude(pdf_storage_path__isnull=True).exclude(pdf_storage_path='').order_by('id').values(
+            'id', 'pdf_storage_path'
+        ).iterator(chunk_size=ROW_CHUNK_SIZE):
+            manifest['files'] += 1
+            yield f"documents/{document['id']}.pdf", _stored_file(document['pdf_storage_path'], manifest)
+
+        # Written last so it can describe everything above
+        yield 'manifest.json', [json.dumps(manifest, cls=DjangoJSONEncoder, indent=2).encode('utf-8')]
+
+    @staticmethod
+    def estimate_size(patient):
+        """Rough uncompressed export size in bytes, from a few aggregate queries"""
+        user = patient.user
+        messages = Message.objects.filter(Q(sender=user) | Q(recipient=user))
+        attachments = MessageAttachment.objects.filter(message__in=messages).aggregate(
+            total=Sum('file_size'), count=Count('id')
+        )
+        rows = messages.count() + Appointment.objects.filter(patient=user).count()
+        return (attachments['total'] or 0) + (rows + attachments['count']) * ROW_SIZE_ESTIMATE
+
+    @staticmethod
+    def should_run_in_background(patient):
+        limit = getattr(settings, 'PATIENT_EXPORT_STREAM_MAX_BYTES', 100 * 1024 * 1024)
+        return PatientExportService.estimate_size(patient) > limit
+
+    @staticmethod
+    def streaming_response(patient, export_format='ndjson', requested_by=None):
+        """Stream the export straight to the client"""
+        audit_log.log(
+            'EXPORT_PATIENT_DATA', actor=requested_by, entity_type='Patient',
+            entity_id=patient.id, details=f"format={export_format}, mode=stream"
+        )
+        response = StreamingHttpResponse(
+            PatientExportService.iter_archive(patient, export_format),
+            content_type='application/zip'
+        )
+        filename = f"patient-{patient.id}-export-{timezone.localdate():%Y%m%d}.zip"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    def request_export(patient, requested_by=None, export_format='ndjson'):
+        """Queue a background export for process_data_exports"""
+        export = PatientDataExport.objects.create(
+            patient=patient, requested_by=requested_by, format=export_format
+        )
+        audit_log.log(
+            'EXPORT_PATIENT_DATA', actor=requested_by, entity_type='Patient',
+            entity_id=patient.id, details=f"format={export_format}, mode=background, export={export.id}"
+        )
+        return export
+
+    @staticmethod
+    def run_export(export_id):
+        """
+        Build a queued export into storage; returns False if another worker
+        claimed it first
+        """
+        # Claim atomically so concurrent workers never build the same export
+        claimed = PatientDataExport.objects.filter(id=export_id, status='pending').update(
+            status='running', started_at=timezone.now()
+        )
+        if not claimed:
+            return False
+
+        export = PatientDataExport.objects.select_related('patient__user').get(id=export_id)
+        try:
+            with tempfile.TemporaryFile() as spool:
+                for chunk in PatientExportService.iter_archive(export.patient, export.format):
+                    spool.write(chunk)
+                export.size = spool.tell()
+                spool.seek(0)
+                export.file.save(
+                    f"patient-{export.patient_id}-export-{export.id}.zip", File(spool), save=False
+                )
+            export.status = 'complete'
+            export.completed_at = timezone.now()
+            export.save(update_fields=['file', 'size', 'status', 'completed_at'])
+            return True
+        except Exception as e:
+            logger.error(f"Error building patient export {export_id}: {str(e)}")
+            export.status = 'failed'
+            export.error = str(e)
+            export.completed_at = timezone.now()
+            export.save(update_fields=['status', 'error', 'completed_at'])
+            return True
+
+    @staticmethod
+    def process_pending(limit=10):
+        """Build up to ``limit`` queued exports, oldest first"""
+        processed = 0
+        for export_id in PatientDataExport.objects.filter(
+            status='pending'
+        ).order_by('created_at').values_list('id', flat=True)[:limit]:
+            if PatientExportService.run_export(export_id):
+                processed += 1
+        return processed
@@ -49,3 +49,16 @@ def patient_pre_delete(sender, instance, **kwargs):
     
     # You could add additional cleanup here if needed
     # For example, cancelling all future appointments
+
+@receiver(post_save, sender=User)
+def sync_patient_search_fields(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Keep the patient's normalized name/email columns and blocking keys in step with the user"""
+    if created or raw:
+        return
+    if update_fields is not None and not {'first_name', 'last_name', 'email'} & set(update_fields):
+        # e.g. last_login updates on every sign-in
+        return
+    patient = Patient.objects.filter(user=instance).first()
+    if patient is not None:
+        patient.user = instance
+        patient.save(update_fields=Patient.SEARCH_FIELDS)
@@ -0,0 +1,110 @@
+# patient/tests/test_duplicates.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError, transaction
+from django.test import SimpleTestCase, TestCase
+
+from patient.deduplication import blocking_keys, jaro_winkler, soundex
+from patient.models import Patient, PotentialDuplicate
+from patient.services.duplicate_service import DuplicatePatientService
+
+
+class MatchingFunctionTests(SimpleTestCase):
+    def test_soundex(self):
+        self.assertEqual(soundex('Robert'), 'R163')
+        self.assertEqual(soundex('Rupert'), 'R163')
+        self.assertEqual(soundex('Ashcraft'), 'A261')
+        self.assertEqual(soundex('Núñez'), soundex('Nunez'))
+        self.assertEqual(soundex(''), '')
+
+    def test_jaro_winkler(self):
+        self.assertAlmostEqual(jaro_winkler('martha', 'marhta'), 0.961, places=3)
+        self.assertEqual(jaro_winkler('same', 'same'), 1.0)
+        self.assertEqual(jaro_winkler('abc', ''), 0.0)
+
+    def test_blocking_keys(self):
+        keys = blocking_keys('Jon', 'Smith', '1990-03-04', '1234567890AB')
+        self.assertEqual(keys, {
+            'dedupe_name_key': 'S5301990',
+            'dedupe_dob_key': 'J50019900304',
+            'dedupe_ohip_key': '12345678',
+        })
+        self.assertEqual(blocking_keys('', '', None, 'TEMP12')['dedupe_ohip_key'], '')
+
+
+class DuplicatePatientServiceTests(TestCase):
+    def create_patient(self, username, first_name, last_name, date_of_birth, ohip, phone='416-555-0100'):
+        user = User.objects.create_user(username=username, first_name=first_name, last_name=last_name)
+        return Patient.objects.create(
+            user=user, date_of_birth=date_of_birth, ohip_number=ohip,
+            primary_phone=phone, address='123 Test St',
+            emergency_contact_name='Emergency Contact', emergency_contact_phone='987-654-3210'
+        )
+
+    def setUp(self):
+        self.jon = self.create_patient('jsmith', 'Jon', 'Smith', '1990-03-04', '1234567890AB')
+        self.twin = self.create_patient('msmith', 'Mary', 'Smith', '1990-03-04', '5234567890AB')
+        self.other = self.create_patient('bdoe', 'Bob', 'Doe', '1975-06-07', '9234567890CD', phone='416-555-0199')
+
+    def test_inline_check_flags_typo_duplicate(self):
+        john = self.create_patient('jsmith2', 'John', 'Smith', '1990-03-04', '1234567891AB')
+
+        # Savepoint, candidates, upsert, release
+        with self.assertNumQueries(4):
+            matches = DuplicatePatientService.check_patient(john)
+
+        self.assertEqual([match['patient_id'] for match in matches], [self.jon.id])
+        self.assertIn('dedupe_name_key', matches[0]['matched_on'])
+        pair = PotentialDuplicate.objects.get()
+        self.assertEqual((pair.patient_a_id, pair.patient_b_id), (self.jon.id, john.id))
+
+    def test_failed_check_is_rolled_back_to_savepoint(self):
+        def partial_write(matches):
+            PotentialDuplicate.objects.create(patient_a=self.jon, patient_b=self.twin, score=1)
+            raise DatabaseError('write failed')
+
+        with transaction.atomic():
+            john = self.create_patient('jsmith2', 'John', 'Smith', '1990-03-04', '1234567891AB')
+            with mock.patch.object(DuplicatePatientService, '_save_matches', side_effect=partial_write):
+                self.assertEqual(DuplicatePatientService.check_patient(john), [])
+            # The surrounding transaction carries on without the partial write
+            self.assertFalse(PotentialDuplicate.objects.exists())
+            self.assertTrue(Patient.objects.filter(id=john.id).exists())
+
+    def test_batch_scan_records_each_pair_once(self):
+        john = self.create_patient('jsmith2', 'John', 'Smith', '1990-03-04', '1234567891AB')
+
+        result = DuplicatePatientService.find_duplicates()
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['duplicates'], 1)
+        self.assertEqual(
+            list(PotentialDuplicate.objects.values_list('patient_a_id', 'patient_b_id')),
+            [(self.jon.id, john.id)]
+        )
+        # Unrelated patients never form a block together
+        self.assertLess(result['pairs_scored'], 6)
+
+    def test_rescan_keeps_review_status(self):
+        self.create_patient('jsmith2', 'John', 'Smith', '1990-03-04', '1234567891AB')
+        DuplicatePatientService.find_duplicates()
+        PotentialDuplicate.objects.update(status='dismissed')
+
+        DuplicatePatientService.find_duplicates()
+
+        self.assertEqual(PotentialDuplicate.objects.get().status, 'dismissed')
+
+    def test_oversized_blocks_are_skipped(self):
+        result = DuplicatePatientService.find_duplicates(min_score=0, max_block_size=1)
+
+        self.assertGreater(result['skipped_blocks'], 0)
+        self.assertEqual(result['pairs_scored'], 0)
+
+    def test_name_change_updates_blocking_keys(self):
+        user = self.other.user
+        user.last_name = 'Smith'
+        user.save()
+
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.dedupe_name_key, 'S5301975')
@@ -0,0 +1,106 @@
+# patient/tests/test_export.py
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from common.models import Message, MessageAttachment
+from common.utils.zipstream import stream_zip
+from patient.models import Patient, PatientDataExport
+from patient.services.export_service import PatientExportService
+
+
+class StreamZipTests(SimpleTestCase):
+    def test_archive_is_readable(self):
+        chunks = list(stream_zip([
+            ('a.txt', [b'hello ', b'world']),
+            ('dir/b.bin', (bytes([i % 256]) * 1024 for i in range(300))),
+            ('empty.txt', []),
+        ]))
+
+        self.assertGreater(len(chunks), 1)
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.read('a.txt'), b'hello world')
+            self.assertEqual(len(archive.read('dir/b.bin')), 300 * 1024)
+            self.assertEqual(archive.read('empty.txt'), b'')
+
+
+class PatientExportServiceTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.user = User.objects.create_user(username='testpatient', first_name='Test', last_name='Patient')
+        self.patient = Patient.objects.create(
+            user=self.user, date_of_birth='1990-01-01', ohip_number='1234567890AB',
+            primary_phone='123-456-7890', address='123 Test St',
+            emergency_contact_name='Emergency Contact', emergency_contact_phone='987-654-3210'
+        )
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        for i in range(3):
+            message = Message.objects.create(
+                sender=self.user, recipient=staff, subject=f'Question {i}', content='Hello'
+            )
+        MessageAttachment.objects.create(
+            message=message, file=SimpleUploadedFile('lab.txt', b'lab results'),
+            file_name='lab.txt', file_size=11
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def read_archive(self, chunks):
+        return zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+    def test_ndjson_archive_contents(self):
+        with self.read_archive(PatientExportService.iter_archive(self.patient)) as archive:
+            names = archive.namelist()
+            self.assertEqual(names[0], 'profile.json')
+            self.assertEqual(names[-1], 'manifest.json')
+            self.assertIn('appointments.ndjson', names)
+
+            messages = archive.read('messages.ndjson').decode().splitlines()
+            self.assertEqual([json.loads(line)['subject'] for line in messages], ['Question 0', 'Question 1', 'Question 2'])
+
+            attachment = [name for name in names if name.startswith('attachments/')]
+            self.assertEqual(len(attachment), 1)
+            self.assertEqual(archive.read(attachment[0]), b'lab results')
+
+            manifest = json.loads(archive.read('manifest.json'))
+            self.assertEqual(manifest['record_counts']['messages'], 3)
+            self.assertEqual(manifest['record_counts']['appointments'], 0)
+            self.assertEqual(manifest['files'], 1)
+            self.assertEqual(json.loads(archive.read('profile.json'))['ohip_number'], '1234567890AB')
+
+    def test_csv_archive(self):
+        with self.read_archive(PatientExportService.iter_archive(self.patient, 'csv')) as archive:
+            rows = archive.read('messages.csv').decode().splitlines()
+            self.assertTrue(rows[0].startswith('id,'))
+            self.assertEqual(len(rows), 4)
+            self.assertEqual(archive.read('appointments.csv'), b'')
+
+    def test_background_export(self):
+        export = PatientExportService.request_export(self.patient, requested_by=self.user)
+
+        self.assertEqual(PatientExportService.process_pending(), 1)
+        export.refresh_from_db()
+        self.assertEqual(export.status, 'complete')
+        self.assertEqual(export.size, export.file.size)
+        with export.file.open('rb') as handle, zipfile.ZipFile(handle) as archive:
+            self.assertIn('manifest.json', archive.namelist())
+
+        # Already claimed exports are not rebuilt
+        self.assertFalse(PatientExportService.run_export(export.id))
+        self.assertEqual(PatientDataExport.objects.filter(status='pending').count(), 0)
+
+    @override_settings(PATIENT_EXPORT_STREAM_MAX_BYTES=100)
+    def test_large_exports_run_in_background(self):
+        self.assertTrue(PatientExportService.should_run_in_background(self.patient))
@@ -1,4 +1,6 @@
 # patient/tests/test_models.py
+from unittest import skipUnless
+from django.db import IntegrityError, connection
 from django.test import TestCase
 from patient.models import Patient, PrescriptionRequest
 from django.contrib.auth.models import User
@@ -63,3 +65,78 @@ class PrescriptionRequestModelTests(TestCase):
         """Test prescription request creation"""
         self.assertEqual(self.prescription_request.medication_name, 'Test Medication')
         self.assertEqual(self.prescription_request.status, 'pending')
+
+class PatientSearchTests(TestCase):
+    def setUp(self):
+        people = [
+            ('jnunez', 'José', 'Núñez', 'Jose.Nunez@example.com', '1234-567-890-AB'),
+            ('jdoe', 'Jane', 'Doe', 'jane@example.com', '2234567890CD'),
+            ('bsmith', 'Bob', 'Smith', 'bob@example.org', '3234567890EF'),
+        ]
+        for username, first_name, last_name, email, ohip in people:
+            user = User.objects.create_user(
+                username=username, first_name=first_name, last_name=last_name, email=email
+            )
+            Patient.objects.create(
+                user=user, date_of_birth='1990-01-01', ohip_number=ohip,
+                primary_phone='123-456-7890', address='123 Test St',
+                emergency_contact_name='Emergency Contact', emergency_contact_phone='987-654-3210'
+            )
+
+    def usernames(self, query):
+        return sorted(Patient.objects.search(query).values_list('user__username', flat=True))
+
+    def test_search_columns_are_normalized(self):
+        patient = Patient.objects.get(user__username='jnunez')
+        self.assertEqual(patient.search_first_name, 'jose')
+        self.assertEqual(patient.search_last_name, 'nunez')
+        self.assertEqual(patient.search_email, 'jose.nunez@example.com')
+        self.assertEqual(patient.ohip_normalized, '1234567890AB')
+
+    def test_prefix_search(self):
+        self.assertEqual(self.usernames('NUÑ'), ['jnunez'])
+        self.assertEqual(self.usernames('ja'), ['jdoe'])
+        self.assertEqual(self.usernames('jane do'), ['jdoe'])
+        self.assertEqual(self.usernames('doe jane'), ['jdoe'])
+        self.assertEqual(self.usernames('bob@'), ['bsmith'])
+        self.assertEqual(self.usernames('1234 567'), ['jnunez'])
+        self.assertEqual(self.usernames('ane'), [])
+
+    def test_user_changes_update_search_columns(self):
+        user = User.objects.get(username='bsmith')
+        user.last_name = 'Smyth'
+        user.save()
+        self.assertEqual(self.usernames('smy'), ['bsmith'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN output checked against SQLite query plans')
+    def test_search_uses_indexes(self):
+        plan = Patient.objects.search('smi').explain()
+        self.assertIn('patient_pat_search__1b7e2a_idx', plan)
+        self.assertIn('patient_pat_search__9c40d5_idx', plan)
+        self.assertIn('(ohip_normalized>? AND ohip_normalized<?)', Patient.objects.search('1234').explain())
+    
+    def test_identity_lookups_use_normalized_columns(self):
+        self.assertEqual(Patient.objects.by_ohip('1234 567 890 ab').get().user.username, 'jnunez')
+        self.assertFalse(Patient.objects.by_ohip('1234567890').exists())
+        patient = Patient.objects.get(user__username='jdoe')
+        patient.alternate_phone = '+1 (416) 555-1234'
+        patient.save(update_fields=['alternate_phone'])
+        self.assertEqual(patient.alternate_phone_normalized, '4165551234')
+        self.assertEqual(list(Patient.objects.by_phone('416.555.1234')), [patient])
+        self.assertEqual(self.usernames('416-555-1234'), ['jdoe'])
+    
+    def test_ohip_is_unique_in_any_format(self):
+        user = User.objects.create_user(username='dupe')
+        with self.assertRaises(IntegrityError):
+            Patient.objects.create(
+                user=user, date_of_birth='1990-01-01', ohip_number='2234-567-890-cd',
+                primary_phone='123-456-7890', address='123 Test St',
+                emergency_contact_name='Emergency Contact', emergency_contact_phone='987-654-3210'
+            )
+    
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN output checked against SQLite query plans')
+    def test_identity_lookups_use_indexes(self):
+        self.assertIn('(ohip_normalized=?)', Patient.objects.by_ohip('2234567890CD').explain())
+        plan = Patient.objects.by_phone('4165551234').explain()
+        self.assertIn('patient_pat_primary_7f3c21_idx', plan)
+        self.assertIn('patient_pat_alterna_d84e06_idx', plan)
@@ -12,6 +12,11 @@ urlpatterns = [
     path('medical-history/', views.patient_medical_history, name='patient_medical_history'),
     path('help-center/', views.patient_help_center, name='patient_help_center'),
     path('search/', views.patient_search, name='patient_search'),
+    
+    # Record exports
+    path('exports/', views.data_exports, name='patient_data_exports'),
+    path('exports/download/', views.export_records, name='patient_export_records'),
+    path('exports/<int:export_id>/', views.download_export, name='patient_download_export'),
 
     # Appointment URLs  
     path('appointments/', views.appointments_view, name='patient_appointments'),
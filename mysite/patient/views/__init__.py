@@ -10,3 +10,4 @@ from .profile import patient_profile, patient_medical_history
 from .video import jitsi_video_view, join_video_appointment
 from .help import patient_help_center
 from .search import patient_search
+from .export import data_exports, export_records, download_export
@@ -0,0 +1,62 @@
+# patient/views/export.py
+from django.contrib import messages
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
+import logging
+
+from patient.decorators import patient_required_secure as patient_required
+from patient.models import PatientDataExport
+from patient.services.export_service import PatientExportService
+from patient.utils import get_current_patient_secure as get_current_patient
+
+logger = logging.getLogger(__name__)
+
+@patient_required
+def data_exports(request):
+    """List the patient's record exports and offer a new one"""
+    patient, patient_dict = get_current_patient(request)
+    if patient is None:
+        return redirect('unauthorized')
+    
+    context = {
+        'patient': patient_dict,
+        'patient_name': patient_dict.get('full_name') if patient_dict else '',
+        'exports': patient.data_exports.only(
+            'id', 'format', 'status', 'size', 'created_at', 'completed_at'
+        )[:20],
+        'active_section': 'profile',
+    }
+    return render(request, 'patient/data_exports.html', context)
+
+@require_POST
+@patient_required
+def export_records(request):
+    """
+    Download the patient's full record as a ZIP.
+    
+    Small records stream straight back; large ones (or when asked)
+    are queued and built in the background.
+    """
+    patient, _ = get_current_patient(request)
+    if patient is None:
+        return redirect('unauthorized')
+    
+    export_format = 'csv' if request.POST.get('format') == 'csv' else 'ndjson'
+    
+    if request.POST.get('background') or PatientExportService.should_run_in_background(patient):
+        PatientExportService.request_export(patient, requested_by=request.user, export_format=export_format)
+        messages.info(request, "Your export is being prepared. It will appear below when it is ready to download.")
+        return redirect('patient:patient_data_exports')
+    
+    return PatientExportService.streaming_response(patient, export_format, requested_by=request.user)
+
+@patient_required
+def download_export(request, export_id):
+    """Download a finished background export"""
+    patient, _ = get_current_patient(request)
+    if patient is None:
+        return redirect('unauthorized')
+    
+    export = get_object_or_404(PatientDataExport, id=export_id, patient=patient, status='complete')
+    return FileResponse(export.file.open('rb'), as_attachment=True, filename=f"patient-{patient.id}-export-{export.id}.zip")
@@ -6,7 +6,7 @@ from django.contrib.auth.models import User
 from django import forms
 import ldap
 
-from .models import Provider, RecordingSession, ClinicalNote, DocumentTemplate, GeneratedDocument
+from .models import Provider, RecordingSession, ClinicalNote, DocumentTemplate, GeneratedDocument, AIModelHealth, ActivityEvent
 from common.utils.ldap_client import LDAPClient
 
 # Enhanced Provider form with LDAP password setting
@@ -158,6 +158,21 @@ class GeneratedDocumentAdmin(admin.ModelAdmin):
     list_filter = ('status', 'created_at', 'template__template_type')
     search_fields = ('patient__first_name', 'patient__last_name', 'provider__user__last_name')
 
+@admin.register(AIModelHealth)
+class AIModelHealthAdmin(admin.ModelAdmin):
+    list_display = ('model_config', 'is_up', 'status_code', 'p50_latency_ms', 'p95_latency_ms', 'p99_latency_ms', 'checked_at')
+    list_filter = ('is_up',)
+    list_select_related = ('model_config',)
+    readonly_fields = ('checked_at',)
+
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'provider', 'event_type', 'action', 'patient_name', 'description')
+    list_filter = ('event_type', 'action')
+    list_select_related = ('provider__user',)
+    search_fields = ('patient_name', 'description')
+    raw_id_fields = ('provider', 'patient')
+
 # Unregister the default UserAdmin and register our custom version
 admin.site.unregister(User)
 admin.site.register(User, CustomUserAdmin)
@@ -0,0 +1,55 @@
+# provider/management/commands/probe_ai_models.py
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from provider.services.ai_health_service import AIHealthProbeService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Probe active AI model endpoints concurrently and cache their health status'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Seconds between probe rounds. 0 runs a single round and exits.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=AIHealthProbeService.MAX_WORKERS,
+            help='Maximum number of endpoints probed in parallel',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=int,
+            default=AIHealthProbeService.PROBE_TIMEOUT,
+            help='Per-endpoint timeout in seconds',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        while True:
+            started = time.monotonic()
+            try:
+                summary = AIHealthProbeService.probe_all_active(
+                    max_workers=options['workers'],
+                    timeout=options['timeout']
+                )
+                self.stdout.write(
+                    f"Probed {summary['probed']} model(s): "
+                    f"{summary['up']} up, {summary['down']} down "
+                    f"in {time.monotonic() - started:.2f}s"
+                )
+            except Exception as e:
+                logger.error(f"Error probing AI models: {str(e)}")
+                self.stdout.write(self.style.ERROR(f'Probe round failed: {str(e)}'))
+
+            if interval <= 0:
+                break
+            time.sleep(max(0, interval - (time.monotonic() - started)))
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('provider', '0004_providerschedule_providersettings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIModelHealth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_up', models.BooleanField(default=False)),
+                ('status_code', models.IntegerField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('last_latency_ms', models.IntegerField(blank=True, null=True)),
+                ('p50_latency_ms', models.IntegerField(blank=True, null=True)),
+                ('p95_latency_ms', models.IntegerField(blank=True, null=True)),
+                ('p99_latency_ms', models.IntegerField(blank=True, null=True)),
+                ('latency_samples', models.TextField(default='[]')),
+                ('consecutive_failures', models.PositiveIntegerField(default=0)),
+                ('checked_at', models.DateTimeField(blank=True, null=True)),
+                ('model_config', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='health', to='provider.aimodelconfig')),
+            ],
+            options={
+                'verbose_name': 'AI Model Health',
+                'verbose_name_plural': 'AI Model Health',
+            },
+        ),
+    ]
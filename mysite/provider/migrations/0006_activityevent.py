@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('provider', '0005_aimodelhealth'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('patient_name', models.CharField(blank=True, max_length=255)),
+                ('event_type', models.CharField(choices=[('appointment', 'Appointment'), ('prescription', 'Prescription'), ('message', 'Message'), ('document', 'Document')], max_length=30)),
+                ('action', models.CharField(max_length=30)),
+                ('object_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('description', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('patient', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_events', to=settings.AUTH_USER_MODEL)),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to='provider.provider')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['provider', 'created_at'], name='provider_ac_provide_4e8b1c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:06
+
+from django.db import migrations
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def _patient_name(user):
+    return (f"{user.first_name} {user.last_name}".strip() or user.username)[:255]
+
+
+def backfill_activity(apps, schema_editor):
+    """Seed the feed from existing appointments and prescriptions"""
+    ActivityEvent = apps.get_model('provider', 'ActivityEvent')
+    Appointment = apps.get_model('common', 'Appointment')
+    Prescription = apps.get_model('common', 'Prescription')
+
+    # Appointments don't record when they were booked; future ones are
+    # dated now so they don't sit at the top of the feed
+    now = timezone.now()
+    batch = []
+
+    def flush():
+        ActivityEvent.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        batch.clear()
+
+    for appointment in Appointment.objects.select_related('patient').iterator(chunk_size=BATCH_SIZE):
+        batch.append(ActivityEvent(
+            provider_id=appointment.doctor_id,
+            patient_id=appointment.patient_id,
+            patient_name=_patient_name(appointment.patient),
+            event_type='appointment',
+            action='created',
+            object_id=appointment.id,
+            description=f"Appointment ({appointment.get_status_display()})",
+            created_at=min(appointment.time, now),
+        ))
+        if len(batch) >= BATCH_SIZE:
+            flush()
+
+    for prescription in Prescription.objects.select_related('patient').iterator(chunk_size=BATCH_SIZE):
+        batch.append(ActivityEvent(
+            provider_id=prescription.doctor_id,
+            patient_id=prescription.patient_id,
+            patient_name=_patient_name(prescription.patient),
+            event_type='prescription',
+            action='created',
+            object_id=prescription.id,
+            description=f"Prescription: {prescription.medication_name}"[:255],
+            created_at=prescription.created_at,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            flush()
+
+    flush()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('provider', '0006_activityevent'),
+        ('common', '0010_appointment_common_appo_patient_560f61_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
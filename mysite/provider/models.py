@@ -1,5 +1,6 @@
 import json
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from common.models import Appointment, Prescription, Message
 
@@ -11,6 +12,7 @@ class Provider(models.Model):
     bio = models.TextField(blank=True)
     phone = models.CharField(max_length=20, blank=True)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Dr. {self.user.last_name}"
@@ -67,6 +69,7 @@ class RecordingSession(models.Model):
         default="pending"
     )
     transcription_text = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Recording {self.id} for Appointment {self.appointment.id}"
@@ -186,17 +189,21 @@ class AIModelConfig(models.Model):
         return f"{self.name} ({self.get_model_type_display()})"
     
     def get_configuration(self):
-        """Get configuration data as a dictionary"""
-        import json
+        """Get configuration data as a dictionary (parsed once per instance)"""
+        cached = self.__dict__.get('_parsed_configuration')
+        if cached is not None and cached[0] == self.configuration_data:
+            return cached[1]
         try:
-            return json.loads(self.configuration_data)
-        except json.JSONDecodeError:
-            return {}
+            parsed = json.loads(self.configuration_data)
+        except (TypeError, ValueError):
+            parsed = {}
+        self._parsed_configuration = (self.configuration_data, parsed)
+        return parsed
     
     def set_configuration(self, config_dict):
         """Set configuration data from a dictionary"""
-        import json
         self.configuration_data = json.dumps(config_dict)
+        self._parsed_configuration = (self.configuration_data, config_dict)
 
 
 class ProviderSettings(models.Model):
@@ -243,3 +250,70 @@ class ProviderSchedule(models.Model):
     def set_schedule(self, schedule_data):
         """Set schedule data from dictionary"""
         self.schedule_data = json.dumps(schedule_data)
+
+
+class AIModelHealth(models.Model):
+    """Cached health probe results for an AI model configuration"""
+    model_config = models.OneToOneField(AIModelConfig, on_delete=models.CASCADE, related_name='health')
+    is_up = models.BooleanField(default=False)
+    status_code = models.IntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    last_latency_ms = models.IntegerField(null=True, blank=True)
+    p50_latency_ms = models.IntegerField(null=True, blank=True)
+    p95_latency_ms = models.IntegerField(null=True, blank=True)
+    p99_latency_ms = models.IntegerField(null=True, blank=True)
+    latency_samples = models.TextField(default='[]')  # JSON list of recent latencies (ms)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    checked_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'AI Model Health'
+        verbose_name_plural = 'AI Model Health'
+    
+    def __str__(self):
+        return f"Health for {self.model_config.name}: {'up' if self.is_up else 'down'}"
+    
+    def get_latency_samples(self):
+        """Get recent latency samples as a list"""
+        try:
+            return json.loads(self.latency_samples)
+        except (TypeError, ValueError):
+            return []
+    
+    def set_latency_samples(self, samples):
+        """Set recent latency samples from a list"""
+        self.latency_samples = json.dumps(samples)
+
+
+class ActivityEvent(models.Model):
+    """
+    Append-only provider activity feed.
+    
+    Rows are written by signals (see provider.signals) and carry a
+    denormalized patient name and description, so feeds are read without
+    touching the source tables.
+    """
+    EVENT_TYPES = [
+        ('appointment', 'Appointment'),
+        ('prescription', 'Prescription'),
+        ('message', 'Message'),
+        ('document', 'Document'),
+    ]
+    
+    provider = models.ForeignKey(Provider, on_delete=models.CASCADE, related_name='activity_events')
+    patient = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_events')
+    patient_name = models.CharField(max_length=255, blank=True)
+    event_type = models.CharField(max_length=30, choices=EVENT_TYPES)
+    action = models.CharField(max_length=30)  # created, updated, ...
+    object_id = models.PositiveBigIntegerField(null=True, blank=True)
+    description = models.CharField(max_length=255)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['provider', 'created_at'], name='provider_ac_provide_4e8b1c_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_event_type_display()} {self.action} for {self.patient_name}"
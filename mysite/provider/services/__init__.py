@@ -8,3 +8,6 @@ from .video_service import VideoService
 from .ai_service import AIScribeService
 from .form_automation_service import FormAutomationService
 from .ai_configuration_service import AIConfigurationService
+from .ai_health_service import AIHealthProbeService
+from .patient_cohorts import PatientCohorts
+from .activity_service import ActivityService
@@ -0,0 +1,88 @@
+# provider/services/activity_service.py
+import logging
+
+from django.db import transaction
+
+from common.utils.keyset import keyset_page
+from provider.models import ActivityEvent
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityService:
+    """
+    Provider activity feed backed by the append-only ActivityEvent table.
+
+    Feeds are a single range read on the (provider, created_at) index,
+    paged with an opaque (created_at, id) keyset cursor.
+    """
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    @staticmethod
+    def record(provider_id, event_type, action, description, patient=None, object_id=None, created_at=None):
+        """
+        Append an activity event; failures are logged and never raised.
+        The insert runs in a savepoint so a failure doesn't break the
+        caller's transaction.
+        """
+        try:
+            patient_name = ''
+            if patient is not None:
+                patient_name = f"{patient.first_name} {patient.last_name}".strip() or patient.username
+
+            event = ActivityEvent(
+                provider_id=provider_id,
+                patient=patient,
+                patient_name=patient_name[:255],
+                event_type=event_type,
+                action=action,
+                object_id=object_id,
+                description=description[:255],
+            )
+            if created_at is not None:
+                event.created_at = created_at
+            with transaction.atomic():
+                event.save()
+            return event
+        except Exception as e:
+            logger.error(f"Error recording {event_type} activity: {str(e)}")
+            return None
+
+    @staticmethod
+    def get_feed(provider_id, limit=None, cursor=None, event_types=None):
+        """
+        Get a page of a provider's activity, newest first.
+
+        Returns the events and a cursor for the next (older) page, or
+        None when there are no more events.
+        """
+        limit = min(limit or ActivityService.DEFAULT_LIMIT, ActivityService.MAX_LIMIT)
+
+        queryset = ActivityEvent.objects.filter(provider_id=provider_id)
+        if event_types:
+            queryset = queryset.filter(event_type__in=event_types)
+
+        events, next_cursor = keyset_page(queryset, cursor=cursor, limit=limit)
+        return {
+            'events': events,
+            'next_cursor': next_cursor
+        }
+
+    @staticmethod
+    def get_recent_activity(provider_id, limit=10):
+        """
+        Get recent activity formatted for dashboards
+        """
+        events = ActivityService.get_feed(provider_id, limit=limit)['events']
+        return [
+            {
+                'type': event.event_type,
+                'patient_id': event.patient_id,
+                'patient_name': event.patient_name or "Unknown Patient",
+                'date': event.created_at,
+                'description': event.description
+            }
+            for event in events
+        ]
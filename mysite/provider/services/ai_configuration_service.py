@@ -287,72 +287,30 @@ class AIConfigurationService:
                 from provider.models import AIModelConfig
                 model_config = AIModelConfig.objects.get(id=config_id)
                 
-                # Test connection to API endpoint
-                import requests
-                import json
+                # Probe the endpoint and record the result so the cached
+                # health status reflects this manual test as well
+                from provider.services.ai_health_service import AIHealthProbeService
+                result = AIHealthProbeService.probe_endpoint(model_config)
+                AIHealthProbeService.record_result(model_config, result)
                 
-                # Get configuration data
-                try:
-                    config = json.loads(model_config.configuration_data)
-                except (json.JSONDecodeError, AttributeError):
-                    config = {}
-                
-                # Get test message based on model type
-                test_message = "This is a test message."
-                if model_config.model_type == 'transcription':
-                    test_message = "Test transcription request."
-                elif model_config.model_type == 'summarization':
-                    test_message = "Test summarization request."
-                elif model_config.model_type == 'clinical_note':
-                    test_message = "Test clinical note generation request."
-                elif model_config.model_type == 'speech_to_text':
-                    test_message = "Test speech to text request."
-                    
-                # Get API key if available
-                api_key = config.get('api_key', '')
-                
-                # Prepare request headers
-                headers = {
-                    'Content-Type': 'application/json'
-                }
-                
-                if api_key:
-                    headers['Authorization'] = f"Bearer {api_key}"
-                
-                # Prepare request data
-                request_data = {
-                    'text': test_message,
-                    'model': config.get('model_name', 'default')
-                }
-                
-                # Send test request
-                try:
-                    # Use a timeout to avoid hanging
-                    response = requests.post(
-                        model_config.api_endpoint, 
-                        headers=headers, 
-                        json=request_data,
-                        timeout=5  # 5 second timeout
-                    )
-                    
-                    # Check response
-                    if response.status_code >= 200 and response.status_code < 300:
-                        return {
-                            'success': True,
-                            'message': 'Test successful',
-                            'response': response.json() if response.content else {}
-                        }
-                    else:
-                        return {
-                            'success': False,
-                            'error': f"API returned error code {response.status_code}: {response.text}"
-                        }
-                except requests.RequestException as e:
+                if result['is_up']:
+                    response = result['response']
+                    try:
+                        response_data = response.json() if response.content else {}
+                    except ValueError:
+                        response_data = {}
                     return {
-                        'success': False,
-                        'error': f"Request error: {str(e)}"
+                        'success': True,
+                        'message': 'Test successful',
+                        'latency_ms': result['latency_ms'],
+                        'response': response_data
                     }
                 
+                return {
+                    'success': False,
+                    'error': result['error']
+                }
+                
             except (ImportError, AttributeError):
                 return {
                     'success': False,
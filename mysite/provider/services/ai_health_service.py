@@ -0,0 +1,258 @@
+# provider/services/ai_health_service.py
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.utils import timezone
+
+from common.utils.metrics import external_call
+from provider.models import AIModelConfig, AIModelHealth
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class AIHealthProbeService:
+    """
+    Background health probing for AI model endpoints.
+
+    Probes run concurrently outside the request cycle (see the
+    ``probe_ai_models`` management command) and results are stored in
+    AIModelHealth so dashboards can read the latest status without
+    touching the network.
+    """
+
+    PROBE_TIMEOUT = 5  # seconds
+    MAX_WORKERS = 8
+    SAMPLE_WINDOW = 50  # latency samples kept per model
+    STALE_AFTER = timedelta(minutes=5)
+
+    @staticmethod
+    def build_probe_request(model_config):
+        """
+        Build the headers and payload used to probe a model endpoint
+        """
+        config = model_config.get_configuration()
+
+        # Get test message based on model type
+        test_message = "This is a test message."
+        if model_config.model_type == 'transcription':
+            test_message = "Test transcription request."
+        elif model_config.model_type == 'summarization':
+            test_message = "Test summarization request."
+        elif model_config.model_type == 'clinical_note':
+            test_message = "Test clinical note generation request."
+        elif model_config.model_type == 'speech_to_text':
+            test_message = "Test speech to text request."
+
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        api_key = config.get('api_key', '')
+        if api_key:
+            headers['Authorization'] = f"Bearer {api_key}"
+
+        request_data = {
+            'text': test_message,
+            'model': config.get('model_name', 'default')
+        }
+
+        return headers, request_data
+
+    @staticmethod
+    @external_call('ai')
+    def probe_endpoint(model_config, timeout=None):
+        """
+        Send a single probe to a model endpoint.
+
+        Does not touch the database so it is safe to run in worker threads.
+        """
+        headers, request_data = AIHealthProbeService.build_probe_request(model_config)
+        started = time.monotonic()
+
+        try:
+            response = requests.post(
+                model_config.api_endpoint,
+                headers=headers,
+                json=request_data,
+                timeout=timeout or AIHealthProbeService.PROBE_TIMEOUT
+            )
+            latency_ms = int((time.monotonic() - started) * 1000)
+            is_up = 200 <= response.status_code < 300
+
+            return {
+                'config_id': model_config.id,
+                'is_up': is_up,
+                'status_code': response.status_code,
+                'latency_ms': latency_ms,
+                'error': '' if is_up else f"API returned error code {response.status_code}: {response.text[:500]}",
+                'response': response,
+            }
+        except requests.RequestException as e:
+            return {
+                'config_id': model_config.id,
+                'is_up': False,
+                'status_code': None,
+                'latency_ms': None,
+                'error': f"Request error: {str(e)}",
+                'response': None,
+            }
+
+    @staticmethod
+    def record_result(model_config, result):
+        """
+        Store a probe result and refresh the rolling latency percentiles
+        """
+        health, _ = AIModelHealth.objects.get_or_create(model_config=model_config)
+
+        health.is_up = result['is_up']
+        health.status_code = result['status_code']
+        health.last_error = result['error']
+        health.last_latency_ms = result['latency_ms']
+        health.checked_at = timezone.now()
+
+        if result['is_up']:
+            health.consecutive_failures = 0
+        else:
+            health.consecutive_failures += 1
+
+        # Only successful round trips contribute to latency percentiles
+        samples = health.get_latency_samples()
+        if result['is_up'] and result['latency_ms'] is not None:
+            samples.append(result['latency_ms'])
+            samples = samples[-AIHealthProbeService.SAMPLE_WINDOW:]
+            health.set_latency_samples(samples)
+
+        ordered = sorted(samples)
+        health.p50_latency_ms = _percentile(ordered, 50)
+        health.p95_latency_ms = _percentile(ordered, 95)
+        health.p99_latency_ms = _percentile(ordered, 99)
+
+        health.save()
+        return health
+
+    @staticmethod
+    def probe_all_active(max_workers=None, timeout=None):
+        """
+        Probe every active model configuration concurrently.
+
+        Network calls run in a thread pool; results are written back from
+        the calling thread.
+        """
+        configs = list(AIModelConfig.objects.filter(is_active=True))
+        if not configs:
+            return {
+                'success': True,
+                'probed': 0,
+                'up': 0,
+                'down': 0
+            }
+
+        workers = min(max_workers or AIHealthProbeService.MAX_WORKERS, len(configs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda config: AIHealthProbeService.probe_endpoint(config, timeout=timeout),
+                configs
+            ))
+
+        up_count = 0
+        for config, result in zip(configs, results):
+            try:
+                AIHealthProbeService.record_result(config, result)
+            except Exception as e:
+                logger.error(f"Error recording health for model config {config.id}: {str(e)}")
+                continue
+            if result['is_up']:
+                up_count += 1
+            else:
+                logger.warning(f"AI model '{config.name}' is down: {result['error']}")
+
+        return {
+            'success': True,
+            'probed': len(configs),
+            'up': up_count,
+            'down': len(configs) - up_count
+        }
+
+    @staticmethod
+    def get_cached_status():
+        """
+        Get the last recorded health of every active model, keyed by config id
+        """
+        try:
+            now = timezone.now()
+            health_rows = AIModelHealth.objects.filter(
+                model_config__is_active=True
+            ).select_related('model_config')
+
+            statuses = {}
+            for health in health_rows:
+                statuses[health.model_config_id] = {
+                    'name': health.model_config.name,
+                    'model_type': health.model_config.model_type,
+                    'status': 'online' if health.is_up else 'offline',
+                    'is_up': health.is_up,
+                    'status_code': health.status_code,
+                    'last_error': health.last_error,
+                    'last_latency_ms': health.last_latency_ms,
+                    'p50_latency_ms': health.p50_latency_ms,
+                    'p95_latency_ms': health.p95_latency_ms,
+                    'p99_latency_ms': health.p99_latency_ms,
+                    'consecutive_failures': health.consecutive_failures,
+                    'checked_at': health.checked_at,
+                    'stale': (health.checked_at is None or
+                              now - health.checked_at > AIHealthProbeService.STALE_AFTER),
+                }
+            return statuses
+        except Exception as e:
+            logger.error(f"Error in get_cached_status: {str(e)}")
+            return {}
+
+    @staticmethod
+    def get_status_summary():
+        """
+        Summarize cached health across all active models for dashboards
+        """
+        statuses = AIHealthProbeService.get_cached_status()
+
+        if not statuses:
+            return {
+                'status': 'unknown',
+                'models_up': 0,
+                'models_down': 0,
+                'response_time_ms': None,
+                'last_checked': None,
+                'stale': True,
+                'models': statuses
+            }
+
+        up = [s for s in statuses.values() if s['is_up']]
+        p50_values = sorted(s['p50_latency_ms'] for s in up if s['p50_latency_ms'] is not None)
+        checked = [s['checked_at'] for s in statuses.values() if s['checked_at']]
+
+        if len(up) == len(statuses):
+            status = 'online'
+        elif up:
+            status = 'degraded'
+        else:
+            status = 'offline'
+
+        return {
+            'status': status,
+            'models_up': len(up),
+            'models_down': len(statuses) - len(up),
+            'response_time_ms': _percentile(p50_values, 50),
+            'last_checked': max(checked) if checked else None,
+            'stale': any(s['stale'] for s in statuses.values()),
+            'models': statuses
+        }
@@ -1,7 +1,8 @@
 # provider/services/ai_scribe_service.py
 import logging
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, F, ExpressionWrapper, DurationField
+from django.db.models.functions import Length, Substr
 from datetime import datetime, timedelta
 
 from provider.models import Provider, RecordingSession, ClinicalNote
@@ -12,24 +13,69 @@ logger = logging.getLogger(__name__)
 class AIScribeService:
     """Service layer for AI transcription and clinical note generation."""
     
+    # Characters of transcript sent per chunk by stream_transcription
+    TRANSCRIPT_CHUNK_SIZE = 64 * 1024
+    
+    @staticmethod
+    def get_recording_list_queryset(provider):
+        """
+        Lightweight recording projection for list views.
+        
+        The transcript column is never loaded; its length and the session
+        duration are computed by the database and the patient name comes
+        from the same query via select_related.
+        """
+        return RecordingSession.objects.filter(
+            provider=provider
+        ).select_related(
+            'appointment__patient'
+        ).only(
+            'id', 'appointment', 'provider', 'jitsi_recording_id', 'start_time',
+            'end_time', 'storage_path', 'transcription_status',
+            'appointment__time', 'appointment__type',
+            'appointment__patient__first_name', 'appointment__patient__last_name'
+        ).annotate(
+            duration_value=ExpressionWrapper(F('end_time') - F('start_time'), output_field=DurationField()),
+            transcript_length=Length('transcription_text')
+        )
+    
+    @staticmethod
+    def get_note_list_queryset(provider):
+        """
+        Lightweight clinical note projection for list views (note bodies deferred)
+        """
+        return ClinicalNote.objects.filter(
+            provider=provider
+        ).select_related(
+            'appointment__patient'
+        ).only(
+            'id', 'appointment', 'provider', 'transcription', 'status',
+            'created_at', 'updated_at', 'created_by', 'last_edited_by',
+            'appointment__time',
+            'appointment__patient__first_name', 'appointment__patient__last_name'
+        )
+    
     @staticmethod
     def get_dashboard_data(provider_id):
         """
         Get AI scribe dashboard data:
         - Recordings
         - Notes
+        
+        Transcript and note bodies are not loaded; use
+        iter_transcription / get_clinical_note to open one.
         """
         try:
             provider = Provider.objects.get(id=provider_id)
             
             # Get recent recordings
-            recordings = RecordingSession.objects.filter(
-                provider=provider
+            recordings = AIScribeService.get_recording_list_queryset(
+                provider
             ).order_by('-start_time')[:20]  # Limit to 20 most recent
             
             # Get recent clinical notes
-            notes = ClinicalNote.objects.filter(
-                provider=provider
+            notes = AIScribeService.get_note_list_queryset(
+                provider
             ).order_by('-created_at')[:20]  # Limit to 20 most recent
             
             return {
@@ -47,6 +93,39 @@ class AIScribeService:
             logger.error(f"Error in get_dashboard_data: {str(e)}")
             raise
     
+    @staticmethod
+    def iter_transcription(provider_id, recording_id, chunk_size=None):
+        """
+        Stream a recording's transcript in chunks read with SUBSTR, so the
+        full text is never held in memory.
+        
+        Returns None if the recording does not belong to the provider; a
+        recording without a transcript yields nothing.
+        """
+        chunk_size = chunk_size or AIScribeService.TRANSCRIPT_CHUNK_SIZE
+        recording = RecordingSession.objects.filter(id=recording_id, provider_id=provider_id)
+        
+        row = recording.annotate(
+            transcript_length=Length('transcription_text')
+        ).values_list('id', 'transcript_length').first()
+        
+        if row is None:
+            return None
+        # Length of a NULL transcript is NULL
+        length = row[1] or 0
+        
+        def chunks():
+            # SQL SUBSTR positions are 1-based
+            for start in range(1, length + 1, chunk_size):
+                chunk = recording.annotate(
+                    chunk=Substr('transcription_text', start, chunk_size)
+                ).values_list('chunk', flat=True).first()
+                if not chunk:
+                    break
+                yield chunk
+        
+        return chunks()
+    
     @staticmethod
     def get_recent_scribe_data(provider_id):
         """
@@ -63,13 +142,10 @@ class AIScribeService:
             # Check if AI Scribe is enabled
             is_enabled = True
             
-            # Try to check AI configuration if available
+            # Check the cached active AI configuration (no config query)
             try:
-                from provider.models import AIModelConfig
-                is_enabled = AIModelConfig.objects.filter(
-                    model_type__in=['transcription', 'clinical_note'],
-                    is_active=True
-                ).exists()
+                from common.utils.config_registry import ai_model_configs
+                is_enabled = ai_model_configs.has_active('transcription', 'clinical_note')
             except (ImportError, AttributeError):
                 pass
             
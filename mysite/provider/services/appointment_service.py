@@ -27,7 +27,7 @@ class AppointmentService:
         try:
             provider = Provider.objects.get(id=provider_id)
             now = timezone.now()
-            today = now.date()
+            today = timezone.localdate(now)
             
             # Parse selected date if provided
             if selected_date:
@@ -84,16 +84,13 @@ class AppointmentService:
                 next_date = next_month.strftime('%Y-%m-%d')
             
             # Get appointments for the selected date range
-            appointments = Appointment.objects.filter(
-                doctor=provider,
-                time__date__gte=start_date,
-                time__date__lte=end_date
+            appointments = Appointment.objects.for_provider_range(
+                provider, start_date, end_date
             ).order_by('time')
             
             # Get today's appointments
-            todays_appointments = Appointment.objects.filter(
-                doctor=provider,
-                time__date=today
+            todays_appointments = Appointment.objects.for_provider_day(
+                provider, today
             ).order_by('time')
             
             # Process appointments for calendar display
@@ -0,0 +1,129 @@
+# provider/services/patient_cohorts.py
+from datetime import timedelta
+
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from common.models import Appointment, Prescription
+
+
+class Cohort:
+    """
+    A patient filter that can be combined with & (AND), | (OR) and ~ (NOT).
+
+    Cohorts wrap a Q over the flag annotations added by
+    PatientCohorts.annotate(), so combined filters stay a single query.
+    """
+
+    def __init__(self, condition=None):
+        self.condition = condition if condition is not None else Q()
+
+    def __and__(self, other):
+        return Cohort(self.condition & other.condition)
+
+    def __or__(self, other):
+        return Cohort(self.condition | other.condition)
+
+    def __invert__(self):
+        return Cohort(~self.condition)
+
+    def apply(self, queryset):
+        return queryset.filter(self.condition)
+
+
+class PatientCohorts:
+    """
+    Cohort engine for a provider's patient panel.
+
+    Each cohort is a correlated EXISTS subquery against appointments or
+    prescriptions for the current patient, so filtering never pulls id
+    lists into Python and pagination happens in the database.
+    """
+
+    RECENT_DAYS = 14
+    URGENT_HOURS = 48
+    ATTENTION_PRESCRIPTION_STATUSES = ['Pending', 'Refill Requested']
+
+    # Cohort name -> annotation holding the per-patient flag
+    FLAGS = {
+        'recent': 'has_recent_activity',
+        'upcoming': 'has_upcoming_appointment',
+        'attention': 'needs_attention',
+    }
+
+    def __init__(self, provider, now=None):
+        self.provider = provider
+        self.now = now or timezone.now()
+
+    def _appointments(self):
+        return Appointment.objects.filter(doctor=self.provider, patient=OuterRef('user_id'))
+
+    def _prescriptions(self):
+        return Prescription.objects.filter(doctor=self.provider, patient=OuterRef('user_id'))
+
+    def recent_activity(self):
+        """Appointment or prescription with this provider in the last two weeks"""
+        since = self.now - timedelta(days=self.RECENT_DAYS)
+        return (
+            Exists(self._appointments().filter(time__gte=since, time__lte=self.now)) |
+            Exists(self._prescriptions().filter(created_at__gte=since))
+        )
+
+    def upcoming_appointment(self):
+        """Scheduled appointment with this provider in the future"""
+        return Exists(self._appointments().filter(time__gte=self.now, status='Scheduled'))
+
+    def needs_attention(self):
+        """Pending prescription or a scheduled appointment in the next 48 hours"""
+        return (
+            Exists(self._prescriptions().filter(status__in=self.ATTENTION_PRESCRIPTION_STATUSES)) |
+            Exists(self._appointments().filter(
+                time__gte=self.now,
+                time__lte=self.now + timedelta(hours=self.URGENT_HOURS),
+                status='Scheduled'
+            ))
+        )
+
+    def annotate(self, queryset):
+        """Add the cohort flags and next/last visit times to a Patient queryset"""
+        return queryset.annotate(
+            has_recent_activity=ExpressionWrapper(self.recent_activity(), output_field=BooleanField()),
+            has_upcoming_appointment=ExpressionWrapper(self.upcoming_appointment(), output_field=BooleanField()),
+            needs_attention=ExpressionWrapper(self.needs_attention(), output_field=BooleanField()),
+            next_appointment=Subquery(
+                self._appointments().filter(time__gte=self.now, status='Scheduled')
+                .order_by('time').values('time')[:1]
+            ),
+            last_visit=Subquery(
+                self._appointments().filter(time__lt=self.now)
+                .order_by('-time').values('time')[:1]
+            ),
+        )
+
+    def cohort(self, name):
+        """Get a named cohort; 'all' (or an empty name) matches every patient"""
+        if not name or name == 'all':
+            return Cohort()
+        if name not in self.FLAGS:
+            raise ValueError(f"Unknown patient cohort: {name}")
+        return Cohort(Q(**{self.FLAGS[name]: True}))
+
+    def combine(self, names, match='all'):
+        """
+        Combine named cohorts, requiring all of them (AND) or any of them (OR)
+        """
+        names = [name for name in names if name and name != 'all']
+        if not names:
+            return Cohort()
+
+        combined = self.cohort(names[0])
+        for name in names[1:]:
+            if match == 'any':
+                combined = combined | self.cohort(name)
+            else:
+                combined = combined & self.cohort(name)
+        return combined
+
+    def filter(self, queryset, names, match='all'):
+        """Annotate a Patient queryset and filter it down to the given cohorts"""
+        return self.combine(names, match).apply(self.annotate(queryset))
@@ -1,11 +1,14 @@
 # provider/services/patient_service.py
 import logging
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Count
 from datetime import datetime, timedelta
 
 from provider.models import Provider
+from provider.services.patient_cohorts import PatientCohorts
+from provider.services.activity_service import ActivityService
 from patient.models import Patient
+from patient.services.duplicate_service import DuplicatePatientService
 from common.models import Appointment, Prescription, Message
 
 logger = logging.getLogger(__name__)
@@ -14,10 +17,10 @@ class PatientService:
     """Service layer for patient-related operations from provider perspective."""
     
     @staticmethod
-    def get_provider_patients_dashboard(provider_id, search_query='', filter_type='all'):
+    def get_provider_patients_dashboard(provider_id, search_query='', filter_type='all', match='all'):
         """
         Get patients dashboard data:
-        - Filtered and searched patients list
+        - Filtered and searched patients list (lazy queryset, paginate in the DB)
         - Patient stats
         - Recent patient activity
         """
@@ -28,112 +31,23 @@ class PatientService:
             # Base queryset - patients where this provider is primary
             patients_queryset = Patient.objects.filter(primary_provider=provider)
             
-            # Apply search filter if provided
+            # Apply search filter if provided (indexed name/OHIP/phone search)
             if search_query:
-                patients_queryset = patients_queryset.filter(
-                    Q(user__first_name__icontains=search_query) | 
-                    Q(user__last_name__icontains=search_query) |
-                    Q(ohip_number__icontains=search_query)
-                )
+                patients_queryset = patients_queryset.search(search_query)
             
-            # Apply type filter
-            if filter_type == 'recent':
-                # Patients with recent activity
-                two_weeks_ago = timezone.now() - timedelta(days=14)
-                
-                # Get patient IDs with recent appointments or prescriptions
-                recent_appointment_patients = Appointment.objects.filter(
-                    doctor=provider,
-                    time__gte=two_weeks_ago
-                ).values_list('patient_id', flat=True).distinct()
-                
-                recent_prescription_patients = Prescription.objects.filter(
-                    doctor=provider,
-                    created_at__gte=two_weeks_ago
-                ).values_list('patient_id', flat=True).distinct()
-                
-                # Combine the patient IDs
-                recent_patient_ids = set(recent_appointment_patients) | set(recent_prescription_patients)
-                
-                # Filter patients by these IDs
-                patients_queryset = patients_queryset.filter(user_id__in=recent_patient_ids)
-                
-            elif filter_type == 'upcoming':
-                # Patients with upcoming appointments
-                upcoming_patient_ids = Appointment.objects.filter(
-                    doctor=provider,
-                    time__gte=timezone.now(),
-                    status='Scheduled'
-                ).values_list('patient_id', flat=True).distinct()
-                
-                patients_queryset = patients_queryset.filter(user_id__in=upcoming_patient_ids)
-                
-            elif filter_type == 'attention':
-                # Patients needing attention (pending prescription renewals, upcoming appointments)
-                attention_patient_ids = set()
-                
-                # Patients with pending prescription requests
-                prescription_patients = Prescription.objects.filter(
-                    doctor=provider,
-                    status__in=['Pending', 'Refill Requested']
-                ).values_list('patient_id', flat=True).distinct()
-                attention_patient_ids.update(prescription_patients)
-                
-                # Patients with upcoming appointments in next 48 hours
-                urgent_appointments = Appointment.objects.filter(
-                    doctor=provider,
-                    time__gte=timezone.now(),
-                    time__lte=timezone.now() + timedelta(hours=48),
-                    status='Scheduled'
-                ).values_list('patient_id', flat=True).distinct()
-                attention_patient_ids.update(urgent_appointments)
-                
-                patients_queryset = patients_queryset.filter(user_id__in=attention_patient_ids)
-            
-            # Get recent patient activity
-            recent_activity = []
-            
-            # Recent appointments
-            recent_appointments = Appointment.objects.filter(
-                doctor=provider
-            ).order_by('-time')[:10]
-            
-            for appointment in recent_appointments:
-                if hasattr(appointment, 'patient') and hasattr(appointment.patient, 'get_full_name'):
-                    patient_name = appointment.patient.get_full_name()
-                else:
-                    patient_name = f"{appointment.patient.first_name} {appointment.patient.last_name}" if appointment.patient else "Unknown Patient"
-                
-                recent_activity.append({
-                    'type': 'appointment',
-                    'patient_id': appointment.patient.id if appointment.patient else None,
-                    'patient_name': patient_name,
-                    'date': appointment.time,
-                    'description': f"Appointment ({appointment.get_status_display()})"
-                })
-            
-            # Recent prescriptions
-            recent_prescriptions = Prescription.objects.filter(
-                doctor=provider
-            ).order_by('-created_at')[:10]
-            
-            for prescription in recent_prescriptions:
-                if hasattr(prescription, 'patient') and hasattr(prescription.patient, 'get_full_name'):
-                    patient_name = prescription.patient.get_full_name()
-                else:
-                    patient_name = f"{prescription.patient.first_name} {prescription.patient.last_name}" if prescription.patient else "Unknown Patient"
-                
-                recent_activity.append({
-                    'type': 'prescription',
-                    'patient_id': prescription.patient.id if prescription.patient else None,
-                    'patient_name': patient_name,
-                    'date': prescription.created_at,
-                    'description': f"Prescription: {prescription.medication_name}"
-                })
+            # Apply cohort filters (e.g. 'recent', 'upcoming,attention') as
+            # correlated EXISTS subqueries; flags are annotated on every patient
+            cohorts = PatientCohorts(provider)
+            filter_names = [
+                name.strip() for name in (filter_type or 'all').split(',')
+                if name.strip() in PatientCohorts.FLAGS
+            ]
+            patients_queryset = cohorts.filter(
+                patients_queryset.select_related('user'), filter_names, match
+            )
             
-            # Sort all activity by date (newest first)
-            recent_activity.sort(key=lambda x: x['date'], reverse=True)
-            recent_activity = recent_activity[:10]  # Limit to 10 most recent
+            # Get recent patient activity from the activity feed
+            recent_activity = ActivityService.get_recent_activity(provider.id, limit=10)
             
             # Calculate stats
             stats = {
@@ -228,6 +142,9 @@ class PatientService:
                 primary_provider=provider
             )
             
+            # Flag likely duplicates (typos, name changes) for review
+            possible_duplicates = DuplicatePatientService.check_patient(patient)
+            
             # Handle document upload to cloud if provided in the form
             cloud_upload_result = {'success': True}
             
@@ -247,6 +164,7 @@ class PatientService:
             return {
                 'success': True,
                 'patient_id': patient.id,
+                'possible_duplicates': possible_duplicates,
                 'cloud_upload': cloud_upload_result
             }
             
@@ -27,7 +27,7 @@ class ProviderService:
         """
         try:
             provider = Provider.objects.get(id=provider_id)
-            today = timezone.now().date()
+            today = timezone.localdate()
             
             # Get patients for this provider
             patients = Patient.objects.filter(primary_provider=provider).order_by('-user__date_joined')
@@ -47,9 +47,8 @@ class ProviderService:
             
             # Calculate stats
             stats = {
-                'today_appointments': Appointment.objects.filter(
-                    doctor=provider,
-                    time__date=today
+                'today_appointments': Appointment.objects.for_provider_day(
+                    provider, today
                 ).count(),
                 'completed_appointments': Appointment.objects.filter(
                     doctor=provider,
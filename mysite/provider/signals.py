@@ -1,9 +1,12 @@
 # provider/signals.py
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Provider
+from .models import Provider, GeneratedDocument
+from common.models import Appointment, Prescription, Message
+from common.signals import remember_previous_status
+from provider.services.activity_service import ActivityService
 from common.utils.ldap_client import LDAPClient
 import logging
 
@@ -74,3 +77,73 @@ def provider_saved(sender, instance, created, **kwargs):
     
     # Clean up
     ldap_client.disconnect()
+
+
+# Activity feed (see provider.services.activity_service)
+
+# Appointment and Prescription statuses are remembered by common.signals
+pre_save.connect(remember_previous_status, sender=GeneratedDocument, dispatch_uid='document_previous_status')
+
+
+def _activity_action(instance, created):
+    """Get 'created', 'status_changed' or None when nothing feed-worthy changed"""
+    if created:
+        return 'created'
+    if getattr(instance, '_previous_status', None) != instance.status:
+        return 'status_changed'
+    return None
+
+
+@receiver(post_save, sender=Appointment)
+def appointment_activity(sender, instance, created, raw=False, **kwargs):
+    action = None if raw else _activity_action(instance, created)
+    if action:
+        ActivityService.record(
+            instance.doctor_id, 'appointment', action,
+            f"Appointment ({instance.get_status_display()})",
+            patient=instance.patient, object_id=instance.id
+        )
+
+
+@receiver(post_save, sender=Prescription)
+def prescription_activity(sender, instance, created, raw=False, **kwargs):
+    action = None if raw else _activity_action(instance, created)
+    if action:
+        description = f"Prescription: {instance.medication_name}"
+        if action == 'status_changed':
+            description = f"{description} ({instance.status})"
+        ActivityService.record(
+            instance.doctor_id, 'prescription', action, description,
+            patient=instance.patient, object_id=instance.id
+        )
+
+
+@receiver(post_save, sender=GeneratedDocument)
+def document_activity(sender, instance, created, raw=False, **kwargs):
+    action = None if raw else _activity_action(instance, created)
+    if action:
+        ActivityService.record(
+            instance.provider_id, 'document', action,
+            f"Document: {instance.template.name} ({instance.get_status_display()})",
+            patient=instance.patient, object_id=instance.id
+        )
+
+
+@receiver(post_save, sender=Message)
+def message_activity(sender, instance, created, raw=False, **kwargs):
+    if raw or not created or instance.status == 'draft':
+        return
+
+    # Record the message on the feed of whichever side is a provider
+    providers = Provider.objects.filter(
+        user_id__in=[instance.sender_id, instance.recipient_id]
+    ).values_list('id', 'user_id')
+    for provider_id, user_id in providers:
+        if user_id == instance.sender_id:
+            patient, description = instance.recipient, f"Message sent: {instance.subject}"
+        else:
+            patient, description = instance.sender, f"Message received: {instance.subject}"
+        ActivityService.record(
+            provider_id, 'message', 'created', description,
+            patient=patient, object_id=instance.id
+        )
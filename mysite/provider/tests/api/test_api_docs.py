@@ -0,0 +1,79 @@
+# provider/tests/api/test_api_docs.py
+import json
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api import schema
+
+class PrecomputedApiDocsTests(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.docs_root = tempfile.mkdtemp(prefix='api-docs-')
+        cls.docs_settings = override_settings(API_DOCS_ROOT=cls.docs_root)
+        cls.docs_settings.enable()
+        schema.build()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.docs_settings.disable()
+        shutil.rmtree(cls.docs_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        schema._verified.clear()
+        self.user = User.objects.create_user(username='reader', password='secret-pass-123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_schema_is_served_from_artifacts(self):
+        with mock.patch('api.schema.OpenAPISchemaGenerator') as generator:
+            response = self.client.get('/api/docs.json')
+            yaml_response = self.client.get('/api/docs.yaml')
+        generator.assert_not_called()
+
+        self.assertEqual(response.status_code, 200)
+        document = json.loads(response.content)
+        self.assertIn('/provider/appointments/', document['paths'])
+        self.assertNotIn('host', document)
+        self.assertEqual(response['ETag'], f'"{schema.source_fingerprint()}"')
+        self.assertTrue(yaml_response['Content-Type'].startswith('application/yaml'))
+        self.assertIn(b'swagger:', yaml_response.content)
+
+    def test_unchanged_schema_is_not_modified(self):
+        etag = self.client.get('/api/docs.json')['ETag']
+        response = self.client.get('/api/docs.json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_code_change_regenerates_artifacts(self):
+        with mock.patch('api.schema.source_fingerprint', return_value='changed'), \
+                mock.patch('api.schema.build', wraps=schema.build) as build:
+            self.client.get('/api/docs.json')
+            response = self.client.get('/api/docs.json')
+        build.assert_called_once()
+        self.assertEqual(response['ETag'], '"changed"')
+        self.assertEqual(schema.built_fingerprint(), 'changed')
+
+    def test_reference_page(self):
+        response = self.client.get('/api/reference/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+        self.assertIn(b'<h2>AppointmentViewSet</h2>', response.content)
+
+    def test_docs_require_authentication(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get('/api/docs.json').status_code, 401)
+        self.assertEqual(self.client.get('/api/reference/').status_code, 401)
+
+    def test_build_command_skips_fresh_artifacts(self):
+        out = StringIO()
+        call_command('generate_api_docs', '--artifacts', '--if-stale', stdout=out)
+        self.assertIn('up to date', out.getvalue())
@@ -0,0 +1,64 @@
+# provider/tests/api/test_appointment_api.py
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from common.models import Appointment
+from provider.tests.base import ProviderAPITestCase
+
+
+# Measures the queries behind a response, so bypass the response cache
+@override_settings(API_RESPONSE_CACHE_ENABLED=False)
+class ProviderAppointmentQueryCountTests(ProviderAPITestCase):
+    url = '/api/v1/provider/appointments/'
+
+    def setUp(self):
+        super().setUp()
+
+    def create_appointments(self, count):
+        start = timezone.now() + timedelta(days=1)
+        for i in range(count):
+            patient = User.objects.create_user(
+                username=f'patient{Appointment.objects.count()}',
+                first_name='Pat', last_name=f'Ient{i}'
+            )
+            Appointment.objects.create(
+                patient=patient, doctor=self.provider, time=start + timedelta(hours=i)
+            )
+
+    def count_list_queries(self, path):
+        # Fresh user so cached relations don't hide queries
+        self.client.force_authenticate(user=User.objects.get(pk=self.user.pk))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.create_appointments(2)
+        small = self.count_list_queries(self.url)
+
+        self.create_appointments(8)
+        full = self.count_list_queries(self.url)
+
+        self.assertEqual(small, full)
+
+    def test_today_query_count_is_constant(self):
+        today_url = f'{self.url}today/'
+        now = timezone.now()
+        Appointment.objects.create(
+            patient=User.objects.create_user(username='today1'), doctor=self.provider, time=now
+        )
+        small = self.count_list_queries(today_url)
+
+        for i in range(5):
+            Appointment.objects.create(
+                patient=User.objects.create_user(username=f'today{i + 2}'), doctor=self.provider, time=now
+            )
+        full = self.count_list_queries(today_url)
+
+        self.assertEqual(small, full)
@@ -0,0 +1,167 @@
+# provider/tests/api/test_bulk_api.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from common.models import Appointment, Message, Prescription
+from provider.models import ActivityEvent
+from provider.tests.base import ProviderAPITestCase
+
+
+@override_settings(API_RESPONSE_CACHE_ENABLED=False)
+class BulkWriteTests(ProviderAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+
+    def create_patients(self, count):
+        start = User.objects.count()
+        return [
+            User.objects.create_user(username=f'patient{start + i}', first_name='Pat', last_name=f'Ient{i}')
+            for i in range(count)
+        ]
+
+    def prescription_items(self, patients):
+        return [
+            {'medication_name': f'Medication {i}', 'dosage': '10mg', 'patient': patient.pk,
+             'doctor': self.provider.pk, 'refills': 2}
+            for i, patient in enumerate(patients)
+        ]
+
+    def test_bulk_create_prescriptions(self):
+        patients = self.create_patients(3)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/v1/provider/prescriptions/bulk/', self.prescription_items(patients), format='json'
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['succeeded'], 3)
+        self.assertEqual(Prescription.objects.count(), 3)
+        # Save-time defaults and post_save receivers still run
+        self.assertEqual(set(Prescription.objects.values_list('refills_remaining', flat=True)), {2})
+        self.assertEqual(
+            ActivityEvent.objects.filter(event_type='prescription', action='created').count(), 3
+        )
+
+    def test_write_query_count_is_constant(self):
+        def count_queries(patients):
+            with mock.patch.object(post_save, 'send'):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.post(
+                        '/api/v1/provider/prescriptions/bulk/', self.prescription_items(patients), format='json'
+                    )
+            self.assertEqual(response.status_code, 201)
+            return len(context.captured_queries)
+
+        small = count_queries(self.create_patients(2))
+        large = count_queries(self.create_patients(8))
+        self.assertEqual(small, large)
+
+    def test_mixed_batch_reports_each_item(self):
+        patient = self.create_patients(1)[0]
+        items = [
+            {'patient': patient.pk, 'doctor': self.provider.pk, 'time': timezone.now().isoformat()},
+            {'patient': 999999, 'doctor': self.provider.pk, 'time': timezone.now().isoformat()},
+            {'patient': patient.pk, 'doctor': self.provider.pk},
+        ]
+        response = self.client.post('/api/v1/provider/appointments/bulk/', items, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        results = response.json()['results']
+        self.assertEqual([result['status'] for result in results], ['created', 'invalid', 'invalid'])
+        self.assertIn('patient', results[1]['errors'])
+        self.assertIn('time', results[2]['errors'])
+        self.assertEqual(Appointment.objects.count(), 1)
+
+    def test_bulk_update_skips_other_providers_rows(self):
+        patient = self.create_patients(1)[0]
+        other = self.create_provider('drother', specialty='Cardiology')
+        mine = Appointment.objects.create(patient=patient, doctor=self.provider, time=timezone.now())
+        theirs = Appointment.objects.create(patient=patient, doctor=other, time=timezone.now())
+
+        response = self.client.patch('/api/v1/provider/appointments/bulk/', [
+            {'id': mine.pk, 'status': 'Completed'},
+            {'id': theirs.pk, 'status': 'Completed'},
+            {'status': 'Completed'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            [result['status'] for result in response.json()['results']], ['updated', 'not_found', 'invalid']
+        )
+        mine.refresh_from_db()
+        theirs.refresh_from_db()
+        self.assertEqual(mine.status, 'Completed')
+        self.assertEqual(theirs.status, 'Scheduled')
+        self.assertTrue(
+            ActivityEvent.objects.filter(event_type='appointment', action='status_changed', object_id=mine.pk).exists()
+        )
+
+    def test_bulk_status_marks_messages_read(self):
+        sender = User.objects.create_user(username='sender')
+        messages = [
+            Message.objects.create(sender=sender, recipient=self.user, subject=f'Hello {i}', content='Hi')
+            for i in range(3)
+        ]
+
+        response = self.client.post('/api/v1/provider/messages/bulk-status/', {
+            'ids': [message.pk for message in messages], 'status': 'read'
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            Message.objects.filter(status='read', read_at__isnull=False).count(), 3
+        )
+
+        response = self.client.post('/api/v1/provider/messages/bulk-status/', {
+            'ids': [messages[0].pk], 'status': 'bogus'
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_status_is_limited_to_received_messages(self):
+        other = User.objects.create_user(username='other')
+        received = Message.objects.create(sender=other, recipient=self.user, subject='In', content='Hi')
+        sent = Message.objects.create(sender=self.user, recipient=other, subject='Out', content='Hi')
+
+        response = self.client.post('/api/v1/provider/messages/bulk-status/', {
+            'ids': [received.pk, sent.pk], 'status': 'archived'
+        }, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([item['status'] for item in response.json()['results']], ['updated', 'forbidden'])
+
+        response = self.client.post('/api/v1/provider/messages/bulk-status/', {
+            'ids': [received.pk], 'status': 'deleted'
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_recipient_cannot_edit_or_delete_messages(self):
+        other = User.objects.create_user(username='other')
+        message = Message.objects.create(sender=other, recipient=self.user, subject='Original', content='Hi')
+
+        response = self.client.patch(f'/api/v1/provider/messages/{message.pk}/', {'subject': 'Changed'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.delete(f'/api/v1/provider/messages/{message.pk}/').status_code, 403)
+        message.refresh_from_db()
+        self.assertEqual(message.subject, 'Original')
+
+    def test_patients_cannot_change_message_status(self):
+        patient = User.objects.create_user(username='patient')
+        message = Message.objects.create(sender=self.user, recipient=patient, subject='Hello', content='Hi')
+        self.client.force_authenticate(user=patient)
+        response = self.client.post('/api/v1/provider/messages/bulk-status/', {
+            'ids': [message.pk], 'status': 'read'
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(API_BULK_MAX_ITEMS=2)
+    def test_batch_size_is_limited(self):
+        items = self.prescription_items(self.create_patients(3))
+        response = self.client.post('/api/v1/provider/prescriptions/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Prescription.objects.exists())
@@ -0,0 +1,75 @@
+# provider/tests/api/test_conditional_get.py
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+
+from common.models import Appointment
+from provider.tests.base import ProviderAPITestCase
+
+
+class ConditionalGetTests(ProviderAPITestCase):
+    url = '/api/v1/provider/appointments/'
+
+    def setUp(self):
+        super().setUp()
+        start = timezone.now() + timedelta(days=1)
+        self.appointments = [
+            Appointment.objects.create(
+                patient=User.objects.create_user(username=f'patient{i}'),
+                doctor=self.provider, time=start + timedelta(hours=i)
+            )
+            for i in range(3)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_returns_304_without_serializing(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        # Only the validator aggregate; no page or count queries
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.appointments[0].status = 'Completed'
+        self.appointments[0].save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.appointments[1].delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_list_etag_varies_with_query(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(f'{self.url}?ordering=-time', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_conditional_get(self):
+        detail_url = f'{self.url}{self.appointments[0].id}/'
+        response = self.client.get(detail_url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(
+            self.client.get(detail_url, HTTP_IF_MODIFIED_SINCE=http_date()).status_code, 304
+        )
+
+        self.appointments[0].notes = 'Bring lab results'
+        self.appointments[0].save()
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,57 @@
+# provider/tests/api/test_legacy_paths.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api import legacy
+from common.models import Message
+
+
+class LegacyApiAliasTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='secret-pass-123', is_staff=True)
+        self.other = User.objects.create_user(username='other', password='secret-pass-123')
+        self.token = Token.objects.create(user=self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_resolve_alias(self):
+        self.assertEqual(legacy.resolve_alias('/api/provider/appointments/4/'),
+                         ('provider', '/api/v1/provider/appointments/4/'))
+        self.assertEqual(legacy.resolve_alias('/api/users'), ('users', '/api/v1/users'))
+        self.assertEqual(legacy.resolve_alias('/api/'), ('root', '/api/v1/'))
+        self.assertIsNone(legacy.resolve_alias('/api/v1/users/'))
+        self.assertIsNone(legacy.resolve_alias('/api/providers/'))
+
+    def test_legacy_path_is_served_without_redirect(self):
+        legacy_response = self.client.get('/api/users/')
+        self.assertEqual(legacy_response.status_code, 200)
+        self.assertEqual(legacy_response.json(), self.client.get('/api/v1/users/').json())
+
+    def test_legacy_post_keeps_its_body(self):
+        response = self.client.post(
+            '/api/patient/messages/',
+            {'sender': self.admin.pk, 'recipient': self.other.pk, 'subject': 'Refill', 'content': 'Please renew'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertTrue(Message.objects.filter(sender=self.admin, subject='Refill').exists())
+
+    def test_missing_trailing_slash_redirects_to_v1(self):
+        response = self.client.get('/api/groups')
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response['Location'], '/api/v1/groups/')
+
+    def test_hits_are_counted_per_alias(self):
+        self.client.get('/api/users/')
+        self.client.get('/api/users/')
+        self.client.get('/api/')
+        self.client.get('/api/v1/users/')
+
+        stats = self.client.get('/api/v1/legacy-api-stats/').json()
+        self.assertEqual(stats['users']['requests'], 2)
+        self.assertEqual(stats['root']['requests'], 1)
+        self.assertEqual(stats['provider']['requests'], 0)
+        self.assertIsNotNone(stats['users']['last_seen'])
+        self.assertIsNone(stats['provider']['last_seen'])
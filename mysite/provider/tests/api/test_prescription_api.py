@@ -0,0 +1,51 @@
+# provider/tests/api/test_prescription_api.py
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from common.models import Prescription
+from provider.tests.base import ProviderAPITestCase
+
+
+class ProviderPrescriptionQueryCountTests(ProviderAPITestCase):
+    url = '/api/v1/provider/prescriptions/'
+
+    def setUp(self):
+        super().setUp()
+
+    def create_prescriptions(self, count):
+        for i in range(count):
+            patient = User.objects.create_user(
+                username=f'patient{Prescription.objects.count()}',
+                first_name='Pat', last_name=f'Ient{i}'
+            )
+            Prescription.objects.create(
+                medication_name=f'Medication {i}', dosage='10mg',
+                patient=patient, doctor=self.provider
+            )
+
+    def count_list_queries(self, path):
+        # Fresh user so cached relations don't hide queries
+        self.client.force_authenticate(user=User.objects.get(pk=self.user.pk))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.create_prescriptions(2)
+        small = self.count_list_queries(self.url)
+
+        self.create_prescriptions(8)
+        full = self.count_list_queries(self.url)
+
+        self.assertEqual(small, full)
+
+    def test_pending_query_count_is_constant(self):
+        self.create_prescriptions(1)
+        small = self.count_list_queries(f'{self.url}pending/')
+
+        self.create_prescriptions(6)
+        full = self.count_list_queries(f'{self.url}pending/')
+
+        self.assertEqual(small, full)
@@ -0,0 +1,137 @@
+# provider/tests/api/test_rate_limit.py
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api import throttling
+from api.checks import check_shared_caches
+
+LIMITS = {
+    'read': {'capacity': 3, 'rate': 0.5},
+    'search': {'capacity': 2, 'rate': 0.5},
+    'write': {'capacity': 2, 'rate': 0.5},
+}
+
+
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_burst_then_refill(self):
+        now = 1_000_000_000
+        for _ in range(3):
+            self.assertTrue(throttling.take('bucket', 3, 2, now_us=now)[0])
+        allowed, wait = throttling.take('bucket', 3, 2, now_us=now)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 0.5, places=3)
+        # Denied requests don't drain the bucket further
+        self.assertFalse(throttling.take('bucket', 3, 2, now_us=now)[0])
+        self.assertTrue(throttling.take('bucket', 3, 2, now_us=now + 500_000)[0])
+
+    def test_idle_bucket_refills_to_capacity(self):
+        now = 1_000_000_000
+        for _ in range(3):
+            throttling.take('bucket', 3, 2, now_us=now)
+        later = now + 60_000_000
+        self.assertEqual(
+            [throttling.take('bucket', 3, 2, now_us=later)[0] for _ in range(4)],
+            [True, True, True, False]
+        )
+
+    def test_saturated_bucket_outlives_cache_timeout(self):
+        # Requests every 0.1s against 2/s for well past the key's cache
+        # timeout; the cache's clock follows now_us
+        start = 1_000_000_000
+        allowed = 0
+        for step in range(301):
+            now = start + step * 100_000
+            with mock.patch('time.time', return_value=now / 1_000_000):
+                allowed += throttling.take('bucket', 3, 2, now_us=now)[0]
+        # The initial burst plus refill over 30 seconds
+        self.assertEqual(allowed, 3 + 2 * 30)
+
+    def test_concurrent_clients_are_isolated(self):
+        results = {'noisy': [], 'quiet': []}
+
+        def hammer():
+            for _ in range(200):
+                results['noisy'].append(throttling.take('noisy', 20, 1)[0])
+
+        threads = [threading.Thread(target=hammer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(5):
+            results['quiet'].append(throttling.take('quiet', 20, 1)[0])
+        for thread in threads:
+            thread.join()
+
+        # The burst is shared by the noisy client's threads, with at most
+        # a request or two of refill while they run
+        self.assertLessEqual(results['noisy'].count(True), 22)
+        self.assertGreaterEqual(results['noisy'].count(True), 20)
+        self.assertEqual(results['quiet'], [True] * 5)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_process_local_cache_is_flagged(self):
+        warnings = [warning.id for warning in check_shared_caches(None)]
+        self.assertIn('api.W002', warnings)
+        with override_settings(API_RATE_LIMIT_ENABLED=False):
+            self.assertNotIn('api.W002', [warning.id for warning in check_shared_caches(None)])
+
+    def test_load_test_command(self):
+        out = StringIO()
+        call_command('load_test_rate_limits', '--requests', '100', '--noisy-clients', '2', stdout=out)
+        self.assertIn('Limiter overhead', out.getvalue())
+        self.assertNotIn('not isolated', out.getvalue())
+
+
+@override_settings(API_RATE_LIMITS=LIMITS)
+class RateLimitApiTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='limited', password='secret-pass-123')
+        self.other = User.objects.create_user(username='other', password='secret-pass-123')
+        self.token = Token.objects.create(user=self.user)
+        self.other_token = Token.objects.create(user=self.other)
+
+    def get(self, token, path='/api/v1/sync/'):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_exhausted_bucket_returns_429_with_retry_after(self):
+        for _ in range(3):
+            self.assertEqual(self.get(self.token).status_code, 200)
+        response = self.get(self.token)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(int(response['Retry-After']), 2)
+
+    def test_clients_have_separate_buckets(self):
+        for _ in range(4):
+            self.get(self.token)
+        self.assertEqual(self.get(self.other_token).status_code, 200)
+
+    def test_scopes_have_separate_buckets(self):
+        for _ in range(2):
+            self.assertEqual(self.get(self.token, '/api/v1/sync/?search=x').status_code, 200)
+        self.assertEqual(self.get(self.token, '/api/v1/sync/?search=x').status_code, 429)
+        # Plain reads are still allowed
+        self.assertEqual(self.get(self.token).status_code, 200)
+
+    @override_settings(API_RATE_LIMIT_ENABLED=False)
+    def test_can_be_disabled(self):
+        for _ in range(5):
+            self.assertEqual(self.get(self.token).status_code, 200)
+
+    def test_overhead_is_under_a_millisecond(self):
+        started = time.perf_counter()
+        for _ in range(1000):
+            throttling.take('bench', 100_000, 1000)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.assertLess(elapsed_ms / 1000, 1)
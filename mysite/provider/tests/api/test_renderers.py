@@ -0,0 +1,61 @@
+# provider/tests/api/test_renderers.py
+import datetime
+import uuid
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    data = {
+        'utc': datetime.datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'naive': datetime.datetime(2026, 3, 1, 9, 30),
+        'offset': datetime.datetime(2026, 3, 1, 9, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+        'date': datetime.date(2026, 3, 1),
+        'time': datetime.time(9, 30),
+        'duration': datetime.timedelta(minutes=90),
+        'amount': Decimal('12.50'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'label': gettext_lazy('Scheduled'),
+        'text': 'caf\u00e9 \u2028 line \u2029',
+        1: ['nested', None, True, 1.5],
+    }
+
+    def test_matches_stdlib_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indented_output_uses_stdlib(self):
+        media_type = 'application/json; indent=2'
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type), JSONRenderer().render(self.data, media_type)
+        )
+
+    def test_falls_back_for_unsupported_values(self):
+        data = {'big': 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def test_matches_stdlib_parser(self):
+        body = '{"subject": "café", "ids": [1, 2], "nested": {"ok": true}}'.encode()
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+
+    def test_rejects_invalid_json(self):
+        for body in [b'{"a": ', b'{"a": NaN}']:
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(BytesIO(body))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_json', rows=20, repeat=1, stdout=out)
+        self.assertIn('appointments', out.getvalue())
+        self.assertNotIn('differs', out.getvalue())
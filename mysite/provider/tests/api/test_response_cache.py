@@ -0,0 +1,121 @@
+# provider/tests/api/test_response_cache.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from api import response_cache
+from common.models import Appointment, Message
+from patient.models import Patient
+from provider.tests.base import ProviderAPITestCase
+
+
+class ResponseCacheTests(ProviderAPITestCase):
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+
+    def create_patient(self, username, provider=None):
+        return Patient.objects.create(
+            user=User.objects.create_user(username=username), date_of_birth='1990-01-01',
+            primary_phone='123-456-7890', address='123 Test St', primary_provider=provider,
+            emergency_contact_name='Emergency Contact', emergency_contact_phone='987-654-3210'
+        )
+
+    def test_today_is_cached_until_an_appointment_changes(self):
+        url = '/api/v1/provider/appointments/today/'
+        patient = User.objects.create_user(username='patient1')
+        with self.captureOnCommitCallbacks(execute=True):
+            Appointment.objects.create(patient=patient, doctor=self.provider, time=timezone.now())
+
+        first = self.client.get(url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Appointment.objects.create(patient=patient, doctor=self.provider, time=timezone.now())
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()), 2)
+
+    def test_cache_key_includes_query_params(self):
+        url = '/api/v1/provider/appointments/upcoming/'
+        self.assertEqual(self.client.get(f'{url}?b=2&a=1')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(f'{url}?a=1&b=2')['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(f'{url}?a=3')['X-Cache'], 'MISS')
+
+    def test_inbox_invalidated_by_new_message(self):
+        url = '/api/v1/provider/messages/inbox/'
+        sender = User.objects.create_user(username='sender')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Message.objects.create(sender=sender, recipient=self.user, subject='Hello', content='Hi')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_patient_reassignment_invalidates_both_providers(self):
+        url = '/api/v1/provider/patients/'
+        other = self.create_provider('drother', specialty='Cardiology')
+        with self.captureOnCommitCallbacks(execute=True):
+            patient = self.create_patient('patient1', provider=self.provider)
+
+        self.assertEqual(self.client.get(url).json()['count'], 1)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            patient.primary_provider = other
+            patient.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_stats_endpoint(self):
+        url = '/api/v1/provider/appointments/today/'
+        self.client.get(url)
+        self.client.get(url)
+
+        self.assertEqual(self.client.get('/api/v1/cache-stats/').status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        stats = self.client.get('/api/v1/cache-stats/').json()
+        self.assertEqual(stats['appointments']['hit'], 1)
+        self.assertEqual(stats['appointments']['miss'], 1)
+        self.assertEqual(stats['appointments']['hit_ratio'], 0.5)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_waits_for_concurrent_recomputation(self):
+        cache.add('key:lock', 1)
+        compute = mock.Mock(return_value=('fresh', True))
+
+        # The request holding the lock finishes while this one waits
+        with mock.patch('api.response_cache.time.sleep', side_effect=lambda _: cache.set('key', 'shared')):
+            self.assertEqual(response_cache.get_or_compute('appointments', 'key', compute), 'shared')
+        compute.assert_not_called()
+        self.assertEqual(response_cache.get_stats()['appointments']['coalesced'], 1)
+
+    def test_computes_when_lock_holder_gives_up(self):
+        cache.add('key:lock', 1)
+        compute = mock.Mock(return_value=('fresh', True))
+
+        with mock.patch('api.response_cache.time.sleep', side_effect=lambda _: cache.delete('key:lock')):
+            self.assertEqual(response_cache.get_or_compute('appointments', 'key', compute), 'fresh')
+        compute.assert_called_once()
+        self.assertEqual(cache.get('key'), 'fresh')
+
+    def test_uncacheable_results_are_not_stored(self):
+        response_cache.get_or_compute('appointments', 'key', lambda: ('error', False))
+        self.assertIsNone(cache.get('key'))
+        self.assertIsNone(cache.get('key:lock'))
@@ -0,0 +1,62 @@
+# provider/tests/api/test_sparse_fields.py
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from provider.models import DocumentTemplate, GeneratedDocument
+from provider.tests.base import ProviderAPITestCase
+
+
+class SparseFieldsetTests(ProviderAPITestCase):
+    url = '/api/v1/provider/documents/'
+
+    def setUp(self):
+        super().setUp()
+        template = DocumentTemplate.objects.create(name='Sick Note', template_content='{}')
+        self.document = GeneratedDocument.objects.create(
+            patient=User.objects.create_user(username='patient1', first_name='Pat', last_name='Ient'),
+            provider=self.provider, template=template,
+            document_data='{"reason": "flu"}', rendered_content='<p>' + 'x' * 1000 + '</p>'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def get_with_sql(self, path):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        select = next(q['sql'] for q in context.captured_queries if 'FROM "provider_generateddocument"' in q['sql']
+                      and 'COUNT' not in q['sql'])
+        return response.json(), select
+
+    def test_list_defers_heavy_fields_by_default(self):
+        data, sql = self.get_with_sql(self.url)
+        row = data['results'][0]
+        self.assertEqual(row['patient_name'], 'Pat Ient')
+        for name in ('document_data', 'rendered_content', 'html_content'):
+            self.assertNotIn(name, row)
+        self.assertNotIn('document_data', sql)
+        self.assertNotIn('rendered_content', sql)
+
+    def test_expand_includes_heavy_fields(self):
+        data, sql = self.get_with_sql(f'{self.url}?expand=html_content')
+        row = data['results'][0]
+        self.assertTrue(row['html_content'].startswith('<p>x'))
+        self.assertNotIn('document_data', row)
+        # html_content is rendered from rendered_content
+        self.assertIn('rendered_content', sql)
+        self.assertNotIn('document_data', sql)
+
+    def test_fields_limits_columns(self):
+        data, sql = self.get_with_sql(f'{self.url}?fields=status,document_data')
+        self.assertEqual(data['results'][0], {
+            'id': self.document.id, 'status': 'draft', 'document_data': '{"reason": "flu"}'
+        })
+        self.assertNotIn('"provider_generateddocument"."pdf_storage_path"', sql)
+
+    def test_detail_includes_everything(self):
+        data = self.client.get(f'{self.url}{self.document.id}/').json()
+        self.assertEqual(data['document_data'], '{"reason": "flu"}')
+        self.assertIn('html_content', data)
+
+        data = self.client.get(f'{self.url}{self.document.id}/?fields=status').json()
+        self.assertEqual(set(data) - {'api_version'}, {'id', 'status'})
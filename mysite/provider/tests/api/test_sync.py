@@ -0,0 +1,105 @@
+# provider/tests/api/test_sync.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from api import sync
+from api.models import SyncChange
+from common.models import Appointment, Message, Prescription
+from provider.tests.base import ProviderAPITestCase
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class DeltaSyncTests(ProviderAPITestCase):
+    url = '/api/v1/sync/'
+
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_provider('drother', specialty='Cardiology')
+        self.patient = User.objects.create_user(username='patient1', first_name='Pat', last_name='Ient')
+        self.client.force_authenticate(user=self.user)
+
+    def sync(self, cursor=None, **params):
+        if cursor:
+            params['cursor'] = cursor
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_returns_changes_since_cursor(self):
+        appointment = Appointment.objects.create(patient=self.patient, doctor=self.provider, time=timezone.now())
+        first = self.sync()
+        self.assertEqual(
+            [(c['type'], c['id'], c['op']) for c in first['changes']], [('appointment', appointment.pk, 'upsert')]
+        )
+        self.assertEqual(first['changes'][0]['data']['status'], 'Scheduled')
+
+        self.assertEqual(self.sync(first['cursor'])['changes'], [])
+
+        appointment.status = 'Completed'
+        appointment.save()
+        prescription = Prescription.objects.create(
+            medication_name='Medication', dosage='10mg', patient=self.patient, doctor=self.provider
+        )
+        second = self.sync(first['cursor'])
+        self.assertEqual(
+            [(c['type'], c['id']) for c in second['changes']],
+            [('appointment', appointment.pk), ('prescription', prescription.pk)]
+        )
+        self.assertEqual(second['changes'][0]['data']['status'], 'Completed')
+
+    def test_only_visible_objects_are_synced(self):
+        Appointment.objects.create(patient=self.patient, doctor=self.other, time=timezone.now())
+        Message.objects.create(sender=self.patient, recipient=self.other.user, subject='Hi', content='Hi')
+        self.assertEqual(self.sync()['changes'], [])
+
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_deletes_and_reassignments_leave_tombstones(self):
+        appointment = Appointment.objects.create(patient=self.patient, doctor=self.provider, time=timezone.now())
+        message = Message.objects.create(sender=self.patient, recipient=self.user, subject='Hi', content='Hi')
+        cursor = self.sync()['cursor']
+
+        appointment.doctor = self.other
+        appointment.save()
+        message_id = message.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            message.delete()
+
+        changes = self.sync(cursor)['changes']
+        self.assertEqual(
+            [(c['type'], c['id'], c['op']) for c in changes],
+            [('appointment', appointment.pk, 'delete'), ('message', message_id, 'delete')]
+        )
+
+    def test_pages_follow_the_cursor(self):
+        for i in range(5):
+            Message.objects.create(sender=self.patient, recipient=self.user, subject=f'Hi {i}', content='Hi')
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = self.sync(cursor, limit=2)
+            seen.extend(change['data']['subject'] for change in page['changes'])
+            cursor, pages = page['cursor'], pages + 1
+            if not page['has_more']:
+                break
+        self.assertEqual(seen, [f'Hi {i}' for i in range(5)])
+        self.assertEqual(pages, 3)
+
+    def test_compaction_keeps_latest_change(self):
+        appointment = Appointment.objects.create(patient=self.patient, doctor=self.provider, time=timezone.now())
+        for status in ['Checked In', 'In Progress', 'Completed']:
+            appointment.status = status
+            appointment.save()
+        cursor = sync.encode_cursor(0)
+
+        call_command('compact_sync_log', stdout=mock.Mock())
+
+        self.assertEqual(SyncChange.objects.filter(user=self.user).count(), 1)
+        changes = self.sync(cursor)['changes']
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]['data']['status'], 'Completed')
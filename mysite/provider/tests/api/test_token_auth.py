@@ -0,0 +1,156 @@
+# provider/tests/api/test_token_auth.py
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from api.authentication import CachedTokenAuthentication, get_token_cache, rotate_token
+from api.checks import check_shared_caches
+
+TOKEN_CACHE_DIR = tempfile.mkdtemp(prefix='api-token-cache-')
+
+# A file based cache is shared by every process on the host, like Redis
+SHARED_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'tokens': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': TOKEN_CACHE_DIR},
+}
+
+
+def tearDownModule():
+    shutil.rmtree(TOKEN_CACHE_DIR, ignore_errors=True)
+
+
+@override_settings(API_TOKEN_TTL=3600, CACHES=SHARED_CACHES, API_TOKEN_CACHE_ALIAS='tokens')
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        caches['tokens'].clear()
+        self.user = User.objects.create_user(username='apiuser', password='secret-pass-123')
+        self.token = Token.objects.create(user=self.user)
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, key=None):
+        request = Request(
+            self.factory.get('/api/v1/', HTTP_AUTHORIZATION=f'Token {key or self.token.key}'),
+            authenticators=[CachedTokenAuthentication()]
+        )
+        request.user  # runs authentication
+        return request
+
+    def test_steady_state_needs_no_queries(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            request = self.authenticate()
+            self.assertTrue(IsAuthenticated().has_permission(request, None))
+            self.assertEqual(request.user.pk, self.user.pk)
+        # The user row is loaded on first real use
+        with self.assertNumQueries(1):
+            self.assertEqual(request.user.username, 'apiuser')
+
+    def test_deleted_token_is_rejected(self):
+        self.authenticate()
+        self.token.delete()
+        response = self.client.get('/api/v1/sync/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get('/api/v1/sync/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 401)
+
+    def test_expired_token_is_replaced_on_login(self):
+        Token.objects.filter(pk=self.token.pk).update(created=self.token.created - timedelta(hours=2))
+        response = self.client.get('/api/v1/sync/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.post('/api/v1/token-auth/', {'username': 'apiuser', 'password': 'secret-pass-123'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.json()['token'], self.token.key)
+
+    @override_settings(API_TOKEN_TTL=None)
+    def test_tokens_dont_expire_by_default(self):
+        Token.objects.filter(pk=self.token.pk).update(created=self.token.created - timedelta(days=365))
+        response = self.client.get('/api/v1/sync/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 200)
+
+    def test_rotation_revokes_old_key(self):
+        self.authenticate()
+        response = self.client.post('/api/v1/token-auth/rotate/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 200)
+        new_key = response.json()['token']
+
+        old = self.client.get('/api/v1/sync/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(old.status_code, 401)
+        self.assertEqual(
+            self.client.get('/api/v1/sync/', HTTP_AUTHORIZATION=f'Token {new_key}').status_code, 200
+        )
+
+
+@override_settings(API_TOKEN_TTL=3600)
+class TokenCacheWorkerTests(APITestCase):
+    """Two cache instances stand in for the caches of two workers"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='apiuser', password='secret-pass-123')
+        self.token = Token.objects.create(user=self.user)
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, cache, key):
+        request = Request(
+            self.factory.get('/api/v1/', HTTP_AUTHORIZATION=f'Token {key}'),
+            authenticators=[CachedTokenAuthentication()]
+        )
+        with mock.patch('api.authentication.get_token_cache', return_value=cache):
+            return request.user
+
+    def rotate(self, cache):
+        with mock.patch('api.authentication.get_token_cache', return_value=cache):
+            return rotate_token(self.user)
+
+    def test_rotation_on_one_worker_revokes_key_on_another(self):
+        location = tempfile.mkdtemp(prefix='api-token-cache-')
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        worker_a = FileBasedCache(location, {})
+        worker_b = FileBasedCache(location, {})
+
+        self.assertEqual(self.authenticate(worker_b, self.token.key).pk, self.user.pk)
+        new_key = self.rotate(worker_a).key
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate(worker_b, self.token.key)
+        self.assertEqual(self.authenticate(worker_b, new_key).pk, self.user.pk)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_process_local_cache_is_bypassed(self):
+        self.assertIsNone(get_token_cache())
+        self.assertEqual([warning.id for warning in check_shared_caches(None)], ['api.W001', 'api.W002'])
+
+        # Per-process caches can't see each other's evictions
+        worker_a = LocMemCache('worker-a', {})
+        worker_b = LocMemCache('worker-b', {})
+        self.addCleanup(worker_a.clear)
+        self.addCleanup(worker_b.clear)
+        self.authenticate(worker_b, self.token.key)
+        self.rotate(worker_a)
+        self.assertEqual(self.authenticate(worker_b, self.token.key).pk, self.user.pk)
+
+        # so with the configured cache the lookup always goes to the database
+        self.rotate(get_token_cache())
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate(get_token_cache(), self.token.key)
+
+    @override_settings(CACHES=SHARED_CACHES, API_TOKEN_CACHE_ALIAS='tokens')
+    def test_shared_cache_passes_check(self):
+        self.assertNotIn('api.W001', [warning.id for warning in check_shared_caches(None)])
@@ -0,0 +1,49 @@
+# provider/tests/base.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from provider.models import Provider
+
+
+class ProviderFixtureMixin:
+    """
+    Patches out the LDAP client that provider.signals calls whenever a user
+    or provider is saved, and creates a provider (``self.user`` and
+    ``self.provider``) for the test to act as.
+    """
+
+    provider_user_fields = {}
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('provider.signals.LDAPClient')
+        self.mock_ldap = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(
+            username='drtest', password='testpassword', first_name='Test', last_name='Doctor',
+            **self.provider_user_fields
+        )
+        self.provider, _ = Provider.objects.get_or_create(
+            user=self.user,
+            defaults={'license_number': 'LIC-001', 'specialty': 'Family Medicine'}
+        )
+
+    def create_provider(self, username, **kwargs):
+        """Another provider like ``self.provider``, e.g. to check that one can't see the other's data"""
+        user = User.objects.create_user(username=username, password='testpassword', **self.provider_user_fields)
+        provider, _ = Provider.objects.get_or_create(
+            user=user, defaults={'license_number': f'LIC-{user.pk:03d}', **kwargs}
+        )
+        return provider
+
+
+class ProviderTestCase(ProviderFixtureMixin, TestCase):
+    pass
+
+
+class ProviderAPITestCase(ProviderFixtureMixin, APITestCase):
+    pass
@@ -0,0 +1,75 @@
+# provider/tests/test_activity_feed.py
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from common.models import Appointment, Message, Prescription
+from provider.models import ActivityEvent
+from provider.services.activity_service import ActivityService
+from provider.tests.base import ProviderTestCase
+
+
+class ActivityFeedTests(ProviderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.patient = User.objects.create_user(username='patient', first_name='Pat', last_name='Ient')
+
+    def test_signals_write_denormalized_events(self):
+        appointment = Appointment.objects.create(
+            patient=self.patient, doctor=self.provider, time=timezone.now() + timedelta(days=1)
+        )
+        Prescription.objects.create(
+            medication_name='Amoxicillin', dosage='500mg', patient=self.patient, doctor=self.provider
+        )
+        Message.objects.create(
+            sender=self.patient, recipient=self.user, subject='Question', content='Hello'
+        )
+
+        # Saving without a status change does not add an event
+        appointment.notes = 'Bring previous results'
+        appointment.save()
+        appointment.status = 'Completed'
+        appointment.save()
+
+        events = ActivityEvent.objects.filter(provider=self.provider)
+        self.assertEqual(events.count(), 4)
+        self.assertEqual(
+            sorted(events.values_list('event_type', 'action')),
+            [('appointment', 'created'), ('appointment', 'status_changed'),
+             ('message', 'created'), ('prescription', 'created')]
+        )
+        self.assertEqual(set(events.values_list('patient_name', flat=True)), {'Pat Ient'})
+
+    def test_failed_record_leaves_callers_transaction_usable(self):
+        with transaction.atomic():
+            # NOT NULL violation inside the insert
+            self.assertIsNone(ActivityService.record(self.provider.id, None, 'created', 'Broken'))
+            ActivityService.record(self.provider.id, 'appointment', 'created', 'After')
+        self.assertEqual(
+            list(ActivityEvent.objects.filter(provider=self.provider).values_list('description', flat=True)),
+            ['After']
+        )
+
+    def test_keyset_pagination_walks_feed_without_gaps(self):
+        created_at = timezone.now()
+        for i in range(7):
+            # Shared timestamps exercise the id tie-breaker
+            ActivityService.record(
+                self.provider.id, 'appointment', 'created', f"Event {i}",
+                patient=self.patient, created_at=created_at - timedelta(minutes=i // 2)
+            )
+
+        seen = []
+        cursor = None
+        while True:
+            page = ActivityService.get_feed(self.provider.id, limit=3, cursor=cursor)
+            seen.extend(event.id for event in page['events'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+
+        expected = list(ActivityEvent.objects.filter(provider=self.provider)
+                        .order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
@@ -0,0 +1,120 @@
+# provider/tests/test_ai_health.py
+from datetime import timedelta
+from unittest import mock
+
+import requests
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from provider.models import AIModelConfig, AIModelHealth
+from provider.services import AIHealthProbeService
+from provider.tests.base import ProviderTestCase
+
+
+def fake_response(status_code=200, text='ok'):
+    return mock.Mock(status_code=status_code, text=text)
+
+
+@mock.patch('provider.services.ai_health_service.requests.post')
+class AIHealthProbeServiceTests(TestCase):
+    def setUp(self):
+        self.notes = AIModelConfig.objects.create(
+            name='Notes', model_type='clinical_note', api_endpoint='https://notes.example.com/v1'
+        )
+        self.transcription = AIModelConfig.objects.create(
+            name='Transcription', model_type='transcription', api_endpoint='https://stt.example.com/v1'
+        )
+
+    def test_probe_timeout_is_reported_as_down(self, mock_post):
+        mock_post.side_effect = requests.Timeout('read timed out')
+
+        result = AIHealthProbeService.probe_endpoint(self.notes, timeout=2)
+
+        self.assertFalse(result['is_up'])
+        self.assertIsNone(result['latency_ms'])
+        self.assertIn('read timed out', result['error'])
+        self.assertEqual(mock_post.call_args.kwargs['timeout'], 2)
+
+    def test_error_status_is_reported_as_down(self, mock_post):
+        mock_post.return_value = fake_response(503, 'unavailable')
+
+        result = AIHealthProbeService.probe_endpoint(self.notes)
+
+        self.assertFalse(result['is_up'])
+        self.assertEqual(result['status_code'], 503)
+        self.assertEqual(mock_post.call_args.kwargs['timeout'], AIHealthProbeService.PROBE_TIMEOUT)
+
+    def test_recorded_results_are_read_back_from_cache(self, mock_post):
+        for latency_ms in (100, 300, 200):
+            AIHealthProbeService.record_result(self.notes, {
+                'is_up': True, 'status_code': 200, 'latency_ms': latency_ms, 'error': '',
+            })
+        AIHealthProbeService.record_result(self.notes, {
+            'is_up': False, 'status_code': None, 'latency_ms': None, 'error': 'Request error: timed out',
+        })
+
+        # Reading the cached status never probes
+        with self.assertNumQueries(1):
+            status = AIHealthProbeService.get_cached_status()[self.notes.id]
+        mock_post.assert_not_called()
+        self.assertEqual(status['status'], 'offline')
+        self.assertEqual(status['consecutive_failures'], 1)
+        self.assertEqual(status['last_error'], 'Request error: timed out')
+        # Failed probes don't count towards latency percentiles
+        self.assertEqual((status['p50_latency_ms'], status['p99_latency_ms']), (200, 300))
+        self.assertFalse(status['stale'])
+
+        AIModelHealth.objects.update(checked_at=timezone.now() - timedelta(hours=1))
+        self.assertTrue(AIHealthProbeService.get_cached_status()[self.notes.id]['stale'])
+
+    def test_probe_all_active(self, mock_post):
+        AIModelConfig.objects.create(
+            name='Retired', model_type='qa', api_endpoint='https://qa.example.com/v1', is_active=False
+        )
+
+        def post(url, **kwargs):
+            if url == self.transcription.api_endpoint:
+                raise requests.ConnectionError('connection refused')
+            return fake_response()
+        mock_post.side_effect = post
+
+        summary = AIHealthProbeService.probe_all_active(max_workers=2)
+
+        self.assertEqual(summary, {'success': True, 'probed': 2, 'up': 1, 'down': 1})
+        # Inactive models aren't probed
+        self.assertEqual(
+            sorted(call.args[0] for call in mock_post.call_args_list),
+            [self.notes.api_endpoint, self.transcription.api_endpoint]
+        )
+        self.assertEqual(
+            dict(AIModelHealth.objects.values_list('model_config__name', 'is_up')),
+            {'Notes': True, 'Transcription': False}
+        )
+        self.assertEqual(AIHealthProbeService.get_status_summary()['status'], 'degraded')
+
+
+class AIConfigDashboardTests(ProviderTestCase):
+    # The AI configuration pages are staff only
+    provider_user_fields = {'is_staff': True}
+
+    def setUp(self):
+        super().setUp()
+        self.config = AIModelConfig.objects.create(
+            name='Notes', model_type='clinical_note', api_endpoint='https://notes.example.com/v1'
+        )
+
+    def test_dashboard_shows_cached_health(self):
+        AIHealthProbeService.record_result(self.config, {
+            'is_up': True, 'status_code': 200, 'latency_ms': 120, 'error': '',
+        })
+        self.client.force_login(self.user)
+
+        with mock.patch('provider.services.ai_health_service.requests.post') as mock_post:
+            response = self.client.get(reverse('provider:ai_config_dashboard'))
+
+        mock_post.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['health_summary']['status'], 'online')
+        self.assertEqual(response.context['model_configs'][0]['health']['p50_latency_ms'], 120)
+        self.assertContains(response, '120 / 120 / 120 ms')
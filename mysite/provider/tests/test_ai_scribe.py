@@ -0,0 +1,98 @@
+# provider/tests/test_ai_scribe.py
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+
+from api.v1.provider.serializers import ClinicalNoteListSerializer, RecordingSessionListSerializer
+from common.models import Appointment
+from provider.models import ClinicalNote, Provider, RecordingSession
+from provider.services.ai_service import AIScribeService
+from provider.tests.base import ProviderTestCase
+
+
+class AIScribeListTests(ProviderTestCase):
+    # get_current_provider only accepts staff or the providers group
+    provider_user_fields = {'is_staff': True}
+
+    def setUp(self):
+        super().setUp()
+        self.patient = User.objects.create_user(username='patient', first_name='Pat', last_name='Ient')
+
+    def create_recordings(self, count, transcription_text='Patient reports a mild cough. ' * 50):
+        now = timezone.now()
+        recordings = []
+        for i in range(count):
+            appointment = Appointment.objects.create(
+                patient=self.patient, doctor=self.provider, time=now - timedelta(days=i)
+            )
+            recording = RecordingSession.objects.create(
+                appointment=appointment, provider=self.provider,
+                transcription_status='completed', transcription_text=transcription_text
+            )
+            recording.end_time = recording.start_time + timedelta(minutes=15)
+            recording.save(update_fields=['end_time'])
+            ClinicalNote.objects.create(
+                appointment=appointment, provider=self.provider, transcription=recording,
+                ai_generated_text='S: cough', created_by=self.user
+            )
+            recordings.append(recording)
+        return recordings
+
+    def serialize_dashboard(self):
+        data = AIScribeService.get_dashboard_data(self.provider.id)
+        return (
+            RecordingSessionListSerializer(data['recordings'], many=True).data,
+            ClinicalNoteListSerializer(data['notes'], many=True).data,
+        )
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        for total in (2, 8):
+            self.create_recordings(total - RecordingSession.objects.count())
+            # Provider, recordings and notes
+            with self.assertNumQueries(3):
+                recordings, notes = self.serialize_dashboard()
+            self.assertEqual((len(recordings), len(notes)), (total, total))
+            self.assertEqual(recordings[0]['patient_name'], 'Pat Ient')
+
+    def test_list_payload_excludes_transcript(self):
+        self.create_recordings(1)
+
+        recordings, notes = self.serialize_dashboard()
+
+        self.assertNotIn('transcription_text', recordings[0])
+        self.assertEqual(recordings[0]['transcript_length'], len('Patient reports a mild cough. ' * 50))
+        self.assertEqual(recordings[0]['duration'], 15)
+        self.assertNotIn('ai_generated_text', notes[0])
+        recording = AIScribeService.get_recording_list_queryset(self.provider).get()
+        self.assertIn('transcription_text', recording.get_deferred_fields())
+
+    def test_stream_transcription(self):
+        recording = self.create_recordings(1)[0]
+        self.client.force_login(self.user)
+
+        with mock.patch.object(AIScribeService, 'TRANSCRIPT_CHUNK_SIZE', 100):
+            response = self.client.get(reverse('provider:stream_transcription', args=[recording.id]))
+            body = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, recording.transcription_text)
+
+    def test_stream_empty_transcription(self):
+        recording = self.create_recordings(1, transcription_text='')[0]
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('provider:stream_transcription', args=[recording.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
+    def test_stream_other_providers_recording_is_not_found(self):
+        recording = self.create_recordings(1)[0]
+        self.client.force_login(self.create_provider('drother').user)
+
+        response = self.client.get(reverse('provider:stream_transcription', args=[recording.id]))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,77 @@
+# provider/tests/test_patient_cohorts.py
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from common.models import Appointment, Prescription
+from patient.models import Patient
+
+from provider.services.patient_cohorts import PatientCohorts
+from provider.tests.base import ProviderTestCase
+
+
+class PatientCohortTests(ProviderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+
+    def create_patient(self, username):
+        user = User.objects.create_user(username=username, last_name=username)
+        Patient.objects.create(
+            user=user, date_of_birth='1990-01-01', ohip_number=f'{Patient.objects.count():010d}',
+            primary_phone='123-456-7890', address='123 Test St',
+            emergency_contact_name='Emergency Contact', emergency_contact_phone='987-654-3210',
+            primary_provider=self.provider
+        )
+        return user
+
+    def panel(self):
+        return Patient.objects.filter(primary_provider=self.provider)
+
+    def test_cohorts_match_activity(self):
+        recent = self.create_patient('recent')
+        upcoming = self.create_patient('upcoming')
+        pending = self.create_patient('pending')
+        self.create_patient('idle')
+        Appointment.objects.create(patient=recent, doctor=self.provider, time=self.now - timedelta(days=3))
+        Appointment.objects.create(patient=upcoming, doctor=self.provider, time=self.now + timedelta(days=7))
+        Prescription.objects.create(medication_name='Med', dosage='1mg', patient=pending, doctor=self.provider)
+
+        cohorts = PatientCohorts(self.provider, now=self.now)
+
+        def usernames(names, match='all'):
+            return {p.user.username for p in cohorts.filter(self.panel(), names, match)}
+
+        self.assertEqual(usernames(['recent']), {'recent', 'pending'})
+        self.assertEqual(usernames(['upcoming']), {'upcoming'})
+        self.assertEqual(usernames(['attention']), {'pending'})
+        self.assertEqual(usernames(['recent', 'attention']), {'pending'})
+        self.assertEqual(usernames(['upcoming', 'attention'], match='any'), {'upcoming', 'pending'})
+        self.assertEqual(len(usernames(['all'])), 4)
+
+    def test_page_query_count_is_constant(self):
+        cohorts = PatientCohorts(self.provider, now=self.now)
+
+        def count_page_queries():
+            queryset = cohorts.filter(self.panel().select_related('user'), ['recent', 'upcoming'], match='any')
+            with CaptureQueriesContext(connection) as context:
+                page = Paginator(queryset, 10).page(1)
+                for patient in page:
+                    (patient.user.username, patient.needs_attention, patient.last_visit)
+            return len(context.captured_queries)
+
+        for i in range(3):
+            user = self.create_patient(f'small{i}')
+            Appointment.objects.create(patient=user, doctor=self.provider, time=self.now + timedelta(days=1))
+        small = count_page_queries()
+
+        for i in range(20):
+            user = self.create_patient(f'large{i}')
+            Appointment.objects.create(patient=user, doctor=self.provider, time=self.now - timedelta(days=1))
+        large = count_page_queries()
+
+        self.assertEqual(small, large)
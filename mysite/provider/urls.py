@@ -57,6 +57,7 @@ urlpatterns = [
     path('ai-scribe/start-recording/', views.ai_views_scribe.start_recording, name='ai_start_recording'),
     path('ai-scribe/stop-recording/', views.ai_views_scribe.stop_recording, name='ai_stop_recording'),
     path('ai-scribe/transcription/<int:recording_id>/', views.ai_views_scribe.get_transcription, name='get_transcription'),
+    path('ai-scribe/transcription/<int:recording_id>/stream/', views.ai_views_scribe.stream_transcription, name='stream_transcription'),
     path('ai-scribe/generate-note/<int:transcription_id>/', views.ai_views_scribe.generate_clinical_note, name='generate_clinical_note'),
     path('ai-scribe/notes/<int:note_id>/', views.ai_views_scribe.view_clinical_note, name='view_clinical_note'),
     path('ai-scribe/notes/<int:note_id>/edit/', views.ai_views_scribe.edit_clinical_note, name='edit_clinical_note'),
@@ -4,6 +4,7 @@ from .scribe import (
     start_recording,
     stop_recording,
     get_transcription,
+    stream_transcription,
     generate_clinical_note,
     view_clinical_note,
     edit_clinical_note
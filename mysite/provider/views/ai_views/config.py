@@ -4,7 +4,7 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 import logging
 
-from provider.services import AIConfigurationService
+from provider.services import AIConfigurationService, AIHealthProbeService
 from provider.utils import get_current_provider
 from api.v1.provider.serializers import AIModelConfigSerializer
 
@@ -32,10 +32,17 @@ def ai_config_dashboard(request):
             serializer = AIModelConfigSerializer(model_configs, many=True)
             config_data['model_configs'] = serializer.data
         
+        # Cached probe results; never probes endpoints inline
+        health_summary = AIHealthProbeService.get_status_summary()
+        model_configs = config_data.get('model_configs', [])
+        for config in model_configs:
+            config['health'] = health_summary['models'].get(config['id'])
+        
         context = {
             'provider': provider_dict,
             'provider_name': f"Dr. {provider_dict['last_name']}",
-            'model_configs': config_data.get('model_configs', []),
+            'model_configs': model_configs,
+            'health_summary': health_summary,
             'active_section': 'ai_config',
         }
     except Exception as e:
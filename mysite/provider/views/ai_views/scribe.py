@@ -1,14 +1,17 @@
 # provider/views/ai_views/scribe.py
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 import logging
 
 from provider.services import AIScribeService
 from provider.utils import get_current_provider
-from api.v1.provider.serializers import RecordingSessionSerializer, ClinicalNoteSerializer
+from api.v1.provider.serializers import (
+    RecordingSessionSerializer, ClinicalNoteSerializer,
+    RecordingSessionListSerializer, ClinicalNoteListSerializer
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,13 +32,13 @@ def ai_scribe_dashboard(request):
         # Format recordings using API serializer if needed
         recordings = scribe_data.get('recordings', [])
         if hasattr(recordings, 'model'):
-            serializer = RecordingSessionSerializer(recordings, many=True)
+            serializer = RecordingSessionListSerializer(recordings, many=True)
             scribe_data['recordings'] = serializer.data
         
         # Format notes using API serializer if needed
         notes = scribe_data.get('notes', [])
         if hasattr(notes, 'model'):
-            serializer = ClinicalNoteSerializer(notes, many=True)
+            serializer = ClinicalNoteListSerializer(notes, many=True)
             scribe_data['notes'] = serializer.data
         
         context = {
@@ -174,6 +177,27 @@ def get_transcription(request, recording_id):
     
     return render(request, "provider/ai_views/transcription.html", context)
 
+@login_required
+def stream_transcription(request, recording_id):
+    """Stream the full transcript of a recording as plain text, on demand"""
+    # Get the current provider
+    provider, provider_dict = get_current_provider(request)
+    
+    # If the function returns None, it has already redirected
+    if provider is None:
+        return JsonResponse({'success': False, 'message': 'Authentication required'}, status=401)
+    
+    chunks = AIScribeService.iter_transcription(
+        provider_id=provider.id,
+        recording_id=recording_id
+    )
+    if chunks is None:
+        return JsonResponse({'success': False, 'message': 'Recording session not found'}, status=404)
+    
+    response = StreamingHttpResponse(chunks, content_type='text/plain; charset=utf-8')
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
 @login_required
 @require_POST
 def generate_clinical_note(request, transcription_id):
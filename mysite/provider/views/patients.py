@@ -25,30 +25,25 @@ def provider_patients(request):
     # Get search query if present
     search_query = request.GET.get('search', '')
     
-    # Get filter parameter if present (all, recent, upcoming, attention)
+    # Get filter parameter if present (all, recent, upcoming, attention);
+    # several cohorts can be combined, e.g. ?filter=recent,attention&match=any
     filter_type = request.GET.get('filter', 'all')
+    match = request.GET.get('match', 'all')
     
     try:
         # Get patients data from service
         patients_data = PatientService.get_provider_patients_dashboard(
             provider_id=provider.id,
             search_query=search_query,
-            filter_type=filter_type
+            filter_type=filter_type,
+            match=match
         )
         
-        # Format patients list using API serializer if needed
+        # Handle pagination in the database; only the current page is serialized
         patients_list = patients_data.get('patients', [])
-        if hasattr(patients_list, 'model'):
-            serializer = PatientSerializer(patients_list, many=True)
-            patients_list = serializer.data
-        
-        # Apply additional filters if necessary
-        filtered_patients = patients_list
-        
-        # Handle pagination
         page_number = request.GET.get('page', 1)
         items_per_page = 10
-        paginator = Paginator(filtered_patients, items_per_page)
+        paginator = Paginator(patients_list, items_per_page)
         
         try:
             page_obj = paginator.page(page_number)
@@ -57,6 +52,16 @@ def provider_patients(request):
         except EmptyPage:
             page_obj = paginator.page(paginator.num_pages)
         
+        # Format the page using the API serializer, keeping the cohort flags
+        if hasattr(patients_list, 'model'):
+            patients = list(page_obj.object_list)
+            serialized = PatientSerializer(patients, many=True).data
+            for patient, data in zip(patients, serialized):
+                for flag in ('has_recent_activity', 'has_upcoming_appointment', 'needs_attention',
+                             'next_appointment', 'last_visit'):
+                    data[flag] = getattr(patient, flag, None)
+            page_obj.object_list = serialized
+        
         # Get patient activity
         recent_activity = patients_data.get('recent_activity', [])
         
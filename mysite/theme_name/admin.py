@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import ContactMessage, PatientRegistration, DemoRequest, BlogPost
+from patient.normalization import normalize_ohip, normalize_phone, prefix_q
 
 
 class ContactMessageAdmin(admin.ModelAdmin):
@@ -40,6 +41,16 @@ class PatientRegistrationAdmin(admin.ModelAdmin):
     def full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}"
     full_name.short_description = 'Name'
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Numbers are matched on the indexed normalized columns in any format
+        ohip = normalize_ohip(search_term)
+        if ohip[:1].isdigit():
+            phone = normalize_phone(search_term) or ohip
+            return queryset.filter(
+                prefix_q('ohip_normalized', ohip) | prefix_q('primary_phone_normalized', phone)
+            ), False
+        return super().get_search_results(request, queryset, search_term)
 
 admin.site.register(ContactMessage)
 admin.site.register(DemoRequest)
@@ -776,8 +776,9 @@ def get_system_stats(use_mock=USE_MOCK_DATA):
             'database_size': '1.2 GB'
         }
     else:
-        # When connected to DB, calculate actual stats
-        pass
+        # When connected to DB, read the precomputed rollups
+        from admin_portal.services.system_service import SystemStatsService
+        return SystemStatsService.get_stats()
 
 def get_admin_logs(limit=100, use_mock=USE_MOCK_DATA):
     """Get system logs for admin dashboard."""
@@ -813,5 +814,6 @@ def get_admin_logs(limit=100, use_mock=USE_MOCK_DATA):
             }
         ]
     else:
-        # When connected to DB, retrieve actual logs
-        pass
+        # When connected to DB, retrieve actual logs (newest first, indexed read)
+        from admin_portal.services.audit_service import AuditLogService
+        return AuditLogService.get_logs(limit=limit)['logs']
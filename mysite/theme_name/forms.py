@@ -1,5 +1,6 @@
 from django import forms
 from .models import ContactMessage, PatientRegistration, DemoRequest
+from patient.models import Patient
 from datetime import date, timedelta
 
 class ContactForm(forms.ModelForm):
@@ -41,6 +42,13 @@ class PatientRegistrationForm(forms.ModelForm):
             "virtual_care_consent": forms.CheckboxInput(attrs={"class": "h-4 w-4 text-[#004d40] border-gray-300 rounded focus:ring-[#004d40]"}),
             "ehr_consent": forms.CheckboxInput(attrs={"class": "h-4 w-4 text-[#004d40] border-gray-300 rounded focus:ring-[#004d40]"})
         }
+    
+    def clean_ohip_number(self):
+        ohip_number = self.cleaned_data['ohip_number']
+        # Point lookup on the normalized column, so '1234-567-890' matches '1234567890'
+        if Patient.objects.by_ohip(ohip_number).exists():
+            raise forms.ValidationError("A patient with this OHIP number is already registered.")
+        return ohip_number
 
 class DemoRequestForm(forms.ModelForm):
     class Meta:
@@ -2,6 +2,8 @@ import requests
 import logging
 from django.conf import settings
 
+from common.utils.metrics import external_call
+
 logger = logging.getLogger(__name__)
 
 class ERPNextClient:
@@ -18,6 +20,7 @@ class ERPNextClient:
             "Content-Type": "application/json"
         }
 
+    @external_call('erpnext')
     def create_patient(self, patient_data):
         """
         Create a patient record in ERPNext from the given patient_data dictionary.
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.6 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+from patient.normalization import normalize_ohip, normalize_phone
+
+BATCH_SIZE = 1000
+IDENTITY_FIELDS = ['ohip_normalized', 'primary_phone_normalized']
+
+
+def backfill_identity_columns(apps, schema_editor):
+    PatientRegistration = apps.get_model('theme_name', 'PatientRegistration')
+
+    batch = []
+    for registration in PatientRegistration.objects.only('id', 'ohip_number', 'primary_phone').iterator(chunk_size=BATCH_SIZE):
+        registration.ohip_normalized = normalize_ohip(registration.ohip_number)[:12]
+        registration.primary_phone_normalized = normalize_phone(registration.primary_phone)
+        batch.append(registration)
+        if len(batch) >= BATCH_SIZE:
+            PatientRegistration.objects.bulk_update(batch, IDENTITY_FIELDS)
+            batch = []
+
+    if batch:
+        PatientRegistration.objects.bulk_update(batch, IDENTITY_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theme_name', '0007_alter_patientregistration_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patientregistration',
+            name='ohip_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='patientregistration',
+            name='primary_phone_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.RunPython(backfill_identity_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='patientregistration',
+            index=models.Index(fields=['ohip_normalized'], name='theme_name__ohip_no_5e21c9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patientregistration',
+            index=models.Index(fields=['primary_phone_normalized'], name='theme_name__primary_b07a4d_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.db.models import SET_NULL
 
+from patient.normalization import normalize_ohip, normalize_phone
+
 class ContactMessage(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField()
@@ -45,6 +47,24 @@ class PatientRegistration(models.Model):
         related_name='patients'
     )
     
+    # Normalized shadow columns for indexed identity lookups
+    ohip_normalized = models.CharField(max_length=12, blank=True, editable=False)
+    primary_phone_normalized = models.CharField(max_length=10, blank=True, editable=False)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['ohip_normalized'], name='theme_name__ohip_no_5e21c9_idx'),
+            models.Index(fields=['primary_phone_normalized'], name='theme_name__primary_b07a4d_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.ohip_normalized = normalize_ohip(self.ohip_number)[:12]
+        self.primary_phone_normalized = normalize_phone(self.primary_phone)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'ohip_normalized', 'primary_phone_normalized'}
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -3,6 +3,7 @@
 from django.conf import settings
 from datetime import datetime, timedelta
 import logging
+from common.utils.audit import audit_log
 from .data_access import (
     get_current_patient, get_patient_by_id, get_all_patients,
     get_patient_prescriptions, get_prescription_by_id, get_all_prescriptions, save_prescription_request,
@@ -20,11 +21,20 @@ class BaseRepository:
     
     @classmethod
     def _log_operation(cls, operation, entity_type, entity_id=None, error=None):
-        """Log operations for debugging."""
+        """Log operations for debugging and record them in the audit log."""
         if error:
             logger.error(f"{operation} {entity_type} {entity_id if entity_id else ''} failed: {error}")
         else:
             logger.debug(f"{operation} {entity_type} {entity_id if entity_id else ''} successful")
+        
+        # Buffered; written in batches at the end of the request
+        audit_log.log(
+            action=operation,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            details=error or '',
+            success=not error
+        )
 
     @classmethod
     def get_by_id(cls, entity_id):
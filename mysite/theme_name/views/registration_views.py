@@ -5,6 +5,7 @@ from django.contrib.auth.models import User, Group
 from django.db import transaction
 from theme_name.forms import PatientRegistrationForm
 from patient.models import Patient
+from patient.services.duplicate_service import DuplicatePatientService
 from common.utils.ldap_client import LDAPClient
 import logging
 
@@ -72,6 +73,9 @@ def patient_registration(request):
                         ehr_consent=form.cleaned_data['ehr_consent']
                     )
                     
+                    # Flag likely duplicates for staff review; never blocks registration
+                    DuplicatePatientService.check_patient(patient)
+                    
                     # Create LDAP user
                     ldap_client = LDAPClient()
                     ldap_created = False